@@ -0,0 +1,143 @@
+"""
+Normalization of free-text survey answers to canonical values.
+
+One ``AnswerNormalizer`` is compiled per survey question from its canonical
+vocabulary plus known spelling variations (e.g. ``GENDER_REPLACEMENTS``).
+Training uses the vectorized ``normalize_series`` and serving the memoized
+``normalize``, so both sides map every answer through the same table.
+Answers outside the table are counted, so unexpected input shows up in
+``stats()`` instead of silently encoding to all zeros.
+
+pandas is not imported here; ``normalize_series`` works on any Series it is
+given, so serving precompiled artifacts still never loads pandas.
+"""
+
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+# Free-text gender variations seen in the survey, mapped to the canonical
+# 'male' / 'female' / 'other' values
+GENDER_REPLACEMENTS = {
+    # Male variations
+    'm': 'male', 'male ': 'male', 'man': 'male', 'mail': 'male',
+    'make': 'male', 'mal': 'male', 'malr': 'male', 'msle': 'male',
+    'cis male': 'male', 'cis man': 'male', 'male-ish': 'male', 'male leaning androgynous': 'male',
+    'guy (-ish) ^_^': 'male', 'ostensibly male, unsure what that really means': 'male',
+    
+    # Female variations
+    'f': 'female', 'femail': 'female', 'female ': 'female',
+    'cis female': 'female', 'cis-female/femme': 'female',
+    'female (cis)': 'female', 'woman': 'female',
+    
+    # Others / Non-binary
+    'trans woman': 'other', 'trans-female': 'other', 'female (trans)': 'other',
+    'non-binary': 'other', 'enby': 'other', 'genderqueer': 'other',
+    'queer': 'other', 'queer/she/they': 'other', 'fluid': 'other',
+    'androgyne': 'other', 'agender': 'other', 'neuter': 'other',
+    'nah': 'other', 'all': 'other', 'p': 'other', 'a little about you': 'other'
+}
+
+GENDER_VALUES = ('male', 'female', 'other')
+
+# Bounds on per-value state so arbitrary input cannot grow memory without limit
+MAX_MEMO_SIZE = 4096
+MAX_UNMAPPED_KEYS = 256
+OTHER_UNMAPPED = '<other>'
+
+def _clean(value: Any) -> str:
+    return str(value).lower().strip()
+
+class AnswerNormalizer:
+    """
+    Compiled lookup from raw answers to interned canonical values.
+    """
+    
+    def __init__(self, canonical: Iterable[str], replacements: Optional[Mapping[str, str]] = None):
+        """
+        Args:
+            canonical (Iterable[str]): Canonical answers; each maps to itself
+            replacements (Mapping[str, str], optional): Variations mapped to a
+                canonical answer; keys are matched lowercased and stripped
+        """
+        self.table: Dict[str, str] = {}
+        for value in canonical:
+            value = sys.intern(_clean(value))
+            self.table[value] = value
+        for variation, value in (replacements or {}).items():
+            self.table.setdefault(_clean(variation), sys.intern(_clean(value)))
+        
+        # raw value -> canonical value (None when unmapped)
+        self._memo: Dict[Any, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.unmapped = Counter()
+        self.lookups = 0
+    
+    def _count_unmapped(self, key: str, count: int = 1) -> None:
+        with self._lock:
+            if key not in self.unmapped and len(self.unmapped) >= MAX_UNMAPPED_KEYS:
+                key = OTHER_UNMAPPED
+            self.unmapped[key] += count
+    
+    def normalize(self, value: Any) -> Optional[str]:
+        """
+        Canonical answer for one raw value, or None if it is not recognized.
+        
+        Results are memoized per raw value, so repeated answers cost a
+        single dict lookup.
+        """
+        self.lookups += 1
+        try:
+            result = self._memo[value]
+        except KeyError:
+            key = _clean(value)
+            result = self.table.get(key)
+            if len(self._memo) < MAX_MEMO_SIZE:
+                self._memo[value] = result
+            if result is None:
+                self._count_unmapped(key)
+            return result
+        except TypeError:  # unhashable value
+            return self.normalize(str(value))
+        if result is None:
+            self._count_unmapped(_clean(value))
+        return result
+    
+    def normalize_series(self, series: Any, keep_unmapped: bool = False) -> Any:
+        """
+        Vectorized ``normalize`` over a pandas Series.
+        
+        Args:
+            series (pd.Series): Raw answers
+            keep_unmapped (bool): Keep the cleaned text of unrecognized answers
+                instead of NaN
+        
+        Returns:
+            pd.Series: Canonical answers, index preserved
+        """
+        keys = series.astype(str).str.lower().str.strip()
+        result = keys.map(self.table)
+        missing = result.isna()
+        self.lookups += len(series)
+        if missing.any():
+            for key, count in keys[missing].value_counts().items():
+                self._count_unmapped(key, int(count))
+            if keep_unmapped:
+                result = result.where(~missing, keys)
+        return result
+    
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Lookup and unmapped-value counters"""
+        with self._lock:
+            return {
+                'lookups': self.lookups,
+                'table_size': len(self.table),
+                'memo_size': len(self._memo),
+                'unmapped': sum(self.unmapped.values()),
+                'top_unmapped': dict(self.unmapped.most_common(top))
+            }
+
+def gender_normalizer() -> AnswerNormalizer:
+    """Normalizer for the free-text Gender answer"""
+    return AnswerNormalizer(GENDER_VALUES, GENDER_REPLACEMENTS)
@@ -1,31 +1,174 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-import joblib
-import pandas as pd
-import numpy as np
-from model_predictor import MentalHealthPredictor
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, g, Response, session, abort
+from model_predictor import MentalHealthPredictor, CATEGORICAL_MAPPINGS, EXPECTED_FEATURES
+from audit_store import AuditStore
+from batch_scheduler import MicroBatcher
+from metrics import Metrics
+from request_profiler import RequestProfiler
+from request_schema import RequestSchema
+from model_registry import ModelRegistry, read_current, set_current
+from static_assets import AssetPipeline, PageCache
+from structured_logging import configure_logging, parse_sample_rates
+import hmac
 import logging
+import time
 from datetime import datetime
 import os
+import json
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Structured JSON logs, written by a background thread; LOG_SAMPLE_RATES
+# (e.g. "INFO=0.01") keeps only a fraction of the records of a level
+log_handler = configure_logging(
+    os.environ.get('LOG_LEVEL', 'INFO'),
+    parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES')),
+    fmt=os.environ.get('LOG_FORMAT', 'json')
+)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
 
+# Fingerprinted, gzipped static assets; templates link to them with asset_url()
+assets = AssetPipeline(os.path.join(app.root_path, 'static'))
+app.jinja_env.globals['asset_url'] = assets.url
+# Rendered bytes of the pages that are identical for every visitor
+pages = PageCache()
+
+# Upper bound on records accepted by /api/predict_batch
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 1000))
+
+# Prometheus metrics; METRICS_DIR aggregates them across gunicorn workers
+metrics = Metrics(os.environ.get('METRICS_DIR') or None)
+
+SCORING_ENGINE = os.environ.get('SCORING_ENGINE', 'auto')
+MODEL_PATH = os.environ.get('MODEL_PATH', 'mental_health_model.pkl')
+# Versioned model directory (see model_registry); when set, MODEL_PATH is ignored
+MODELS_DIR = os.environ.get('MODELS_DIR') or None
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN') or None
+
+# Records scored to warm up a newly loaded model before it takes traffic
+CANARY_RECORDS = [
+    {'Age': 30, 'gender': 'female', 'family_history': 'yes', 'work_interfere': 'sometimes',
+     'benefits': 'yes', 'seek_help': "don't know", 'coworkers': 'some of them'},
+    {'Age': 45, 'gender': 'male', 'family_history': 'no', 'work_interfere': 'never',
+     'benefits': 'no', 'seek_help': 'no', 'coworkers': 'yes'}
+]
+
+def load_predictor(model_path):
+    """Build a predictor for a model file with the configured serving options"""
+    loaded = MentalHealthPredictor(
+        model_path,
+        engine=SCORING_ENGINE,
+        cache_size=int(os.environ.get('PREDICTION_CACHE_SIZE', 1024)),
+        cache_age_bucket=int(os.environ.get('PREDICTION_CACHE_AGE_BUCKET', 0)),
+        model_check_interval=float(os.environ.get('MODEL_CHECK_INTERVAL', 5)),
+        mmap_mode=os.environ.get('MODEL_MMAP_MODE') or None
+    )
+    loaded.stage_observer = metrics.observe_stage
+    return loaded
+
+# The active predictor lives in the registry; request handlers read
+# registry.active once so a hot swap never changes the model mid-request
+registry = ModelRegistry(
+    MODELS_DIR, load_predictor, CANARY_RECORDS,
+    poll_interval=float(os.environ.get('MODEL_POLL_INTERVAL', 5)),
+    prefer_artifact=SCORING_ENGINE != 'sklearn'
+)
+
 # Initialize the predictor
 try:
-    predictor = MentalHealthPredictor('mental_health_model.pkl')
+    if MODELS_DIR is not None:
+        version = read_current(MODELS_DIR)
+        if version is None or not registry.load_version(version):
+            raise ValueError(f"no loadable model version in {MODELS_DIR}")
+    else:
+        registry.activate(os.path.basename(MODEL_PATH), load_predictor(MODEL_PATH))
     logger.info("Model loaded successfully")
 except Exception as e:
     logger.error(f"Failed to load model: {e}")
-    predictor = None
+
+# Request validation compiled once from the answer vocabularies; handlers
+# pass the canonical records it returns straight to the encoder
+schema = RequestSchema(CATEGORICAL_MAPPINGS, EXPECTED_FEATURES)
+
+def _score_batch(records):
+    return registry.predictor.predict_batch(records, canonical=True)
+
+# Optional micro-batching of concurrent /api/predict calls (disabled when the window is 0)
+MICRO_BATCH_WINDOW_MS = float(os.environ.get('MICRO_BATCH_WINDOW_MS', 0))
+BATCH_TIMEOUT = 30
+batcher = None
+if MICRO_BATCH_WINDOW_MS > 0:
+    batcher = MicroBatcher(
+        _score_batch,
+        window_ms=MICRO_BATCH_WINDOW_MS,
+        max_batch_size=int(os.environ.get('MICRO_BATCH_MAX_SIZE', 32))
+    )
+
+# Audit log of served predictions in SQLite (disabled unless AUDIT_DB is set)
+AUDIT_DB = os.environ.get('AUDIT_DB') or None
+audit = None
+if AUDIT_DB:
+    # Records are validated (so already canonical) before they are audited
+    audit = AuditStore(AUDIT_DB)
+
+def _audit(record, prediction, confidence, version):
+    """Queue a served prediction for the audit store"""
+    if audit is not None:
+        latency_ms = (time.perf_counter() - g.get('request_started', time.perf_counter())) * 1000
+        audit.record(record, prediction, confidence, version, latency_ms, request.endpoint)
+
+# On-demand cProfile/tracemalloc sessions (POST /api/admin/profile); idle
+# unless a session is armed in this worker
+profiler = RequestProfiler()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    registry.ensure_watcher()
+    if profiler.active and request.endpoint != 'admin_profile':
+        g.profile = profiler.begin()
+
+@app.teardown_request
+def stop_request_profile(error=None):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiler.end(profile, request.endpoint)
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unknown'
+    metrics.observe('mh_request_duration_seconds',
+                    time.perf_counter() - g.get('request_started', time.perf_counter()),
+                    {'endpoint': endpoint})
+    metrics.inc('mh_requests_total', {'endpoint': endpoint, 'status': response.status_code})
+    if response.status_code >= 400 or g.get('request_failed'):
+        metrics.inc('mh_request_errors_total', {'endpoint': endpoint})
+    return response
+
+def prediction_payload(prediction, confidence, version):
+    """Body of a single prediction response (shared with the async entry point)"""
+    return {
+        'prediction': int(prediction),
+        'prediction_label': 'Seeking Treatment' if prediction == 1 else 'Not Seeking Treatment',
+        'confidence': round(confidence * 100, 2),
+        'model_version': version,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def _invalid_request(errors):
+    """422 response listing every field error"""
+    return jsonify({'error': 'Invalid request', 'details': errors}), 422
+
+def _static_page(template):
+    """Serve a page from the page cache unless flash messages must be shown on it"""
+    if session.get('_flashes'):
+        return render_template(template)
+    return pages.response(template, lambda: render_template(template))
 
 @app.route('/')
 def home():
     """Home page with project overview"""
-    return render_template('index.html')
+    return _static_page('index.html')
 
 @app.route('/predict')
 def predict_form():
@@ -36,34 +179,25 @@ def predict_form():
 def submit_prediction():
     """Handle form submission and make prediction"""
     try:
+        version, predictor = registry.active
         if predictor is None:
             flash('Model not available. Please try again later.', 'error')
             return redirect(url_for('predict_form'))
         
-        # Get form data
-        form_data = {
-            'Age': int(request.form.get('age', 30)),
-            'gender': request.form.get('gender'),  # Will be converted to one-hot in predictor
-            'self_employed': request.form.get('self_employed'),
-            'family_history': request.form.get('family_history'),
-            'work_interfere': request.form.get('work_interfere'),
-            'remote_work': request.form.get('remote_work'),
-            'tech_company': request.form.get('tech_company'),
-            'benefits': request.form.get('benefits'),
-            'care_options': request.form.get('care_options'),
-            'wellness_program': request.form.get('wellness_program'),
-            'seek_help': request.form.get('seek_help'),
-            'mental_health_consequence': request.form.get('mental_health_consequence'),
-            'phys_health_consequence': request.form.get('phys_health_consequence'),
-            'coworkers': request.form.get('coworkers'),
-            'supervisor': request.form.get('supervisor'),
-            'mental_health_interview': request.form.get('mental_health_interview'),
-            'phys_health_interview': request.form.get('phys_health_interview'),
-            'mental_vs_physical': request.form.get('mental_vs_physical'),
-        }
+        # Validate and canonicalize the form fields
+        with metrics.timer('parse'):
+            fields = request.form.to_dict()
+            fields['Age'] = fields.pop('age', None)
+            form_data, errors = schema.validate(fields)
+        if errors:
+            g.request_failed = True
+            for error in errors:
+                flash(f"{error['field']}: {error['message']}", 'error')
+            return redirect(url_for('predict_form'))
         
         # Make prediction
-        prediction, confidence = predictor.predict(form_data)
+        prediction, confidence = predictor.predict(form_data, canonical=True)
+        _audit(form_data, prediction, confidence, version)
         
         # Prepare result data
         result = {
@@ -73,9 +207,11 @@ def submit_prediction():
             'form_data': form_data
         }
         
-        return render_template('result.html', result=result)
+        with metrics.timer('render'):
+            return render_template('result.html', result=result)
         
     except Exception as e:
+        g.request_failed = True
         logger.error(f"Prediction error: {e}")
         flash('An error occurred while processing your request. Please try again.', 'error')
         return redirect(url_for('predict_form'))
@@ -84,36 +220,336 @@ def submit_prediction():
 def api_predict():
     """API endpoint for predictions"""
     try:
+        version, predictor = registry.active
         if predictor is None:
             return jsonify({'error': 'Model not available'}), 500
         
-        data = request.json
-        prediction, confidence = predictor.predict(data)
+        with metrics.timer('parse'):
+            data, errors = schema.validate(request.get_json(silent=True))
+        if errors:
+            return _invalid_request(errors)
+        if batcher is not None:
+            prediction, confidence = batcher.predict(data, timeout=BATCH_TIMEOUT)
+        else:
+            prediction, confidence = predictor.predict(data, canonical=True)
+        _audit(data, prediction, confidence, version)
+        
+        with metrics.timer('serialize'):
+            return jsonify(prediction_payload(prediction, confidence, version))
+        
+    except Exception as e:
+        logger.error(f"API prediction error: {e}")
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/predict_batch', methods=['POST'])
+def api_predict_batch():
+    """API endpoint for batch predictions (JSON array or NDJSON body)"""
+    try:
+        version, predictor = registry.active
+        if predictor is None:
+            return jsonify({'error': 'Model not available'}), 500
+        
+        with metrics.timer('batch_parse'):
+            records, parse_errors = _parse_batch_body(request)
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch too large (max {MAX_BATCH_SIZE} records)'}), 413
+        
+        records, results = _validate_batch(records, parse_errors)
+        _merge_scored(results, predictor.predict_batch(records, canonical=True))
+        
+        response = []
+        for index, result in enumerate(results):
+            if 'error' in result:
+                response.append(dict(result, index=index))
+                continue
+            prediction = result['prediction']
+            _audit(result.pop('record'), prediction, result['confidence'], version)
+            response.append({
+                'index': index,
+                'prediction': prediction,
+                'prediction_label': 'Seeking Treatment' if prediction == 1 else 'Not Seeking Treatment',
+                'confidence': round(result['confidence'] * 100, 2)
+            })
         
         return jsonify({
-            'prediction': int(prediction),
-            'prediction_label': 'Seeking Treatment' if prediction == 1 else 'Not Seeking Treatment',
-            'confidence': round(confidence * 100, 2),
+            'results': response,
+            'count': len(response),
+            'errors': sum(1 for item in response if 'error' in item),
+            'model_version': version,
             'timestamp': datetime.now().isoformat()
         })
         
     except Exception as e:
-        logger.error(f"API prediction error: {e}")
+        logger.error(f"API batch prediction error: {e}")
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/explain', methods=['POST'])
+def api_explain():
+    """Prediction plus each survey question's exact contribution to the logit"""
+    try:
+        version, predictor = registry.active
+        if predictor is None:
+            return jsonify({'error': 'Model not available'}), 500
+        
+        with metrics.timer('parse'):
+            data, errors = schema.validate(request.get_json(silent=True))
+        if errors:
+            return _invalid_request(errors)
+        result = predictor.explain(data, canonical=True)
+        prediction = result['prediction']
+        
+        with metrics.timer('serialize'):
+            return jsonify(dict(
+                result,
+                prediction_label='Seeking Treatment' if prediction == 1 else 'Not Seeking Treatment',
+                confidence=round(result['confidence'] * 100, 2),
+                model_version=version,
+                timestamp=datetime.now().isoformat()
+            ))
+        
+    except Exception as e:
+        logger.error(f"API explain error: {e}")
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/explain_batch', methods=['POST'])
+def api_explain_batch():
+    """Explanations for a batch of records (JSON array or NDJSON body)"""
+    try:
+        version, predictor = registry.active
+        if predictor is None:
+            return jsonify({'error': 'Model not available'}), 500
+        
+        with metrics.timer('batch_parse'):
+            records, parse_errors = _parse_batch_body(request)
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch too large (max {MAX_BATCH_SIZE} records)'}), 413
+        
+        records, results = _validate_batch(records, parse_errors)
+        _merge_scored(results, predictor.explain_batch(records, canonical=True))
+        
+        response = []
+        for index, result in enumerate(results):
+            if 'error' in result:
+                response.append(dict(result, index=index))
+                continue
+            prediction = result['prediction']
+            del result['record']
+            response.append(dict(
+                result,
+                index=index,
+                prediction_label='Seeking Treatment' if prediction == 1 else 'Not Seeking Treatment',
+                confidence=round(result['confidence'] * 100, 2)
+            ))
+        
+        return jsonify({
+            'results': response,
+            'count': len(response),
+            'errors': sum(1 for item in response if 'error' in item),
+            'model_version': version,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"API batch explain error: {e}")
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/what_if', methods=['POST'])
+def api_what_if():
+    """How the prediction changes if any one answer were different"""
+    try:
+        version, predictor = registry.active
+        if predictor is None:
+            return jsonify({'error': 'Model not available'}), 500
+        
+        with metrics.timer('parse'):
+            data, errors = schema.validate(request.get_json(silent=True))
+        if errors:
+            return _invalid_request(errors)
+        result = predictor.what_if(data, canonical=True)
+        
+        with metrics.timer('serialize'):
+            return jsonify({
+                'probability': round(result['probability'] * 100, 2),
+                'prediction': result['prediction'],
+                'alternatives': [
+                    dict(alternative,
+                         probability=round(alternative['probability'] * 100, 2),
+                         delta=round(alternative['delta'] * 100, 2))
+                    for alternative in result['alternatives']
+                ],
+                'model_version': version,
+                'timestamp': datetime.now().isoformat()
+            })
+        
+    except Exception as e:
+        logger.error(f"API what-if error: {e}")
+        return jsonify({'error': str(e)}), 400
+
+def _parse_batch_body(req):
+    """
+    Parse a batch request body into records.
+    
+    Accepts either a JSON array of objects or newline-delimited JSON.
+    Lines of an NDJSON body that are not valid JSON are kept as ``None``
+    placeholders and reported in the returned error map by index.
+    """
+    body = req.get_data(as_text=True)
+    parse_errors = {}
+    
+    if req.mimetype == 'application/json' or body.lstrip().startswith('['):
+        records = json.loads(body)
+        if not isinstance(records, list):
+            raise ValueError('Expected a JSON array of records')
+        return records, parse_errors
+    
+    records = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError as e:
+            parse_errors[len(records)] = f'Invalid JSON: {e}'
+            records.append(None)
+    return records, parse_errors
+
+def _validate_batch(records, parse_errors):
+    """
+    Validate every record of a batch.
+    
+    Returns:
+        Tuple[List, List]: The canonical valid records, and one entry per
+        input record: an ``error`` (with ``details`` for schema errors) or
+        a placeholder that ``_merge_scored`` fills with the scored result
+    """
+    valid = []
+    results = []
+    for index, record in enumerate(records):
+        if index in parse_errors:
+            results.append({'error': parse_errors[index]})
+            continue
+        canonical, errors = schema.validate(record)
+        if errors:
+            results.append({'error': 'Invalid record', 'details': errors})
+        else:
+            valid.append(canonical)
+            results.append({'record': canonical})
+    return valid, results
+
+def _merge_scored(results, scored):
+    """Fill the placeholders left by ``_validate_batch`` in order"""
+    scored = iter(scored)
+    for result in results:
+        if 'record' in result:
+            result.update(next(scored))
+            if 'error' in result:
+                del result['record']
+
 @app.route('/about')
 def about():
     """About page with project details"""
-    return render_template('about.html')
+    return _static_page('about.html')
 
-@app.route('/api/health')
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Fingerprinted static asset with immutable cache headers"""
+    response = assets.response(filename)
+    if response is None:
+        abort(404)
+    return response
+
+def health_payload():
+    """Health check body (shared with the async entry point)"""
+    version, predictor = registry.active
+    return {
         'status': 'healthy',
         'model_loaded': predictor is not None,
+        'model_version': version,
+        'model': registry.status(),
+        'cache': predictor.cache.stats() if predictor is not None and predictor.cache is not None else None,
+        'normalization': schema.normalization_stats(),
+        'validation': schema.stats(),
+        'micro_batching': batcher.stats() if batcher is not None else None,
+        'logging': log_handler.stats(),
         'timestamp': datetime.now().isoformat()
-    })
+    }
+
+@app.route('/api/health')
+def health_check():
+    """Health check endpoint"""
+    return jsonify(health_payload())
+
+def _is_admin(req):
+    """Whether the request carries the admin token (admin endpoints are off without ADMIN_TOKEN)"""
+    token = req.headers.get('X-Admin-Token', '')
+    return ADMIN_TOKEN is not None and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+@app.route('/api/admin/reload', methods=['POST'])
+def admin_reload():
+    """
+    Load a model version and make it active.
+    
+    With ``{"version": "..."}`` that version is loaded and, once it is
+    serving, recorded in ``CURRENT`` so the other workers follow; without a
+    body this worker picks up whatever ``CURRENT`` names now.
+    """
+    if not _is_admin(request):
+        return jsonify({'error': 'Forbidden'}), 403
+    if MODELS_DIR is None:
+        return jsonify({'error': 'Hot reload requires MODELS_DIR'}), 400
+    
+    version = (request.get_json(silent=True) or {}).get('version')
+    if version is None:
+        registry.check()
+    elif (not isinstance(version, str) or version in ('.', '..') or os.path.basename(version) != version
+          or not os.path.isdir(os.path.join(MODELS_DIR, version))):
+        return jsonify({'error': f"Unknown model version '{version}'"}), 404
+    elif registry.load_version(version):
+        set_current(MODELS_DIR, version)
+    else:
+        return jsonify({'error': registry.last_error, 'model': registry.status()}), 422
+    return jsonify({'model': registry.status()})
+
+@app.route('/api/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """
+    Profile the next requests served by this worker.
+    
+    POST ``{"requests": N}`` or ``{"seconds": T}`` (optionally ``"top"``)
+    arms a session; GET reports its progress and, once it has ended, the
+    merged cProfile function table and the tracemalloc allocation top-list.
+    Both answer for the worker that receives them (see ``pid``).
+    """
+    if not _is_admin(request):
+        return jsonify({'error': 'Forbidden'}), 403
+    if request.method == 'GET':
+        return jsonify(profiler.status())
+    
+    options = request.get_json(silent=True) or {}
+    try:
+        return jsonify(profiler.start(options.get('requests'), options.get('seconds'), options.get('top'))), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e), 'profile': profiler.status()}), 409
+
+@app.route('/api/stats')
+def stats_endpoint():
+    """Aggregates over the audit store (from incrementally maintained rollups)"""
+    if audit is None:
+        return jsonify({'error': 'Audit store disabled (set AUDIT_DB)'}), 404
+    try:
+        hours = int(request.args.get('hours', 24))
+    except ValueError:
+        return jsonify({'error': 'hours must be an integer'}), 400
+    hours = min(max(hours, 1), 24 * 366)
+    return jsonify(dict(audit.stats(hours, request.args.get('field')),
+                        timestamp=datetime.now().isoformat()))
+
+@app.route('/api/metrics')
+def metrics_endpoint():
+    """Prometheus metrics, aggregated across all worker processes"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Async (ASGI) entry point for the Mental Health Prediction app.
+
+Under gunicorn sync workers a slow client holds a whole worker while its
+request or response crawls over the network, so concurrency is capped at
+``workers * threads``. Here an event loop (uvicorn) owns the connections
+and only the CPU-bound work leaves it: model scoring runs on a bounded
+thread pool of ``INFERENCE_THREADS`` threads (NumPy releases the GIL for
+the matrix work), and the pool's queue absorbs bursts instead of the
+listen backlog.
+
+``/api/predict`` and ``/api/health`` are served natively on the loop.
+Every other route (the form flow, pages, assets, batch and admin
+endpoints) is the unchanged Flask app, called through a small WSGI bridge
+on the same pool, so both entry points share one model registry, schema,
+metrics and audit store.
+
+Usage:
+    python asgi_app.py
+
+``python asgi_app.py`` binds the socket itself and forks
+``WEB_CONCURRENCY`` workers after loading the app; prefer it over
+``uvicorn --workers``, whose shared socket leaves ``TCP_NODELAY`` off (see
+``_listen``). Workers that exit are not restarted; leave that to the
+process manager or container runtime.
+
+Environment variables:
+    PORT                 Port to bind (default 5000)
+    WEB_CONCURRENCY      Number of worker processes (default 1)
+    INFERENCE_THREADS    Scoring/WSGI threads per process (default 4)
+    INFERENCE_QUEUE      Requests waiting for a thread before new ones get
+                         503 (default 256)
+"""
+
+import asyncio
+import functools
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+import app as flask_app
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', 4))
+INFERENCE_QUEUE = int(os.environ.get('INFERENCE_QUEUE', 256))
+
+class InferencePool:
+    """
+    Bounded thread pool for blocking work called from the event loop.
+    
+    At most ``threads`` calls run at once and at most ``max_queued`` more
+    wait; beyond that ``run`` raises ``OverflowError`` so the caller can
+    shed load instead of queueing without limit.
+    """
+    
+    def __init__(self, threads: int = INFERENCE_THREADS, max_queued: int = INFERENCE_QUEUE):
+        self.threads = threads
+        self.max_queued = max_queued
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='inference')
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    async def run(self, function: Callable, *args) -> Any:
+        """Run ``function(*args)`` on the pool and await its result"""
+        if self.pending >= self.threads + self.max_queued:
+            self.rejected += 1
+            raise OverflowError('Inference queue is full')
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'threads': self.threads,
+            'max_queued': self.max_queued,
+            'in_flight': self.pending,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+
+pool = InferencePool()
+
+class WsgiBridge:
+    """
+    Serve a WSGI app from ASGI, running it on the inference pool.
+    
+    The request body is read on the loop and the WSGI response is collected
+    in full before it is sent, which suits this app's small pages and JSON
+    bodies (nothing here streams).
+    """
+    
+    def __init__(self, wsgi_app: Callable, inference_pool: InferencePool):
+        self.wsgi_app = wsgi_app
+        self.pool = inference_pool
+    
+    def _environ(self, scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+            'REMOTE_ADDR': client[0],
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif name != 'CONTENT_LENGTH':
+                key = f'HTTP_{name}'
+                environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+    
+    def _call(self, environ: Dict[str, Any]):
+        started: List[Any] = []
+        
+        def start_response(status, headers, exc_info=None):
+            started[:] = [status, headers]
+        
+        result = self.wsgi_app(environ, start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return started[0], started[1], body
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        
+        try:
+            status, headers, body = await self.pool.run(self._call, self._environ(scope, b''.join(chunks)))
+        except OverflowError:
+            status, headers, body = '503 Service Unavailable', [('Content-Type', 'text/plain')], b'Server busy'
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+def _record_metrics(endpoint: str, started: float, status: int):
+    """Same request metrics the Flask hooks record"""
+    metrics = flask_app.metrics
+    metrics.observe('mh_request_duration_seconds', time.perf_counter() - started, {'endpoint': endpoint})
+    metrics.inc('mh_requests_total', {'endpoint': endpoint, 'status': status})
+    if status >= 400:
+        metrics.inc('mh_request_errors_total', {'endpoint': endpoint})
+
+async def api_predict(request: Request) -> JSONResponse:
+    """``/api/predict``: validation on the loop, scoring on the inference pool"""
+    started = time.perf_counter()
+    flask_app.registry.ensure_watcher()
+    response = await _predict(request, started)
+    _record_metrics('api_predict', started, response.status_code)
+    return response
+
+async def _predict(request: Request, started: float) -> JSONResponse:
+    version, predictor = flask_app.registry.active
+    if predictor is None:
+        return JSONResponse({'error': 'Model not available'}, status_code=500)
+    
+    body = await request.body()
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    record, errors = flask_app.schema.validate(data)
+    if errors:
+        return JSONResponse({'error': 'Invalid request', 'details': errors}, status_code=422)
+    
+    try:
+        if flask_app.batcher is not None:
+            prediction, confidence = await pool.run(flask_app.batcher.predict, record, flask_app.BATCH_TIMEOUT)
+        else:
+            score = predictor.predict
+            if flask_app.profiler.active:
+                score = functools.partial(flask_app.profiler.call, 'api_predict', score)
+            prediction, confidence = await pool.run(score, record, True)
+    except OverflowError:
+        return JSONResponse({'error': 'Server busy'}, status_code=503)
+    except Exception as e:
+        logger.error(f"API prediction error: {e}")
+        return JSONResponse({'error': str(e)}, status_code=400)
+    
+    if flask_app.audit is not None:
+        flask_app.audit.record(record, prediction, confidence, version,
+                               (time.perf_counter() - started) * 1000, 'api_predict')
+    return JSONResponse(flask_app.prediction_payload(prediction, confidence, version))
+
+async def health_check(request: Request) -> JSONResponse:
+    """``/api/health`` plus the inference pool's counters"""
+    started = time.perf_counter()
+    response = JSONResponse(dict(flask_app.health_payload(), inference_pool=pool.stats()))
+    _record_metrics('health_check', started, response.status_code)
+    return response
+
+app = Starlette(routes=[
+    Route('/api/predict', api_predict, methods=['POST']),
+    Route('/api/health', health_check, methods=['GET']),
+    Mount('/', app=WsgiBridge(flask_app.app, pool))
+])
+
+def _listen(port: int) -> socket.socket:
+    """
+    Listening socket shared by all worker processes.
+    
+    It is created with ``IPPROTO_TCP`` rather than the default protocol 0:
+    asyncio only sets ``TCP_NODELAY`` on accepted connections of such
+    sockets, and without it the separately written response head and body
+    wait on Nagle's algorithm and the client's delayed ACK (~40 ms per
+    keep-alive request).
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('0.0.0.0', port))
+    sock.listen(2048)
+    return sock
+
+def main() -> int:
+    import uvicorn
+    
+    workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+    sock = _listen(int(os.environ.get('PORT', 5000)))
+    config = uvicorn.Config(app, log_config=None, timeout_keep_alive=30)
+    if workers == 1:
+        uvicorn.Server(config).run(sockets=[sock])
+        return 0
+    
+    # Workers are forked after the app (and the model) is loaded, sharing it
+    # copy-on-write like gunicorn's preload_app; they publish metric
+    # snapshots to one directory so /api/metrics covers all of them
+    if flask_app.metrics.directory is None:
+        flask_app.metrics.directory = tempfile.mkdtemp(prefix='mental-health-metrics-')
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+    
+    def stop(signum, frame):
+        for child in children:
+            os.kill(child, signal.SIGTERM)
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for child in children:
+        os.waitpid(child, 0)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
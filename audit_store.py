@@ -0,0 +1,268 @@
+"""
+Prediction audit log in SQLite.
+
+Every served prediction (canonical inputs, output, confidence, model
+version, latency) is queued in memory and written by a background thread in
+batches, one transaction per batch, to a SQLite database in WAL mode, so a
+request never waits on disk. Each gunicorn worker has its own writer; WAL
+plus a busy timeout lets them share one database file.
+
+Aggregates are served from rollup tables that the writer updates in the
+same transaction as the inserts (hourly volume per model version, and
+counts per field value), so ``stats()`` reads a few hundred rows no matter
+how many predictions are stored.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fork_safe_thread import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    endpoint TEXT,
+    model_version TEXT,
+    prediction INTEGER NOT NULL,
+    confidence REAL NOT NULL,
+    latency_ms REAL,
+    inputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_ts ON predictions (ts);
+CREATE TABLE IF NOT EXISTS rollup_hourly (
+    hour INTEGER NOT NULL,
+    model_version TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    positives INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    latency_sum REAL NOT NULL,
+    PRIMARY KEY (hour, model_version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_field (
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    positives INTEGER NOT NULL,
+    PRIMARY KEY (field, value)
+) WITHOUT ROWID;
+"""
+
+# Value recorded in rollups for answers the normalizer did not recognize
+UNMAPPED_VALUE = '<unmapped>'
+
+def _age_bucket(age: float) -> str:
+    decade = int(age) // 10 * 10
+    return f'{decade}-{decade + 9}'
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the database in WAL mode with the schema in place"""
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+class AuditStore:
+    """
+    Batched background writer and rollup queries for the audit database.
+    """
+    
+    def __init__(self, path: str, canonicalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 batch_size: int = 500, flush_interval: float = 1.0, queue_size: int = 10000):
+        """
+        Args:
+            path (str): SQLite database file
+            canonicalize (Callable, optional): Turns a raw input record into its
+                canonical form; runs on the writer thread
+            batch_size (int): Maximum predictions per transaction
+            flush_interval (float): Seconds the writer waits to fill a batch
+            queue_size (int): Predictions buffered before new ones are dropped
+        """
+        self.path = path
+        self.canonicalize = canonicalize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = None
+        self._writer = ForkSafeThread(self._run, 'audit-writer', self._new_queue)
+        self._local = threading.local()
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connect(path).close()
+    
+    def _new_queue(self):
+        self._queue = queue.Queue(self.queue_size)
+        return (self._queue,)
+    
+    def record(self, inputs: Dict[str, Any], prediction: int, confidence: float,
+               model_version: Optional[str] = None, latency_ms: Optional[float] = None,
+               endpoint: Optional[str] = None) -> None:
+        """Queue one served prediction; never blocks"""
+        self._writer.ensure()
+        try:
+            self._queue.put_nowait((time.time(), endpoint, model_version, int(prediction),
+                                    float(confidence), latency_ms, inputs))
+        except queue.Full:
+            self.dropped += 1
+    
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything queued so far is written"""
+        if not self._writer.running:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+    
+    def _run(self, pending: queue.Queue):
+        connection = connect(self.path)
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not isinstance(batch[-1], threading.Event):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            events = [item for item in batch if isinstance(item, threading.Event)]
+            rows = [item for item in batch if not isinstance(item, threading.Event)]
+            if rows:
+                try:
+                    self._write(connection, rows)
+                    self.written += len(rows)
+                except Exception as e:
+                    self.failed += len(rows)
+                    logger.error(f"Audit write failed for {len(rows)} predictions: {e}")
+            for event in events:
+                event.set()
+    
+    def _write(self, connection: sqlite3.Connection, rows: List[tuple]):
+        """Insert a batch and fold it into the rollups in one transaction"""
+        inserts = []
+        hourly = defaultdict(lambda: [0, 0, 0.0, 0.0])
+        by_field = defaultdict(lambda: [0, 0])
+        for ts, endpoint, version, prediction, confidence, latency_ms, inputs in rows:
+            canonical = self.canonicalize(inputs) if self.canonicalize else dict(inputs)
+            inserts.append((ts, endpoint, version, prediction, confidence, latency_ms,
+                            json.dumps(canonical, sort_keys=True, default=str)))
+            
+            totals = hourly[(int(ts // 3600), version or '')]
+            totals[0] += 1
+            totals[1] += prediction
+            totals[2] += confidence
+            totals[3] += latency_ms or 0.0
+            for field, value in canonical.items():
+                if field == 'Age':
+                    value = _age_bucket(value)
+                counts = by_field[(field, UNMAPPED_VALUE if value is None else str(value))]
+                counts[0] += 1
+                counts[1] += prediction
+        
+        with connection:
+            connection.executemany(
+                'INSERT INTO predictions (ts, endpoint, model_version, prediction, confidence, '
+                'latency_ms, inputs) VALUES (?, ?, ?, ?, ?, ?, ?)', inserts)
+            connection.executemany(
+                'INSERT INTO rollup_hourly VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (hour, model_version) DO UPDATE SET '
+                'count = count + excluded.count, positives = positives + excluded.positives, '
+                'confidence_sum = confidence_sum + excluded.confidence_sum, '
+                'latency_sum = latency_sum + excluded.latency_sum',
+                [(hour, version, *totals) for (hour, version), totals in hourly.items()])
+            connection.executemany(
+                'INSERT INTO rollup_field VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (field, value) DO UPDATE SET '
+                'count = count + excluded.count, positives = positives + excluded.positives',
+                [(field, value, *counts) for (field, value), counts in by_field.items()])
+    
+    def _reader(self) -> sqlite3.Connection:
+        """Read connection for the calling thread"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            connection = connect(self.path)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+    
+    def stats(self, hours: int = 24, field: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregates from the rollup tables.
+        
+        Args:
+            hours (int): Number of most recent hours in the hourly series
+            field (str, optional): Restrict ``by_field`` to one field
+        
+        Returns:
+            Dict[str, Any]: Totals, hourly volume, per model version and per
+            field value counts and positive rates
+        """
+        connection = self._reader()
+        
+        def rate(positives, count):
+            return round(positives / count, 4) if count else None
+        
+        count, positives, confidence_sum, latency_sum = connection.execute(
+            'SELECT COALESCE(SUM(count), 0), COALESCE(SUM(positives), 0), '
+            'COALESCE(SUM(confidence_sum), 0), COALESCE(SUM(latency_sum), 0) FROM rollup_hourly'
+        ).fetchone()
+        
+        since = int(time.time() // 3600) - hours + 1
+        hourly = [
+            {
+                'hour': datetime.fromtimestamp(hour * 3600, timezone.utc).isoformat(),
+                'count': hour_count,
+                'positive_rate': rate(hour_positives, hour_count)
+            }
+            for hour, hour_count, hour_positives in connection.execute(
+                'SELECT hour, SUM(count), SUM(positives) FROM rollup_hourly '
+                'WHERE hour >= ? GROUP BY hour ORDER BY hour', (since,))
+        ]
+        
+        by_version = {
+            version or 'unknown': {'count': version_count, 'positive_rate': rate(version_positives, version_count)}
+            for version, version_count, version_positives in connection.execute(
+                'SELECT model_version, SUM(count), SUM(positives) FROM rollup_hourly GROUP BY model_version')
+        }
+        
+        query = 'SELECT field, value, count, positives FROM rollup_field'
+        params = ()
+        if field is not None:
+            query += ' WHERE field = ?'
+            params = (field,)
+        by_field: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for row_field, value, value_count, value_positives in connection.execute(query + ' ORDER BY field, value', params):
+            by_field[row_field][value] = {'count': value_count, 'positive_rate': rate(value_positives, value_count)}
+        
+        return {
+            'total': count,
+            'positive_rate': rate(positives, count),
+            'mean_confidence': round(confidence_sum / count, 4) if count else None,
+            'mean_latency_ms': round(latency_sum / count, 3) if count else None,
+            'hourly': hourly,
+            'by_model_version': by_version,
+            'by_field': dict(by_field),
+            'writer': {
+                'written': self.written,
+                'pending': self._queue.qsize() if self._queue is not None else 0,
+                'dropped': self.dropped,
+                'failed': self.failed
+            }
+        }
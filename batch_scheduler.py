@@ -0,0 +1,133 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+from fork_safe_thread import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+class MicroBatcher:
+    """
+    Collects concurrent single predictions into small batches.
+    
+    Requests submitted within ``window_ms`` of the first queued request, up
+    to ``max_batch_size``, are scored together with one ``predict_batch``
+    call on a background thread; each caller gets its own result back.
+    Useful with threaded workers (e.g. gunicorn ``--threads``), where
+    several requests are in flight per process.
+    """
+    
+    def __init__(self, score_batch: Callable[[List[Any]], List[Dict[str, Any]]],
+                 window_ms: float = 2.0, max_batch_size: int = 32):
+        """
+        Args:
+            score_batch (Callable): Scores a list of records, returning one
+                result dict per record (e.g. ``MentalHealthPredictor.predict_batch``)
+            window_ms (float): Maximum time to wait for more requests after the
+                first one in a batch arrives
+            max_batch_size (int): Maximum number of records per batch
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_batch = score_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = ForkSafeThread(self._run, 'micro-batcher', self._new_queue)
+        
+        self.batches = 0
+        self.records = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.queue_delay_total = 0.0
+        self.queue_delay_max = 0.0
+    
+    def _new_queue(self):
+        self._queue = queue.Queue()
+        return (self._queue,)
+    
+    def submit(self, record: Any) -> Future:
+        """
+        Queue a record for scoring.
+        
+        Returns:
+            Future: Resolves to the record's result dict
+        """
+        self._worker.ensure()
+        future = Future()
+        self._queue.put((record, future, time.perf_counter()))
+        return future
+    
+    def predict(self, record: Any, timeout: float = None) -> Tuple[int, float]:
+        """
+        Score one record through the batcher, like ``MentalHealthPredictor.predict``.
+        
+        Raises:
+            ValueError: If the record could not be scored
+        """
+        result = self.submit(record).result(timeout)
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result['prediction'], result['confidence']
+    
+    def _run(self, pending: queue.Queue):
+        while True:
+            batch = [pending.get()]
+            deadline = batch[0][2] + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._score(batch)
+    
+    def _score(self, batch: List[Tuple[Any, Future, float]]):
+        started = time.perf_counter()
+        try:
+            results = self.score_batch([record for record, _, _ in batch])
+        except Exception as e:
+            logger.error(f"Micro-batch scoring error: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+        
+        delays = [started - queued_at for _, _, queued_at in batch]
+        with self._lock:
+            self.batches += 1
+            self.records += len(batch)
+            self.batch_size_counts[_bucket_index(len(batch))] += 1
+            self.queue_delay_total += sum(delays)
+            self.queue_delay_max = max(self.queue_delay_max, max(delays))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Batch size and queueing delay metrics"""
+        with self._lock:
+            labels = [f'<={bound}' for bound in BATCH_SIZE_BUCKETS] + [f'>{BATCH_SIZE_BUCKETS[-1]}']
+            return {
+                'window_ms': self.window * 1000.0,
+                'max_batch_size': self.max_batch_size,
+                'batches': self.batches,
+                'records': self.records,
+                'mean_batch_size': round(self.records / self.batches, 2) if self.batches else 0.0,
+                'batch_size_histogram': dict(zip(labels, self.batch_size_counts)),
+                'mean_queue_delay_ms': round(self.queue_delay_total / self.records * 1000, 3) if self.records else 0.0,
+                'max_queue_delay_ms': round(self.queue_delay_max * 1000, 3)
+            }
+
+def _bucket_index(size: int) -> int:
+    for index, bound in enumerate(BATCH_SIZE_BUCKETS):
+        if size <= bound:
+            return index
+    return len(BATCH_SIZE_BUCKETS)
@@ -0,0 +1,63 @@
+"""
+Start and stop a local app server for the benchmarks.
+
+Shared by bench_async.py, bench_workers.py and loadtest.py: the server
+(gunicorn with gunicorn.conf.py, or asgi_app.py) is started on a free port
+with the given worker/thread settings and is ready once /api/health
+answers.
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+    'asgi': [sys.executable, 'asgi_app.py'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server, port, workers, threads=None, env=None, timeout=60.0):
+    """
+    Start ``server`` and wait until /api/health answers.
+
+    ``threads`` sets GUNICORN_THREADS and INFERENCE_THREADS (left to the
+    server's defaults when None); ``env`` adds further environment variables.
+    """
+    environment = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers), **(env or {}))
+    if threads is not None:
+        environment.update(GUNICORN_THREADS=str(threads), INFERENCE_THREADS=str(threads))
+    process = subprocess.Popen(SERVERS[server], cwd=ROOT, env=environment,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{server} exited with status {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    stop_server(process)
+    raise RuntimeError(f'{server} did not become healthy within {timeout}s')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
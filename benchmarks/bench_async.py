@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Compare concurrent-client throughput of the gunicorn (sync workers) and
+uvicorn (asgi_app.py) entry points.
+
+Each server is started with the same number of worker processes. Fast
+clients post ``/api/predict`` requests back to back over keep-alive
+connections for a fixed time; optional slow clients send their request
+headers, wait ``--slow-ms`` and only then the body, the way a client on a
+poor network does. Throughput and latency are reported for the fast
+clients only, so the table shows how much the slow ones get in their way.
+
+Usage (from the repository root):
+    python benchmarks/bench_async.py [--workers 2] [--clients 8 64] [--slow-clients 4]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _server import free_port, start_server, stop_server  # noqa: E402
+
+BODY = json.dumps({
+    'Age': 30, 'gender': 'female', 'family_history': 'yes', 'work_interfere': 'sometimes',
+    'benefits': 'yes', 'seek_help': "don't know", 'coworkers': 'some of them'
+}).encode()
+
+# Report name -> _server.SERVERS entry
+SERVERS = {
+    'gunicorn-sync': 'gunicorn',
+    'uvicorn-async': 'asgi',
+}
+
+
+def fast_client(port, stop, latencies, errors):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            connection.request('POST', '/api/predict', BODY, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+            latencies.append(time.perf_counter() - started)
+        except (OSError, http.client.HTTPException):
+            errors.append(None)
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.close()
+
+
+def slow_client(port, stop, delay):
+    while not stop.is_set():
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+                sock.sendall(b'POST /api/predict HTTP/1.1\r\nHost: localhost\r\n'
+                             b'Content-Type: application/json\r\n'
+                             b'Content-Length: %d\r\nConnection: close\r\n\r\n' % len(BODY))
+                time.sleep(delay)
+                sock.sendall(BODY)
+                while sock.recv(65536):
+                    pass
+        except OSError:
+            time.sleep(delay)
+
+
+def run_load(port, clients, slow_clients, slow_ms, duration):
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [threading.Thread(target=fast_client, args=(port, stop, latencies, errors))
+               for _ in range(clients)]
+    threads += [threading.Thread(target=slow_client, args=(port, stop, slow_ms / 1000))
+                for _ in range(slow_clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+
+    def percentile(q):
+        return round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000, 2) if latencies else None
+
+    return {
+        'clients': clients,
+        'slow_clients': slow_clients,
+        'requests_per_second': round(len(latencies) / duration, 1),
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent-client throughput of sync vs async serving.')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes per server')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='GUNICORN_THREADS for gunicorn, INFERENCE_THREADS for uvicorn')
+    parser.add_argument('--clients', type=int, nargs='+', default=[8, 64])
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--slow-ms', type=float, default=200)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=list(SERVERS))
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = []
+    for server in args.servers:
+        port = free_port()
+        process = start_server(SERVERS[server], port, args.workers, args.threads, {'LOG_LEVEL': 'WARNING'})
+        try:
+            run_load(port, 2, 0, args.slow_ms, 1)  # warm up every worker
+            for clients in args.clients:
+                result = dict(run_load(port, clients, args.slow_clients, args.slow_ms, args.duration),
+                              server=server)
+                results.append(result)
+                print(f"{server:14s} clients {clients:4d} (+{args.slow_clients} slow)  "
+                      f"{result['requests_per_second']:8.1f} req/s  p50 {result['p50_ms']} ms  "
+                      f"p99 {result['p99_ms']} ms  errors {result['errors']}")
+        finally:
+            stop_server(process)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: compiled FeatureEncoder vs the original DataFrame encoder.
+
+Usage (from the repository root):
+    python benchmarks/bench_encoder.py [--repeat 2000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_predictor import MentalHealthPredictor  # noqa: E402
+from reference_encoder import encode_frame  # noqa: E402
+
+SAMPLE = {
+    'Age': 28, 'gender': 'female', 'self_employed': 'no', 'family_history': 'yes',
+    'work_interfere': 'sometimes', 'remote_work': 'yes', 'tech_company': 'yes',
+    'benefits': 'yes', 'care_options': 'yes', 'wellness_program': 'no',
+    'seek_help': 'yes', 'mental_health_consequence': 'maybe',
+    'phys_health_consequence': 'no', 'coworkers': 'some of them', 'supervisor': 'yes',
+    'mental_health_interview': 'no', 'phys_health_interview': 'maybe',
+    'mental_vs_physical': 'yes'
+}
+
+
+def per_row_us(fn, repeat):
+    return min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    predictor = MentalHealthPredictor('mental_health_model.pkl')
+    encoder = predictor.encoder
+    row = np.empty(encoder.n_features, dtype=encoder.dtype)
+    batch = [SAMPLE] * 1000
+
+    legacy = per_row_us(lambda: encode_frame(SAMPLE), args.repeat)
+    compiled = per_row_us(lambda: encoder.encode_into(SAMPLE, row), args.repeat)
+    batched = per_row_us(lambda: encoder.encode_batch(batch), max(args.repeat // 1000, 1)) / len(batch)
+
+    print(f"legacy DataFrame encoder : {legacy:9.2f} us/row")
+    print(f"compiled encode_into     : {compiled:9.2f} us/row  ({legacy / compiled:.0f}x)")
+    print(f"compiled encode_batch    : {batched:9.2f} us/row  ({legacy / batched:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Track the startup (import) cost of the app with ``python -X importtime``.
+
+Each serving mode is imported in a fresh interpreter several times; the
+best run's total import time, the heaviest top-level packages, and whether
+pandas/sklearn/joblib were loaded are reported. Results are appended to a
+JSONL history file so startup cost can be tracked over time.
+
+Usage (from the repository root):
+    python benchmarks/bench_import_time.py [--runs 5] [--history benchmarks/import_time_history.jsonl]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'legacy (pickle)': {'MODEL_PATH': 'mental_health_model.pkl'},
+    'fast (artifact)': {'MODEL_PATH': 'mental_health_model.json'},
+}
+
+HEAVY_MODULES = ('pandas', 'sklearn', 'joblib', 'scipy')
+
+PROBE = "import sys, app; print(' '.join(m for m in %r if m in sys.modules))" % (HEAVY_MODULES,)
+
+
+def import_profile(env):
+    """Run one interpreter with -X importtime and parse its report"""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT, env=dict(os.environ, **env), capture_output=True, text=True, check=True
+    )
+    wall = time.perf_counter() - started
+
+    total_us, packages = 0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        # Top-level imports are the unindented entries
+        if not name[1:].startswith(' '):
+            top = name.strip().split('.')[0]
+            packages[top] = packages.get(top, 0) + int(cumulative_us)
+
+    return {
+        'wall_ms': round(wall * 1000, 1),
+        'import_ms': round(total_us / 1000, 1),
+        'heavy_modules_loaded': proc.stdout.split(),
+        'top_packages_ms': {name: round(us / 1000, 1) for name, us in
+                            sorted(packages.items(), key=lambda item: -item[1])[:8]},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time benchmark for app startup.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--history', help='Append results to this JSONL file')
+    args = parser.parse_args()
+
+    record = {'timestamp': datetime.now().isoformat(), 'revision': git_revision(), 'modes': {}}
+    for mode, env in MODES.items():
+        runs = [import_profile(env) for _ in range(args.runs)]
+        best = min(runs, key=lambda run: run['import_ms'])
+        record['modes'][mode] = best
+        print(f"{mode:16s} import {best['import_ms']:8.1f} ms  wall {best['wall_ms']:8.1f} ms  "
+              f"heavy: {', '.join(best['heavy_modules_loaded']) or 'none'}")
+
+    if args.history:
+        previous = None
+        if os.path.exists(args.history):
+            with open(args.history) as f:
+                lines = [line for line in f if line.strip()]
+            previous = json.loads(lines[-1]) if lines else None
+        if previous:
+            for mode, result in record['modes'].items():
+                before = previous['modes'].get(mode)
+                if before:
+                    change = result['import_ms'] - before['import_ms']
+                    print(f"{mode:16s} vs {previous.get('revision')}: {change:+.1f} ms")
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
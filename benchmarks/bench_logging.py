@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: predict() latency with logging off, synchronous and queued.
+
+Compares a request-path ``predict`` call (native engine, cache disabled)
+with logging disabled, with the old synchronous ``basicConfig``-style
+handler, and with the queue-based JSON handler, with and without INFO
+sampling. Also reports the cost of a single ``logger.info`` call on the
+calling thread. Log output goes to a temporary file.
+
+Usage (from the repository root):
+    python benchmarks/bench_logging.py [--repeat 5000]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_predictor import MentalHealthPredictor  # noqa: E402
+from structured_logging import configure_logging  # noqa: E402
+from bench_encoder import SAMPLE  # noqa: E402
+
+
+def latencies_us(predictor, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        predictor.predict(SAMPLE)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def log_call_us(repeat):
+    log = logging.getLogger('bench')
+    number = max(repeat // 5, 100)
+    return min(timeit.repeat(lambda: log.info("Prediction made", extra={'prediction': 1, 'confidence': 0.9}),
+                             number=number, repeat=5)) / number * 1e6
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        if hasattr(handler, 'stop'):
+            handler.stop()
+        handler.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5000)
+    args = parser.parse_args()
+
+    predictor = MentalHealthPredictor('mental_health_model.pkl', engine='native')
+    log_file = tempfile.NamedTemporaryFile('w', suffix='.log', delete=False)
+
+    def sync_handler():
+        handler = logging.StreamHandler(log_file)
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        logging.getLogger().addHandler(handler)
+        logging.getLogger().setLevel(logging.INFO)
+
+    setups = [
+        ('logging off (WARNING)', lambda: logging.getLogger().setLevel(logging.WARNING)),
+        ('synchronous text handler', sync_handler),
+        ('queued JSON handler', lambda: configure_logging('INFO', stream=log_file)),
+        ('queued JSON, INFO=0.01', lambda: configure_logging('INFO', {logging.INFO: 0.01}, stream=log_file)),
+    ]
+
+    print(f"{'configuration':<28}{'log call us':>12}{'p50 us':>10}{'p99 us':>10}")
+    for name, setup in setups:
+        reset_root()
+        setup()
+        latencies_us(predictor, 200)  # warm up
+        call = log_call_us(args.repeat)
+        time.sleep(0.2)  # let the queued writer catch up
+        p50, p99 = latencies_us(predictor, args.repeat)
+        print(f"{name:<28}{call:>12.2f}{p50:>10.2f}{p99:>10.2f}")
+    reset_root()
+    log_file.close()
+    os.unlink(log_file.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: native linear scoring engine vs the sklearn Pipeline.
+
+Usage (from the repository root):
+    python benchmarks/bench_scoring.py [--repeat 2000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_predictor import MentalHealthPredictor  # noqa: E402
+from bench_encoder import SAMPLE  # noqa: E402
+
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def best_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    engines = {name: MentalHealthPredictor('mental_health_model.pkl', engine=name)
+               for name in ('sklearn', 'native')}
+
+    print("predict() single row")
+    single = {}
+    for name, predictor in engines.items():
+        number = args.repeat if name == 'native' else max(args.repeat // 20, 10)
+        single[name] = best_us(lambda: predictor.predict(SAMPLE), number)
+        print(f"  {name:8s}: {single[name]:9.2f} us/request")
+    print(f"  speedup : {single['sklearn'] / single['native']:.0f}x")
+
+    print("predict_batch() per row")
+    for size in BATCH_SIZES:
+        batch = [SAMPLE] * size
+        timings = {name: best_us(lambda: predictor.predict_batch(batch), 20) / size
+                   for name, predictor in engines.items()}
+        print(f"  batch {size:5d}: sklearn {timings['sklearn']:9.2f} us  "
+              f"native {timings['native']:7.2f} us  ({timings['sklearn'] / timings['native']:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Measure gunicorn boot time and per-worker memory with and without the
+shared (preload + memory-mapped) model loading mode.
+
+For each mode a gunicorn master is started with gunicorn.conf.py, the time
+until /api/health answers is recorded, and RSS, PSS and shared memory of
+every worker are read from /proc/<pid>/smaps_rollup (Linux only).
+
+Usage (from the repository root):
+    python benchmarks/bench_workers.py [--workers 4] [--output workers.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _server import free_port, start_server, stop_server  # noqa: E402
+
+MODES = {
+    'per-worker': {'GUNICORN_PRELOAD': '0', 'MODEL_MMAP_MODE': ''},
+    'preload+mmap': {'GUNICORN_PRELOAD': '1', 'MODEL_MMAP_MODE': 'r'},
+}
+
+
+def child_pids(pid):
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # Field 4 (after the parenthesised command name) is the parent pid
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def memory_kb(pid):
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        'private_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def measure(mode, workers, timeout=60.0):
+    port = free_port()
+    started = time.perf_counter()
+    master = start_server('gunicorn', port, workers, env=MODES[mode], timeout=timeout)
+    boot_seconds = time.perf_counter() - started
+    try:
+        # Wait until every worker is up and has served a request
+        deadline = time.perf_counter() + timeout
+        while len(child_pids(master.pid)) < workers and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        for _ in range(workers * 4):
+            urllib.request.urlopen(urllib.request.Request(
+                f'http://127.0.0.1:{port}/api/predict', data=b'{"Age": 30}',
+                headers={'Content-Type': 'application/json'}), timeout=5).read()
+
+        per_worker = [memory_kb(pid) for pid in child_pids(master.pid)]
+        return {
+            'mode': mode,
+            'workers': len(per_worker),
+            'boot_seconds': round(boot_seconds, 3),
+            'master': memory_kb(master.pid),
+            'per_worker': per_worker,
+            'mean_worker_rss_kb': sum(w['rss_kb'] for w in per_worker) // len(per_worker),
+            'mean_worker_pss_kb': sum(w['pss_kb'] for w in per_worker) // len(per_worker),
+        }
+    finally:
+        stop_server(master)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-worker RSS and boot time of gunicorn modes.')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = [measure(mode, args.workers) for mode in MODES]
+    for result in results:
+        print(f"{result['mode']:14s} boot {result['boot_seconds']:6.2f}s  "
+              f"worker RSS {result['mean_worker_rss_kb'] / 1024:7.1f} MiB  "
+              f"worker PSS {result['mean_worker_pss_kb'] / 1024:7.1f} MiB")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
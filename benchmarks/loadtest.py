@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Local load test of /api/predict and /submit_prediction against a real server.
+
+For every worker/thread configuration in the sweep, the app is started
+locally (gunicorn with gunicorn.conf.py, or asgi_app.py), then driven with
+payloads replayed from a JSONL corpus in increasing load steps: either a
+fixed number of concurrent clients (closed loop) or a target request rate
+(open loop, latency measured from each request's scheduled send time so a
+backed-up server is not hidden by the client slowing down). Each step
+records throughput, p50/p95/p99, a latency histogram and error rates per
+route; the first step that misses the rate, the latency SLO or the error
+budget is reported as the configuration's saturation point.
+
+Only the standard library is used on the client side; everything runs
+offline on one machine. Client threads share the box with the server, so
+compare configurations with each other rather than with production.
+
+Usage (from the repository root):
+    python benchmarks/loadtest.py --workers 1 2 4 --threads 1 4 --concurrency 4 16 64
+    python benchmarks/loadtest.py --workers 2 --rates 200 400 800 1600 --report loadtest.md
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _server import ROOT, SERVERS, free_port, start_server, stop_server  # noqa: E402
+from suite import DEFAULT_CORPUS, form_fields, load_corpus, percentiles  # noqa: E402
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+
+def build_requests(corpus, form_share):
+    """Encoded (route, path, body, headers) requests cycling through the corpus"""
+    form_every = round(1 / form_share) if form_share > 0 else 0
+    requests = []
+    for index, payload in enumerate(corpus):
+        if form_every and index % form_every == 0:
+            body = urllib.parse.urlencode(form_fields(payload)).encode()
+            requests.append(('form', '/submit_prediction', body,
+                             {'Content-Type': 'application/x-www-form-urlencoded'}))
+        else:
+            requests.append(('api', '/api/predict', json.dumps(payload).encode(),
+                             {'Content-Type': 'application/json'}))
+    return requests
+
+
+class Recorder:
+    """Latencies and outcomes per route, shared by the client threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+
+    def add(self, route, status, seconds):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            counts = self.statuses.setdefault(route, {})
+            counts[status] = counts.get(status, 0) + 1
+
+
+def send(connection, request, recorder, started):
+    route, path, body, headers = request
+    try:
+        connection.request('POST', path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        status = response.status
+    except (OSError, http.client.HTTPException):
+        connection.close()
+        status = 'connection_error'
+    recorder.add(route, status, time.perf_counter() - started)
+
+
+def closed_loop(port, requests, concurrency, duration, recorder):
+    """``concurrency`` clients sending back to back"""
+    stop = threading.Event()
+    counter = itertools.count()
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while not stop.is_set():
+            send(connection, requests[next(counter) % len(requests)], recorder, time.perf_counter())
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+def open_loop(port, requests, rate, duration, connections, recorder):
+    """Requests scheduled at a fixed rate, spread over ``connections`` clients"""
+    schedule = queue.SimpleQueue()
+    begin = time.perf_counter() + 0.05
+    total = int(rate * duration)
+    for index in range(total):
+        schedule.put(index)
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while True:
+            try:
+                index = schedule.get_nowait()
+            except queue.Empty:
+                break
+            scheduled = begin + index / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # Latency counts from the scheduled time, including time spent
+            # waiting for a free connection when the server falls behind
+            send(connection, requests[index % len(requests)], recorder, scheduled)
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - begin
+
+
+def histogram(latencies):
+    counts = [0] * len(BUCKETS_MS)
+    for seconds in latencies:
+        milliseconds = seconds * 1000
+        for index, bound in enumerate(BUCKETS_MS):
+            if milliseconds <= bound:
+                counts[index] += 1
+                break
+    return [{'le_ms': bound if bound != float('inf') else '+Inf', 'count': count}
+            for bound, count in zip(BUCKETS_MS, counts)]
+
+
+def summarize(recorder, elapsed):
+    """Per-route and overall throughput, percentiles, histogram and error rates"""
+    routes = {}
+    everything = []
+    totals = {'requests': 0, 'errors': 0, 'rejected': 0}
+    for route, latencies in recorder.latencies.items():
+        statuses = recorder.statuses[route]
+        requests = len(latencies)
+        errors = sum(count for status, count in statuses.items()
+                     if status == 'connection_error' or status >= 500)
+        # Handled but not scored: validation rejects the corpus' out-of-range
+        # records with a 422 (API) or a redirect back to the form
+        rejected = requests - errors - statuses.get(200, 0)
+        routes[route] = dict(
+            requests=requests,
+            throughput=round(requests / elapsed, 1),
+            error_rate=round(errors / requests, 4),
+            rejected_rate=round(rejected / requests, 4),
+            statuses={str(status): count for status, count in sorted(statuses.items(), key=str)},
+            histogram=histogram(latencies),
+            **{f'{name}_ms': round(value * 1000, 2) for name, value in percentiles(latencies).items()}
+        )
+        everything.extend(latencies)
+        totals['requests'] += requests
+        totals['errors'] += errors
+        totals['rejected'] += rejected
+    overall = {
+        'requests': totals['requests'],
+        'throughput': round(totals['requests'] / elapsed, 1) if elapsed else 0.0,
+        'error_rate': round(totals['errors'] / totals['requests'], 4) if totals['requests'] else 0.0,
+    }
+    if everything:
+        overall.update({f'{name}_ms': round(value * 1000, 2) for name, value in percentiles(everything).items()})
+    return {'overall': overall, 'routes': routes}
+
+
+def saturation(steps, slo_ms, max_error_rate):
+    """
+    First step at which the server is saturated, or None.
+
+    A step is saturated when its p99 exceeds the SLO, its error rate the
+    budget, or it delivers less than 95% of the offered rate (open loop) or
+    under 5% more throughput than the previous step (closed loop).
+    """
+    previous = None
+    for step in steps:
+        overall = step['overall']
+        reasons = []
+        if overall.get('p99_ms', 0) > slo_ms:
+            reasons.append(f"p99 {overall['p99_ms']} ms > {slo_ms} ms")
+        if overall['error_rate'] > max_error_rate:
+            reasons.append(f"error rate {overall['error_rate']:.2%}")
+        if step.get('rate') and overall['throughput'] < 0.95 * step['rate']:
+            reasons.append(f"{overall['throughput']} req/s delivered of {step['rate']} offered")
+        if step.get('rate') is None and previous is not None \
+                and overall['throughput'] < 1.05 * previous['overall']['throughput']:
+            reasons.append('throughput stopped growing')
+        if reasons:
+            return {
+                'step': step['load'],
+                'reasons': reasons,
+                'max_sustained_throughput': previous['overall']['throughput'] if previous else None
+            }
+        previous = step
+    return None
+
+
+def run_config(args, requests, workers, threads):
+    env = {'LOG_LEVEL': args.log_level}
+    if not args.cache:
+        env['PREDICTION_CACHE_SIZE'] = '0'
+    port = free_port()
+    process = start_server(args.server, port, workers, threads, env)
+    steps = []
+    try:
+        closed_loop(port, requests, max(workers * threads, 2), 1.0, Recorder())  # warm up
+        loads = [('rate', rate) for rate in args.rates] if args.rates else \
+            [('concurrency', clients) for clients in args.concurrency]
+        for kind, load in loads:
+            recorder = Recorder()
+            if kind == 'rate':
+                elapsed = open_loop(port, requests, load, args.duration, args.connections, recorder)
+            else:
+                started = time.perf_counter()
+                closed_loop(port, requests, load, args.duration, recorder)
+                elapsed = time.perf_counter() - started
+            step = dict(summarize(recorder, elapsed), load=f'{load:g} {"req/s" if kind == "rate" else "clients"}',
+                        rate=load if kind == 'rate' else None)
+            steps.append(step)
+            overall = step['overall']
+            print(f"  {step['load']:>14s}  {overall['throughput']:8.1f} req/s  p50 {overall.get('p50_ms')} ms  "
+                  f"p95 {overall.get('p95_ms')} ms  p99 {overall.get('p99_ms')} ms  "
+                  f"errors {overall['error_rate']:.2%}", flush=True)
+    finally:
+        stop_server(process)
+    return {
+        'server': args.server,
+        'workers': workers,
+        'threads': threads,
+        'steps': steps,
+        'saturation': saturation(steps, args.slo_ms, args.max_error_rate),
+    }
+
+
+def render_markdown(report):
+    """Human-readable report with one histogram per route and step"""
+    lines = [f"# Load test {report['meta']['timestamp']}", '',
+             f"Server `{report['meta']['server']}`, corpus `{report['meta']['corpus']}`, "
+             f"{report['meta']['duration']}s per step, p99 SLO {report['meta']['slo_ms']} ms", '',
+             '| workers | threads | saturation | max sustained req/s | reasons |',
+             '|---|---|---|---|---|']
+    for config in report['configs']:
+        point = config['saturation']
+        lines.append(f"| {config['workers']} | {config['threads']} | "
+                     f"{point['step'] if point else 'not reached'} | "
+                     f"{point['max_sustained_throughput'] if point else config['steps'][-1]['overall']['throughput']} | "
+                     f"{'; '.join(point['reasons']) if point else ''} |")
+    for config in report['configs']:
+        lines += ['', f"## {config['workers']} workers x {config['threads']} threads", '',
+                  '| load | route | req/s | p50 ms | p95 ms | p99 ms | errors | rejected |',
+                  '|---|---|---|---|---|---|---|---|']
+        for step in config['steps']:
+            for route, stats in sorted(step['routes'].items()):
+                lines.append(f"| {step['load']} | {route} | {stats['throughput']} | {stats['p50_ms']} | "
+                             f"{stats['p95_ms']} | {stats['p99_ms']} | {stats['error_rate']:.2%} | "
+                             f"{stats['rejected_rate']:.2%} |")
+        for step in config['steps']:
+            for route, stats in sorted(step['routes'].items()):
+                lines += ['', f"{step['load']}, {route}:", '```']
+                peak = max(bucket['count'] for bucket in stats['histogram']) or 1
+                for bucket in stats['histogram']:
+                    bound = str(bucket['le_ms'])
+                    lines.append(f"<= {bound:>5s} ms {bucket['count']:8d} {'#' * round(40 * bucket['count'] / peak)}")
+                lines.append('```')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local load test with latency percentiles.')
+    parser.add_argument('--server', choices=sorted(SERVERS), default='gunicorn')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64],
+                        help='Closed-loop client counts per step')
+    parser.add_argument('--rates', type=float, nargs='+',
+                        help='Open-loop request rates per step (instead of --concurrency)')
+    parser.add_argument('--connections', type=int, default=64,
+                        help='Client connections for open-loop steps')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per step')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='JSONL payload corpus')
+    parser.add_argument('--form-share', type=float, default=0.2,
+                        help='Fraction of requests sent to /submit_prediction')
+    parser.add_argument('--slo-ms', type=float, default=100, help='p99 latency objective')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--log-level', default='WARNING', help='LOG_LEVEL of the server')
+    parser.add_argument('--cache', action='store_true', help='Keep the prediction cache enabled')
+    parser.add_argument('--output', default='loadtest.json', help='JSON report')
+    parser.add_argument('--report', help='Markdown report')
+    args = parser.parse_args(argv)
+
+    requests = build_requests(load_corpus(args.corpus), args.form_share)
+    configs = []
+    for workers, threads in itertools.product(args.workers, args.threads):
+        print(f"{args.server}: {workers} workers x {threads} threads", flush=True)
+        configs.append(run_config(args, requests, workers, threads))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'server': args.server,
+            'corpus': os.path.relpath(args.corpus, ROOT),
+            'duration': args.duration,
+            'form_share': args.form_share,
+            'slo_ms': args.slo_ms,
+            'cpus': os.cpu_count(),
+        },
+        'configs': configs,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(render_markdown(report))
+    for config in configs:
+        point = config['saturation']
+        print(f"{config['workers']} workers x {config['threads']} threads: "
+              + (f"saturated at {point['step']} ({'; '.join(point['reasons'])})" if point else 'not saturated'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
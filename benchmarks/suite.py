@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Reproducible offline benchmark suite for the predictor and HTTP paths.
+
+Measures MentalHealthPredictor.predict single-row latency, predict_batch
+throughput at several batch sizes, and the /api/predict and
+/submit_prediction routes through Flask's test client, replaying payloads
+from a JSONL corpus (one survey record per line). No server is needed.
+
+Usage (from the repository root):
+    python benchmarks/suite.py run --output bench.json
+    python benchmarks/suite.py run --output bench.json --baseline benchmarks/baseline.json
+    python benchmarks/suite.py compare benchmarks/baseline.json bench.json --threshold 0.15
+
+``compare`` (and ``run --baseline``) exit with status 1 when any metric is
+worse than the baseline by more than the threshold.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT, 'benchmarks', 'payloads.jsonl')
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def load_corpus(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'mean': statistics.fmean(ordered)}
+
+
+def latency_metrics(prefix, samples_seconds):
+    return {f'{prefix}.{name}_us': {'value': round(value * 1e6, 2), 'better': 'lower'}
+            for name, value in percentiles(samples_seconds).items()}
+
+
+def time_each(fn, payloads, iterations):
+    samples = []
+    for payload in itertools.islice(itertools.cycle(payloads), iterations):
+        started = time.perf_counter()
+        fn(payload)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_predictor(predictor, corpus, iterations):
+    results = {}
+    for payload in corpus[:20]:
+        predictor.predict(payload)  # warm-up
+    results.update(latency_metrics('predict_single', time_each(predictor.predict, corpus, iterations)))
+
+    for size in BATCH_SIZES:
+        batch = list(itertools.islice(itertools.cycle(corpus), size))
+        rounds = max(3, min(200, 20000 // size))
+        best = min(timed(lambda: predictor.predict_batch(batch)) for _ in range(rounds))
+        results[f'predict_batch_{size}.rows_per_sec'] = {'value': round(size / best, 1), 'better': 'higher'}
+    return results
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def form_fields(payload):
+    return {('age' if key == 'Age' else key): value for key, value in payload.items()}
+
+
+def split_corpus(schema, corpus):
+    """Separate payloads that pass request validation from rejected ones"""
+    valid, rejected = [], []
+    for payload in corpus:
+        (rejected if schema.validate(payload)[1] else valid).append(payload)
+    return valid, rejected
+
+
+def bench_http(flask_app, schema, corpus, iterations):
+    client = flask_app.test_client()
+
+    def api(payload):
+        response = client.post('/api/predict', json=payload)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def form(payload):
+        response = client.post('/submit_prediction', data=form_fields(payload))
+        assert response.status_code == 200, response.status_code
+
+    def api_rejected(payload):
+        response = client.post('/api/predict', json=payload)
+        assert response.status_code == 422, response.get_data(as_text=True)
+
+    def form_rejected(payload):
+        response = client.post('/submit_prediction', data=form_fields(payload))
+        assert response.status_code == 302, response.status_code
+
+    # The corpus keeps the survey's out-of-range ages. They are timed
+    # separately so validation rejections do not blend into the scored
+    # path, and the form's redirect is checked once to be a validation
+    # message rather than its catch-all error.
+    valid, rejected = split_corpus(schema, corpus)
+    for payload in rejected:
+        form_rejected(payload)
+        with client.session_transaction() as session:
+            messages = [message for _, message in session.pop('_flashes', [])]
+        assert messages and all(message.split(':', 1)[0] in payload for message in messages), messages
+
+    routes = [('http_api_predict', api, valid), ('http_submit_prediction', form, valid)]
+    if rejected:
+        routes += [('http_api_predict_rejected', api_rejected, rejected),
+                   ('http_submit_prediction_rejected', form_rejected, rejected)]
+    results = {}
+    for name, fn, payloads in routes:
+        time_each(fn, payloads, 20)  # warm-up
+        results.update(latency_metrics(name, time_each(fn, payloads, iterations)))
+    return results
+
+
+def environment():
+    import numpy
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                  capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = None
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'revision': revision,
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'scoring_engine': os.environ.get('SCORING_ENGINE', 'auto'),
+        'model_path': os.environ.get('MODEL_PATH', 'mental_health_model.pkl'),
+    }
+
+
+def run(args):
+    # Replayed payloads repeat, so keep the prediction cache out of the numbers
+    if not args.cache:
+        os.environ['PREDICTION_CACHE_SIZE'] = '0'
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.WARNING)
+
+    from app import app as flask_app, registry, schema
+
+    corpus = load_corpus(args.corpus)
+    results = {}
+    results.update(bench_predictor(registry.predictor, corpus, args.iterations))
+    results.update(bench_http(flask_app, schema, corpus, args.http_iterations))
+
+    report = {'meta': environment(), 'results': results}
+    for name, metric in results.items():
+        print(f"{name:42s} {metric['value']:>14,.2f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            return report_regressions(json.load(f), report, args.threshold)
+    return 0
+
+
+def compare(baseline, current, threshold):
+    """Return (name, baseline, current, relative change, regressed) per shared metric"""
+    rows = []
+    for name, metric in sorted(current['results'].items()):
+        before = baseline['results'].get(name)
+        if not before or not before['value']:
+            continue
+        change = (metric['value'] - before['value']) / before['value']
+        worse = change > threshold if metric['better'] == 'lower' else change < -threshold
+        rows.append((name, before['value'], metric['value'], change, worse))
+    return rows
+
+
+def report_regressions(baseline, current, threshold):
+    rows = compare(baseline, current, threshold)
+    for name, before, after, change, worse in rows:
+        flag = 'REGRESSION' if worse else ''
+        print(f"{name:42s} {before:>12,.2f} -> {after:>12,.2f}  {change:+7.1%}  {flag}")
+    regressions = [row for row in rows if row[4]]
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline benchmark suite.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='JSONL payload corpus')
+    run_parser.add_argument('--iterations', type=int, default=2000, help='Single-row predictions')
+    run_parser.add_argument('--http-iterations', type=int, default=500, help='Requests per route')
+    run_parser.add_argument('--cache', action='store_true', help='Keep the prediction cache enabled')
+    run_parser.add_argument('--output', help='Write results as JSON')
+    run_parser.add_argument('--baseline', help='Compare against this stored result')
+    run_parser.add_argument('--threshold', type=float, default=0.15)
+
+    compare_parser = sub.add_parser('compare', help='Compare two stored results')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run(args)
+    with open(args.baseline) as f, open(args.current) as g:
+        return report_regressions(json.load(f), json.load(g), args.threshold)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from answer_normalizer import AnswerNormalizer, gender_normalizer
+
+# Single-field gender answer is expanded into these one-hot columns
+GENDER_FIELD = 'gender'
+GENDER_PREFIX = 'Gender_'
+
+class FeatureEncoder:
+    """
+    Compiled one-hot encoder for survey answers.
+    
+    The value-to-column lookup table is built once from the predictor's
+    categorical mappings and expected feature order, so encoding a record
+    is a handful of dict lookups writing straight into a NumPy row. Raw
+    answers go through one ``AnswerNormalizer`` per field first (the same
+    engine training uses), which also counts unrecognized answers.
+    """
+    
+    def __init__(self, categorical_mappings: Dict[str, Dict[str, int]],
+                 feature_names: Sequence[str], dtype=np.float32,
+                 normalizers: Optional[Dict[str, AnswerNormalizer]] = None):
+        """
+        Build the lookup tables.
+        
+        Args:
+            categorical_mappings (Dict): Field name to answer mapping, as
+                defined by ``MentalHealthPredictor``
+            feature_names (Sequence[str]): Model feature order
+            dtype: NumPy dtype of encoded rows
+            normalizers (Dict, optional): Answer normalizer per field; by default
+                gender uses the training replacements and every other field
+                its own vocabulary
+        """
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.dtype = dtype
+        self.age_index = self.feature_names.index('Age')
+        
+        # Raw pass-through gender columns (used when no 'gender' field is sent)
+        self.gender_columns = [
+            (name, index) for index, name in enumerate(self.feature_names)
+            if name.startswith(GENDER_PREFIX)
+        ]
+        
+        # field -> {answer: column index}; answers without a column encode to all zeros
+        self.field_tables: Dict[str, Dict[str, int]] = {
+            GENDER_FIELD: {
+                name[len(GENDER_PREFIX):]: index for name, index in self.gender_columns
+            }
+        }
+        for field in categorical_mappings:
+            prefix = f'{field}_'
+            self.field_tables[field] = {
+                name[len(prefix):]: index
+                for index, name in enumerate(self.feature_names)
+                if name.startswith(prefix)
+            }
+        
+        # Survey question each column came from, for grouping per-column
+        # values (e.g. logit contributions) back to questions
+        self.questions = ['Age'] + list(self.field_tables)
+        self.column_questions: List[Optional[int]] = [None] * self.n_features
+        self.column_questions[self.age_index] = 0
+        for question, table in enumerate(self.field_tables.values(), start=1):
+            for index in table.values():
+                self.column_questions[index] = question
+        self.question_matrix = np.zeros((self.n_features, len(self.questions)))
+        for index, question in enumerate(self.column_questions):
+            if question is not None:
+                self.question_matrix[index, question] = 1.0
+        
+        # Every single-answer change of a survey question, for what-if scoring:
+        # ``base * alternative_keep + alternative_set`` turns one encoded row
+        # into one row per (field, answer) in ``alternative_answers``. Answers
+        # that encode alike (synonyms such as "don't know" and "not sure", or
+        # reference answers that all encode to zeros) are one alternative,
+        # labelled by the first of them in the mapping.
+        self.alternative_answers: List[Tuple[str, str]] = []
+        self.alternative_columns: List[Optional[int]] = []
+        for field, answers in categorical_mappings.items():
+            columns = set()
+            for answer in answers:
+                column = self.field_tables[field].get(answer)
+                if column not in columns:
+                    columns.add(column)
+                    self.alternative_answers.append((field, answer))
+                    self.alternative_columns.append(column)
+        self.alternative_keep = np.ones((len(self.alternative_answers), self.n_features), dtype=dtype)
+        self.alternative_set = np.zeros_like(self.alternative_keep)
+        for row, ((field, _), column) in enumerate(zip(self.alternative_answers, self.alternative_columns)):
+            self.alternative_keep[row, list(self.field_tables[field].values())] = 0
+            if column is not None:
+                self.alternative_set[row, column] = 1
+        
+        self.normalizers = {GENDER_FIELD: gender_normalizer()}
+        for field, answers in categorical_mappings.items():
+            self.normalizers[field] = AnswerNormalizer(answers)
+        self.normalizers.update(normalizers or {})
+        self._field_items = [
+            (field, self.normalizers[field].normalize, table)
+            for field, table in self.field_tables.items()
+        ]
+    
+    def encode_into(self, input_data: Dict[str, Any], out: np.ndarray,
+                    canonical: bool = False) -> np.ndarray:
+        """
+        Encode one record into a preallocated row.
+        
+        Args:
+            input_data (Dict): Raw input data from form or API
+            out (np.ndarray): Row of length ``n_features`` to write into
+            canonical (bool): The answers are already normalized (e.g. by
+                ``RequestSchema``) and are looked up directly
+            
+        Returns:
+            np.ndarray: The ``out`` row
+        """
+        out[:] = 0
+        out[self.age_index] = float(input_data.get('Age', 30))
+        
+        if GENDER_FIELD not in input_data:
+            for name, index in self.gender_columns:
+                out[index] = float(input_data.get(name, 0))
+        
+        if canonical:
+            for field, _, table in self._field_items:
+                index = table.get(input_data.get(field))
+                if index is not None:
+                    out[index] = 1.0
+            return out
+        
+        for field, normalize, table in self._field_items:
+            if field in input_data:
+                index = table.get(normalize(input_data[field]))
+                if index is not None:
+                    out[index] = 1.0
+        return out
+    
+    def canonical_record(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Canonical form of a record: numeric Age plus the normalized answer of
+        every field present (None for answers that are not recognized).
+        """
+        record = {'Age': float(input_data.get('Age', 30))}
+        for field, normalize, _ in self._field_items:
+            if field in input_data:
+                record[field] = normalize(input_data[field])
+        return record
+    
+    def encode(self, input_data: Dict[str, Any], canonical: bool = False) -> np.ndarray:
+        """
+        Encode one record into a new ``(1, n_features)`` matrix.
+        
+        Args:
+            input_data (Dict): Raw input data from form or API
+            canonical (bool): The answers are already normalized
+            
+        Returns:
+            np.ndarray: Encoded row as a single-row matrix
+        """
+        matrix = np.empty((1, self.n_features), dtype=self.dtype)
+        self.encode_into(input_data, matrix[0], canonical)
+        return matrix
+    
+    def encode_alternatives(self, input_data: Dict[str, Any],
+                            canonical: bool = False) -> Tuple[np.ndarray, List[Tuple[str, str, Optional[str]]]]:
+        """
+        Encode a record followed by every single-field alternative of it.
+        
+        Alternatives that encode the same as the record's current answer
+        (including the reference answer of an unanswered question) are
+        left out, since they cannot change the prediction.
+        
+        Args:
+            input_data (Dict): Raw input data from form or API
+            canonical (bool): The answers are already normalized
+            
+        Returns:
+            Tuple[np.ndarray, List]: Matrix whose first row is the record and
+            each further row the record with one answer changed, and
+            ``(field, answer, current answer)`` for each of those rows
+        """
+        base = self.encode(input_data, canonical)
+        current = input_data if canonical else self.canonical_record(input_data)
+        rows = [
+            row for row, (field, _) in enumerate(self.alternative_answers)
+            if self.alternative_columns[row] != self.field_tables[field].get(current.get(field))
+        ]
+        matrix = np.empty((len(rows) + 1, self.n_features), dtype=self.dtype)
+        matrix[0] = base[0]
+        np.multiply(base, self.alternative_keep[rows], out=matrix[1:])
+        matrix[1:] += self.alternative_set[rows]
+        changes = [
+            (field, answer, current.get(field))
+            for field, answer in (self.alternative_answers[row] for row in rows)
+        ]
+        return matrix, changes
+    
+    def encode_batch(self, records: List[Any], errors: Optional[Dict[int, str]] = None,
+                     canonical: bool = False) -> np.ndarray:
+        """
+        Encode many records into one matrix.
+        
+        Records that cannot be encoded are skipped; when ``errors`` is given
+        their index and message are recorded there instead of raising.
+        
+        Args:
+            records (List): Raw input records
+            errors (Dict, optional): Collects ``{index: message}`` for bad records
+            canonical (bool): The answers are already normalized
+            
+        Returns:
+            np.ndarray: Matrix with one row per successfully encoded record
+        """
+        matrix = np.empty((len(records), self.n_features), dtype=self.dtype)
+        row = 0
+        for index, record in enumerate(records):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError("Record must be a JSON object")
+                self.encode_into(record, matrix[row], canonical)
+                row += 1
+            except (TypeError, ValueError) as e:
+                if errors is None:
+                    raise
+                errors[index] = str(e)
+        return matrix[:row]
+    
+    def encode_frame(self, frame: Any) -> np.ndarray:
+        """
+        Vectorized ``encode_batch`` for a pandas DataFrame of raw answers.
+        
+        Each field column is normalized once with ``normalize_series`` and
+        scattered into the matrix, instead of encoding row by row.
+        
+        Args:
+            frame (pd.DataFrame): One record per row, columns named like the
+                input fields
+            
+        Returns:
+            np.ndarray: Matrix with one row per record
+            
+        Raises:
+            ValueError: If an Age value is not numeric
+        """
+        matrix = np.zeros((len(frame), self.n_features), dtype=self.dtype)
+        rows = np.arange(len(frame))
+        if 'Age' in frame:
+            matrix[:, self.age_index] = frame['Age'].fillna(30).to_numpy(dtype=np.float64)
+        else:
+            matrix[:, self.age_index] = 30
+        
+        if GENDER_FIELD not in frame:
+            for name, index in self.gender_columns:
+                if name in frame:
+                    matrix[:, index] = frame[name].fillna(0).to_numpy(dtype=np.float64)
+        
+        for field, table in self.field_tables.items():
+            if field not in frame:
+                continue
+            column = frame[field]
+            present = column.notna().to_numpy()
+            canonical = self.normalizers[field].normalize_series(column[present])
+            indices = canonical.map(table).to_numpy(dtype=np.float64)
+            hit = ~np.isnan(indices)
+            matrix[rows[present][hit], indices[hit].astype(np.intp)] = 1.0
+        return matrix
+    
+    def normalization_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Lookup and unmapped-answer counters per field"""
+        return {field: normalizer.stats() for field, normalizer in self.normalizers.items()}
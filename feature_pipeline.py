@@ -0,0 +1,140 @@
+"""
+Cleaning and encoding stage for training data.
+
+``build_features`` turns the raw survey CSV into the encoded feature frame
+used for training (the former module-level work in ``preprocessing.py``)
+and caches the result on disk as ``.npz``, keyed by a hash of the CSV bytes
+and the encoding config, so repeated training runs skip the work.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from answer_normalizer import GENDER_REPLACEMENTS, GENDER_VALUES, AnswerNormalizer
+
+logger = logging.getLogger(__name__)
+
+# Bump when the encoding logic changes so stale caches are not reused
+PIPELINE_VERSION = 1
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    'drop_columns': ["Timestamp", "obs_consequence", "state", "comments", "Country",
+                     "no_employees", "anonymity", "leave"],
+    'gender_replacements': GENDER_REPLACEMENTS,
+    'one_hot_drop': 'first',
+    'age_min': 10,
+    'age_max': 100,
+    'scale_age': True,
+}
+
+def cache_key(csv_path: str, config: Dict[str, Any]) -> str:
+    """Hash of the CSV contents, the encoding config and the pipeline version"""
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+    digest.update(str(PIPELINE_VERSION).encode('utf-8'))
+    return digest.hexdigest()
+
+def encode_survey(df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Clean and encode the raw survey frame.
+    
+    Args:
+        df (pd.DataFrame): Raw survey data as read from the CSV
+        config (Dict, optional): Encoding config, defaults to ``DEFAULT_CONFIG``
+        
+    Returns:
+        pd.DataFrame: Encoded features plus the label-encoded ``treatment`` column
+    """
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+    
+    config = config or DEFAULT_CONFIG
+    df_copy = df.copy()
+    df_copy.drop(config['drop_columns'], axis=1, inplace=True)
+    df_copy.dropna(inplace=True)
+    
+    # Convert string into lower
+    for col in df_copy.select_dtypes(include='object').columns:
+        df_copy[col] = df_copy[col].astype(str).str.lower()
+    
+    # Map free-text variations through the same normalizer the server uses
+    gender = AnswerNormalizer(GENDER_VALUES, config['gender_replacements'])
+    df_copy['Gender'] = gender.normalize_series(df_copy['Gender'], keep_unmapped=True)
+    
+    gender_encoded = pd.get_dummies(df_copy['Gender'], prefix='Gender')
+    df_copy = pd.concat([df_copy.drop(columns=['Gender']), gender_encoded], axis=1)
+    le = LabelEncoder()
+    df_copy["treatment"] = le.fit_transform(df_copy["treatment"])
+    
+    # One Hot Encoding for categorical variables
+    categorical_cols = df_copy.select_dtypes(include="object").columns
+    ohe = OneHotEncoder(drop=config['one_hot_drop'], sparse_output=False)
+    ohe_encoded = pd.DataFrame(
+        ohe.fit_transform(df_copy[categorical_cols]),
+        columns=ohe.get_feature_names_out(categorical_cols),
+        index=df_copy.index
+    )
+    df_copy = pd.concat([df_copy.drop(columns=categorical_cols), ohe_encoded], axis=1)
+    
+    # Remove Outliers
+    df_copy = df_copy[(df_copy["Age"] > config['age_min']) & (df_copy["Age"] < config['age_max'])]
+    
+    if config['scale_age']:
+        scaler = StandardScaler()
+        df_copy["Age"] = scaler.fit_transform(df_copy[["Age"]])
+    
+    return df_copy
+
+def build_features(csv_path: str = 'mental_health.csv', config: Optional[Dict[str, Any]] = None,
+                   cache_dir: Optional[str] = '.feature_cache') -> pd.DataFrame:
+    """
+    Load the encoded training frame, computing it only on a cache miss.
+    
+    Args:
+        csv_path (str): Raw survey CSV
+        config (Dict, optional): Encoding config, defaults to ``DEFAULT_CONFIG``
+        cache_dir (str, optional): Cache directory; None disables caching
+        
+    Returns:
+        pd.DataFrame: Encoded features plus ``treatment``
+    """
+    config = config or DEFAULT_CONFIG
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f'features-{cache_key(csv_path, config)[:20]}.npz')
+        if os.path.exists(cache_path):
+            logger.info(f"Loaded encoded features from cache {cache_path}")
+            return _load_frame(cache_path)
+    
+    df_copy = encode_survey(pd.read_csv(csv_path), config)
+    
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_frame(df_copy, cache_path)
+        logger.info(f"Cached encoded features in {cache_path}")
+    return df_copy
+
+def _save_frame(df: pd.DataFrame, path: str):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f,
+            values=df.to_numpy(dtype=np.float64),
+            columns=np.array(df.columns, dtype=str),
+            dtypes=np.array([str(dtype) for dtype in df.dtypes]),
+            index=df.index.to_numpy()
+        )
+    os.replace(tmp_path, path)
+
+def _load_frame(path: str) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as data:
+        df = pd.DataFrame(data['values'], columns=data['columns'].tolist(), index=data['index'])
+        return df.astype(dict(zip(df.columns, data['dtypes'])))
@@ -0,0 +1,59 @@
+"""
+Background threads that survive forking.
+
+The app's background components (audit writer, micro-batcher, model
+watcher, log writer) start their thread lazily on first use. Under a
+preloaded gunicorn app the first use may happen in the master, and a
+forked worker inherits the thread object but not the thread, so each one
+must start its own again, exactly once, in every process. ``ForkSafeThread``
+holds that check in one place.
+"""
+
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+class ForkSafeThread:
+    """
+    A daemon thread started on demand, once per process.
+    """
+    
+    def __init__(self, target: Callable, name: str, setup: Optional[Callable[[], Tuple]] = None):
+        """
+        Args:
+            target (Callable): Thread body
+            name (str): Thread name
+            setup (Callable, optional): Called under the start lock before
+                each start (e.g. to create a fresh queue for this process);
+                returns the arguments passed to ``target``
+        """
+        self.target = target
+        self.name = name
+        self.setup = setup
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the thread was started in this process"""
+        return self.thread is not None and self.pid == os.getpid()
+    
+    def ensure(self) -> None:
+        """Start the thread unless this process already started it"""
+        if self.running:
+            return
+        with self._lock:
+            if self.running:
+                return
+            args = self.setup() if self.setup is not None else ()
+            self.thread = threading.Thread(target=self.target, args=args, name=self.name, daemon=True)
+            self.thread.start()
+            # Set last: other threads skip the lock only once setup is done
+            self.pid = os.getpid()
+    
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for a thread told to exit; the next ``ensure`` starts a new one"""
+        if self.running:
+            self.thread.join(timeout)
+            self.pid = None
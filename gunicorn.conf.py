@@ -0,0 +1,58 @@
+"""
+Gunicorn configuration for the Mental Health Prediction app.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+
+With ``preload_app`` the Flask app (and with it pandas, scikit-learn and the
+model) is imported once in the master process before the workers are
+forked, so workers start instantly and share those pages copy-on-write
+instead of each unpickling its own copy. Setting ``MODEL_MMAP_MODE=r``
+additionally loads the model arrays with ``joblib.load(..., mmap_mode='r')``,
+backing them by the model file itself so every worker maps the same
+read-only pages even across model reloads.
+
+When using mmap mode, replace model files atomically (write a new file and
+``mv`` it over the old one) rather than rewriting them in place.
+
+Environment variables:
+    PORT                 Port to bind (default 5000)
+    WEB_CONCURRENCY      Number of worker processes (default 2)
+    GUNICORN_THREADS     Threads per worker (default 1)
+    GUNICORN_PRELOAD     Load the app in the master before forking (default 1)
+    GUNICORN_TIMEOUT     Worker timeout in seconds (default 120)
+    MODEL_MMAP_MODE      joblib mmap_mode for the model ('r' to share arrays)
+    METRICS_DIR          Directory where workers publish metric snapshots for
+                         /api/metrics (default: a fresh temporary directory)
+    MODELS_DIR           Versioned model directory; each worker watches its
+                         CURRENT file and hot-swaps to new versions
+"""
+
+import glob
+import os
+import sys
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Map the model read-only by default when it is shared across forked workers
+if preload_app:
+    os.environ.setdefault('MODEL_MMAP_MODE', 'r')
+
+# Workers publish metric snapshots here so /api/metrics can sum all of them.
+# Snapshots from a previous server run are removed: counters restart at zero.
+if not os.environ.get('METRICS_DIR'):
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='mental-health-metrics-')
+os.makedirs(os.environ['METRICS_DIR'], exist_ok=True)
+for stale in glob.glob(os.path.join(os.environ['METRICS_DIR'], 'metrics-*.json')):
+    os.remove(stale)
+
+def post_worker_init(worker):
+    """Start the model watcher as soon as the worker is up, not on its first request"""
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        app_module.registry.ensure_watcher()
@@ -0,0 +1,181 @@
+import numpy as np
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+class LinearScorer:
+    """
+    Native scoring engine for linear scikit-learn models.
+    
+    At load time the preprocessing steps (``StandardScaler``, possibly inside
+    a ``ColumnTransformer``) are folded together with the classifier's
+    ``coef_``/``intercept_`` into one weight vector over the encoded feature
+    row. Scoring is then a single dot product and a sigmoid, with no sklearn
+    validation overhead.
+    """
+    
+    def __init__(self, weights: np.ndarray, intercept: float, classes: Sequence[Any]):
+        """
+        Args:
+            weights (np.ndarray): Folded weights, one per encoded feature
+            intercept (float): Folded intercept
+            classes (Sequence): The two class labels, negative class first
+        """
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+    
+    @classmethod
+    def from_model(cls, model: Any, feature_names: Sequence[str]) -> Optional['LinearScorer']:
+        """
+        Fold a fitted model into a ``LinearScorer``.
+        
+        Supported models are a binary ``LogisticRegression`` (or
+        ``SGDClassifier`` with logistic loss), either bare or
+        as the final step of a ``Pipeline`` whose earlier steps are
+        ``StandardScaler`` or ``ColumnTransformer`` objects built from
+        scalers, ``'passthrough'`` and ``'drop'``.
+        
+        Args:
+            model: Fitted model as loaded from disk
+            feature_names (Sequence[str]): Column order of encoded rows
+            
+        Returns:
+            Optional[LinearScorer]: The scorer, or None if the model type is
+            not supported and the sklearn path must be used instead
+        """
+        try:
+            return cls._fold(model, list(feature_names))
+        except _Unsupported as e:
+            logger.info(f"Native scoring not available, using sklearn: {e}")
+            return None
+    
+    @classmethod
+    def _fold(cls, model: Any, feature_names: List[str]) -> 'LinearScorer':
+        steps = [step for _, step in model.steps] if hasattr(model, 'steps') else [model]
+        classifier, transforms = steps[-1], steps[:-1]
+        
+        name = type(classifier).__name__
+        if name == 'SGDClassifier' and classifier.loss in ('log_loss', 'log'):
+            pass  # logistic loss: predict_proba is sigmoid(decision_function)
+        elif name != 'LogisticRegression':
+            raise _Unsupported(f"classifier {name}")
+        if len(classifier.classes_) != 2:
+            raise _Unsupported("only binary classifiers are supported")
+        
+        # Affine map from the model's input columns: features = M @ x + c
+        input_names = getattr(steps[0], 'feature_names_in_', None)
+        n_inputs = len(input_names) if input_names is not None else len(feature_names)
+        matrix, offset = np.eye(n_inputs), np.zeros(n_inputs)
+        
+        for step in transforms:
+            step_matrix, step_offset = _affine(step, matrix.shape[0])
+            matrix, offset = step_matrix @ matrix, step_matrix @ offset + step_offset
+        
+        coef = np.asarray(classifier.coef_, dtype=np.float64).ravel()
+        if coef.shape[0] != matrix.shape[0]:
+            raise _Unsupported("coefficient count does not match transformed features")
+        
+        weights = coef @ matrix
+        intercept = float(coef @ offset + classifier.intercept_[0])
+        
+        # Binary multinomial LR is a softmax over (-z, z), i.e. sigmoid(2z)
+        if getattr(classifier, 'multi_class', 'auto') == 'multinomial':
+            weights, intercept = 2 * weights, 2 * intercept
+        
+        # Reorder the weights into the encoder's column order
+        if input_names is not None:
+            position = {name: index for index, name in enumerate(input_names)}
+            missing = [name for name in input_names if name not in feature_names]
+            if missing:
+                raise _Unsupported(f"model expects unknown features {missing}")
+            aligned = np.zeros(len(feature_names))
+            for index, name in enumerate(feature_names):
+                if name in position:
+                    aligned[index] = weights[position[name]]
+            weights = aligned
+        elif n_inputs != len(feature_names):
+            raise _Unsupported("model feature count does not match encoder")
+        
+        return cls(weights, intercept, classifier.classes_)
+    
+    def decision_function(self, matrix: np.ndarray) -> np.ndarray:
+        """Logit for each row of an encoded feature matrix"""
+        return matrix @ self.weights + self.intercept
+    
+    def contributions(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Additive logit contribution of every feature of every row.
+        
+        For a linear model this is exact: each row's contributions plus the
+        intercept sum to its ``decision_function`` value.
+        """
+        return matrix * self.weights
+    
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        """Probability of the positive class for each row"""
+        with np.errstate(over='ignore'):
+            return 1.0 / (1.0 + np.exp(-self.decision_function(matrix)))
+    
+    def predict_with_confidence(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score an encoded feature matrix.
+        
+        Args:
+            matrix (np.ndarray): Encoded rows
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Predicted class labels and the
+            probability of the predicted class for each row
+        """
+        positive = self.predict_proba(matrix)
+        is_positive = positive > 0.5
+        predictions = np.where(is_positive, self.classes[1], self.classes[0])
+        confidences = np.where(is_positive, positive, 1.0 - positive)
+        return predictions, confidences
+
+class _Unsupported(Exception):
+    """Raised while folding a model the native engine cannot represent"""
+
+def _affine(step: Any, n_inputs: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (M, c) such that ``step.transform(x) == M @ x + c``"""
+    name = type(step).__name__
+    
+    if name == 'StandardScaler':
+        # mean_ is fitted even when with_mean=False, so check the flags too
+        mean = step.mean_ if step.with_mean else np.zeros(n_inputs)
+        scale = step.scale_ if step.with_std else np.ones(n_inputs)
+        return np.diag(1.0 / scale), -mean / scale
+    
+    if name == 'ColumnTransformer':
+        rows, offsets = [], []
+        input_names = list(getattr(step, 'feature_names_in_', []))
+        for _, transformer, columns in step.transformers_:
+            indices = _column_indices(columns, input_names, n_inputs)
+            if transformer == 'drop' or len(indices) == 0:
+                continue
+            selector = np.eye(n_inputs)[indices]
+            if transformer == 'passthrough':
+                rows.append(selector)
+                offsets.append(np.zeros(len(indices)))
+            else:
+                sub_matrix, sub_offset = _affine(transformer, len(indices))
+                rows.append(sub_matrix @ selector)
+                offsets.append(sub_offset)
+        if not rows:
+            raise _Unsupported("ColumnTransformer selects no columns")
+        return np.vstack(rows), np.concatenate(offsets)
+    
+    raise _Unsupported(f"preprocessing step {name}")
+
+def _column_indices(columns: Any, input_names: List[str], n_inputs: int) -> List[int]:
+    """Resolve a ColumnTransformer column selection to integer indices"""
+    if isinstance(columns, slice):
+        return list(range(n_inputs))[columns]
+    columns = list(np.atleast_1d(columns)) if not isinstance(columns, list) else columns
+    if columns and isinstance(columns[0], (bool, np.bool_)):
+        return [index for index, keep in enumerate(columns) if keep]
+    if columns and isinstance(columns[0], str):
+        return [input_names.index(column) for column in columns]
+    return [int(column) for column in columns]
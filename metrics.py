@@ -0,0 +1,204 @@
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+METRIC_HELP = {
+    'mh_requests_total': ('counter', 'HTTP requests served, by endpoint and status code'),
+    'mh_request_errors_total': ('counter', 'Requests that failed with an exception or error status'),
+    'mh_request_duration_seconds': ('histogram', 'End-to-end request latency by endpoint'),
+    'mh_stage_duration_seconds': ('histogram', 'Latency of request processing stages'),
+}
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Metrics:
+    """
+    Process-local counters and latency histograms with cross-process aggregation.
+    
+    When ``directory`` is set, every process periodically writes its own
+    snapshot to ``<directory>/metrics-<pid>.json`` and ``render`` sums the
+    snapshots of all processes, so any gunicorn worker can answer a scrape
+    for the whole server. Files of exited workers are kept so that counters
+    stay monotonic. Snapshot I/O never raises into the caller: a failed
+    write is logged and retried on the next flush.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0,
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            directory (str, optional): Shared directory for per-process snapshots
+            flush_interval (float): Minimum seconds between snapshot writes
+            buckets (Tuple[float, ...]): Histogram bucket upper bounds in seconds
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # Serializes snapshot writes of this process's threads
+        self._flush_lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        self._pid = os.getpid()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], List[float]] = {}
+        self._next_flush = 0.0
+    
+    def _check_fork(self):
+        # A forked worker must not report the parent's numbers as its own
+        if self._pid != os.getpid():
+            self._reset()
+    
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, amount: float = 1) -> None:
+        """Increment a counter"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            self._counters[key] = self._counters.get(key, 0) + amount
+        self._maybe_flush()
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Record one observation in a histogram"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            # Per-bucket (non-cumulative) counts, then sum and count
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 3)
+            index = 0
+            while index < len(self.buckets) and value > self.buckets[index]:
+                index += 1
+            histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+        self._maybe_flush()
+    
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time a block of code as a request processing stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - started)
+    
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Record the duration of a stage (also used as the predictor's stage observer)"""
+        self.observe('mh_stage_duration_seconds', seconds, {'stage': stage})
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable copy of this process's metrics"""
+        with self._lock:
+            self._check_fork()
+            return {
+                'buckets': list(self.buckets),
+                'counters': [[name, dict(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, dict(labels), list(values)]
+                               for (name, labels), values in self._histograms.items()]
+            }
+    
+    def _maybe_flush(self):
+        if self.directory is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_flush:
+                return
+            self._next_flush = now + self.flush_interval
+        self.flush()
+    
+    def flush(self) -> None:
+        """Write this process's snapshot to the shared directory (errors are only logged)"""
+        directory = self.directory
+        if directory is None:
+            return
+        path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+        with self._flush_lock:
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=f'.metrics-{os.getpid()}-', suffix='.tmp', dir=directory)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(tmp_path, path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not write metrics snapshot {path}: {e}")
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
+    def collect(self) -> List[Dict[str, Any]]:
+        """Snapshots of all processes (just this one without a directory)"""
+        if self.directory is None:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+    
+    def render(self) -> str:
+        """Aggregated metrics in the Prometheus text exposition format"""
+        counters: Dict[Tuple[str, LabelKey], float] = {}
+        histograms: Dict[Tuple[str, LabelKey], List[float]] = {}
+        for snapshot in self.collect():
+            if tuple(snapshot['buckets']) != self.buckets:
+                continue
+            for name, labels, value in snapshot['counters']:
+                key = (name, _label_key(labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, values in snapshot['histograms']:
+                key = (name, _label_key(labels))
+                merged = histograms.setdefault(key, [0] * len(values))
+                for index, value in enumerate(values):
+                    merged[index] += value
+        
+        lines = []
+        for name in sorted({name for name, _ in counters} | {name for name, _ in histograms}):
+            metric_type, help_text = METRIC_HELP.get(
+                name, ('histogram' if any(n == name for n, _ in histograms) else 'counter', name))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), values):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {_format_value(cumulative)}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {values[-2]!r}')
+                lines.append(f'{name}_count{_format_labels(labels)} {_format_value(values[-1])}')
+        return '\n'.join(lines) + '\n'
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ''
+    escaped = ','.join('{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                       for k, v in labels)
+    return '{' + escaped + '}'
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Precompiled model artifacts for the fast-startup serving mode.
+
+A fitted linear pipeline is folded once (see ``LinearScorer``) and written
+as a small JSON file holding the feature order, folded weights (raw
+little-endian float64, base64 encoded), intercept, class labels and the
+answer vocabularies the encoder was built from. Loading it needs only the
+standard library and NumPy, so a server using it never imports pandas,
+joblib or scikit-learn, and nothing is unpickled.
+
+Every artifact carries a schema version and a SHA-256 checksum of its
+contents. Artifacts from an older schema, with a bad checksum, or exported
+for a different feature layout or vocabulary are rejected on load.
+
+Usage:
+    python model_artifact.py mental_health_model.pkl mental_health_model.json
+"""
+
+import base64
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from linear_scorer import LinearScorer
+
+ARTIFACT_FORMAT = 'mental-health-linear'
+ARTIFACT_SCHEMA_VERSION = 2
+ARTIFACT_EXTENSIONS = ('.json',)
+WEIGHTS_DTYPE = '<f8'
+
+def is_artifact(path: str) -> bool:
+    """True if ``path`` names a precompiled artifact rather than a pickle"""
+    return path.lower().endswith(ARTIFACT_EXTENSIONS)
+
+def _checksum(artifact: Mapping[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of every field except the checksum"""
+    body = {key: value for key, value in artifact.items() if key != 'checksum'}
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'))
+    return 'sha256:' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def export_artifact(model: Any, feature_names: Sequence[str], path: str,
+                    vocabularies: Optional[Mapping[str, Mapping[str, int]]] = None) -> Dict[str, Any]:
+    """
+    Fold a fitted model and write it as an artifact.
+    
+    Args:
+        model: Fitted sklearn model supported by ``LinearScorer``
+        feature_names (Sequence[str]): Encoded feature order
+        path (str): Output file
+        vocabularies (Mapping, optional): Answer vocabulary per survey
+            question; defaults to the predictor's ``CATEGORICAL_MAPPINGS``
+        
+    Returns:
+        Dict[str, Any]: The artifact contents
+        
+    Raises:
+        ValueError: If the model cannot be folded into a linear scorer
+    """
+    scorer = LinearScorer.from_model(model, feature_names)
+    if scorer is None:
+        raise ValueError(f"{type(model).__name__} cannot be exported as a linear artifact")
+    
+    if vocabularies is None:
+        from model_predictor import CATEGORICAL_MAPPINGS as vocabularies
+    
+    weights = np.asarray(scorer.weights, dtype=WEIGHTS_DTYPE)
+    artifact = {
+        'format': ARTIFACT_FORMAT,
+        'schema_version': ARTIFACT_SCHEMA_VERSION,
+        'features': list(feature_names),
+        'weights_dtype': WEIGHTS_DTYPE,
+        'weights': base64.b64encode(weights.tobytes()).decode('ascii'),
+        'intercept': float(scorer.intercept),
+        'classes': [int(label) for label in scorer.classes],
+        'vocabularies': {field: dict(answers) for field, answers in vocabularies.items()}
+    }
+    artifact['checksum'] = _checksum(artifact)
+    with open(path, 'w') as f:
+        json.dump(artifact, f, indent=1)
+    return artifact
+
+def load_artifact(path: str, feature_names: Sequence[str],
+                  vocabularies: Optional[Mapping[str, Mapping[str, int]]] = None) -> LinearScorer:
+    """
+    Load an artifact into a ``LinearScorer``.
+    
+    Args:
+        path (str): Artifact file
+        feature_names (Sequence[str]): Feature order the encoder produces
+        vocabularies (Mapping, optional): Answer vocabularies the encoder
+            uses; when given, the artifact must have been exported with them
+        
+    Raises:
+        ValueError: If the file is not an artifact, is from another schema
+            version, fails its checksum, or its features or vocabularies differ
+    """
+    with open(path) as f:
+        artifact = json.load(f)
+    if artifact.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a {ARTIFACT_FORMAT} artifact")
+    if artifact.get('schema_version') != ARTIFACT_SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema version {artifact.get('schema_version')}, "
+                         f"expected {ARTIFACT_SCHEMA_VERSION}; re-export it")
+    if artifact.get('checksum') != _checksum(artifact):
+        raise ValueError(f"{path} failed its checksum")
+    if artifact['features'] != list(feature_names):
+        raise ValueError(f"{path} was exported for a different feature layout")
+    if vocabularies is not None and artifact['vocabularies'] != vocabularies:
+        raise ValueError(f"{path} was exported for different answer vocabularies")
+    
+    weights = np.frombuffer(base64.b64decode(artifact['weights']), dtype=artifact['weights_dtype'])
+    return LinearScorer(weights, artifact['intercept'], artifact['classes'])
+
+def main(argv: Sequence[str]) -> int:
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1].strip(), file=sys.stderr)
+        return 2
+    
+    import joblib
+    from model_predictor import EXPECTED_FEATURES
+    
+    export_artifact(joblib.load(argv[0]), EXPECTED_FEATURES, argv[1])
+    print(f"Wrote {argv[1]}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
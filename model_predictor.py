@@ -1,90 +1,236 @@
-import joblib
-import pandas as pd
 import numpy as np
 import logging
+import os
+import threading
+import time
 import warnings
-from typing import Dict, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any, TYPE_CHECKING
+from feature_encoder import FeatureEncoder
+from linear_scorer import LinearScorer
+from prediction_cache import PredictionCache
+from model_artifact import is_artifact, load_artifact
+
+# pandas and joblib (which pulls in sklearn when unpickling) are imported
+# lazily so that serving a precompiled artifact never loads them
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Suppress sklearn version warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='sklearn')
 
 logger = logging.getLogger(__name__)
 
+# Supported values for MentalHealthPredictor(engine=...)
+SCORING_ENGINES = ('auto', 'native', 'sklearn')
+
+# Expected feature list (order matters for the model)
+EXPECTED_FEATURES = [
+    'Age', 'Gender_female', 'Gender_male', 'Gender_other',
+    'self_employed_yes', 'family_history_yes', 'work_interfere_often',
+    'work_interfere_rarely', 'work_interfere_sometimes', 'remote_work_yes',
+    'tech_company_yes', 'benefits_no', 'benefits_yes', 'care_options_not sure',
+    'care_options_yes', 'wellness_program_no', 'wellness_program_yes',
+    'seek_help_no', 'seek_help_yes', 'mental_health_consequence_no',
+    'mental_health_consequence_yes', 'phys_health_consequence_no',
+    'phys_health_consequence_yes', 'coworkers_some of them', 'coworkers_yes',
+    'supervisor_some of them', 'supervisor_yes', 'mental_health_interview_no',
+    'mental_health_interview_yes', 'phys_health_interview_no',
+    'phys_health_interview_yes', 'mental_vs_physical_no', 'mental_vs_physical_yes'
+]
+
+# Answer vocabularies per survey question (these should match the features
+# used during training)
+CATEGORICAL_MAPPINGS = {
+    'self_employed': {'no': 0, 'yes': 1},
+    'family_history': {'no': 0, 'yes': 1},
+    'work_interfere': {
+        'never': 0, 'rarely': 1, 'sometimes': 2, 'often': 3
+    },
+    'remote_work': {'no': 0, 'yes': 1},
+    'tech_company': {'no': 0, 'yes': 1},
+    'benefits': {
+        'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
+    },
+    'care_options': {
+        'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
+    },
+    'wellness_program': {
+        'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
+    },
+    'seek_help': {
+        'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
+    },
+    'mental_health_consequence': {
+        'no': 0, 'maybe': 1, 'yes': 2
+    },
+    'phys_health_consequence': {
+        'no': 0, 'maybe': 1, 'yes': 2
+    },
+    'coworkers': {
+        'no': 0, 'some of them': 1, 'yes': 2
+    },
+    'supervisor': {
+        'no': 0, 'some of them': 1, 'yes': 2
+    },
+    'mental_health_interview': {
+        'no': 0, 'maybe': 1, 'yes': 2
+    },
+    'phys_health_interview': {
+        'no': 0, 'maybe': 1, 'yes': 2
+    },
+    'mental_vs_physical': {
+        'no': 0, "don't know": 1, 'yes': 2
+    }
+}
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """Modification time and size, used to detect a replaced model file"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
 class MentalHealthPredictor:
     """
     A wrapper class for the mental health prediction model that handles
     data preprocessing and predictions.
     """
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, engine: str = 'auto', cache_size: int = 0,
+                 cache_age_bucket: int = 0, model_check_interval: float = 5.0,
+                 mmap_mode: Optional[str] = None):
         """
         Initialize the predictor with a trained model.
         
         Args:
             model_path (str): Path to the saved model file
+            engine (str): Scoring engine: 'native' folds linear models into a
+                single weight vector, 'sklearn' always calls the model, and
+                'auto' uses native when the model supports it
+            cache_size (int): Size of the LRU prediction cache; 0 disables it
+            cache_age_bucket (int): Age bucket width used in cache keys; 0 keeps exact ages
+            model_check_interval (float): Seconds between checks of the model
+                file for changes while the cache is enabled
+            mmap_mode (str, optional): Passed to ``joblib.load``; 'r' maps the
+                model arrays read-only so forked workers share the same pages
         """
+        if engine not in SCORING_ENGINES:
+            raise ValueError(f"Unknown scoring engine '{engine}', expected one of {SCORING_ENGINES}")
         self.model_path = model_path
-        self.model = None
+        self.engine = engine
+        # (model, scorer, folded linear form, generation) of one model version,
+        # replaced by a single assignment on reload. Scoring calls read it
+        # once so they never mix the old and new model.
+        self.loaded: Tuple[Any, Optional[LinearScorer], Optional[LinearScorer], int] = (None, None, None, 0)
+        self.artifact_scorer = None
         self.feature_names = None
-        self._load_model()
+        self.model_check_interval = model_check_interval
+        self.mmap_mode = mmap_mode
+        # Optional callback(stage, seconds) for per-stage latency metrics
+        self.stage_observer: Optional[Callable[[str, float], None]] = None
+        self._model_signature = None
+        self._next_model_check = 0.0
+        self._reload_lock = threading.Lock()
         self._setup_feature_mapping()
+        self._swap_model(self._load_model())
+        
+        self.cache = None
+        if cache_size > 0:
+            cache_fields = list(self.encoder.field_tables) + [name for name, _ in self.encoder.gender_columns]
+            self.cache = PredictionCache(cache_fields, cache_size, cache_age_bucket)
+    
+    @property
+    def model(self) -> Any:
+        return self.loaded[0]
     
-    def _load_model(self):
-        """Load the trained model from file"""
+    @property
+    def scorer(self) -> Optional[LinearScorer]:
+        return self.loaded[1]
+    
+    def _load_model(self) -> Tuple[Tuple[int, int], Any, Optional[LinearScorer]]:
+        """
+        Load the trained model (pickle or precompiled artifact) from file.
+        
+        Returns:
+            Tuple: The file signature taken before reading it, the model
+            (None for an artifact) and the artifact's scorer (None for a pickle)
+        """
         try:
-            self.model = joblib.load(self.model_path)
-            logger.info(f"Model loaded successfully from {self.model_path}")
+            signature = _file_signature(self.model_path)
+            if is_artifact(self.model_path):
+                artifact_scorer = load_artifact(self.model_path, EXPECTED_FEATURES, CATEGORICAL_MAPPINGS)
+                logger.info(f"Model artifact loaded successfully from {self.model_path}")
+                return signature, None, artifact_scorer
+            
+            import joblib
+            model = joblib.load(self.model_path, mmap_mode=self.mmap_mode)
+            logger.info(f"Model loaded successfully from {self.model_path}"
+                        f"{' (memory-mapped)' if self.mmap_mode else ''}")
+            return signature, model, None
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def _swap_model(self, loaded_model: Tuple[Tuple[int, int], Any, Optional[LinearScorer]]) -> None:
+        """Build the scorer for a freshly loaded model and make it the one served"""
+        signature, model, artifact_scorer = loaded_model
+        scorer, folded = self._build_scorer(model, artifact_scorer)
+        self.loaded = (model, scorer, folded, self.loaded[3] + 1)
+        self.artifact_scorer = artifact_scorer
+        self._model_signature = signature
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the model and clear the prediction cache if the model file changed.
+        
+        The new model and scorer are built before being swapped in, so
+        concurrent predictions keep using the old version until then.
+        Cache keys include the model generation, so a prediction of the old
+        model stored after the swap is never served.
+        
+        Returns:
+            bool: True if the model was reloaded
+        """
+        if _file_signature(self.model_path) == self._model_signature:
+            return False
+        with self._reload_lock:
+            # Another thread may have reloaded while this one waited
+            if _file_signature(self.model_path) == self._model_signature:
+                return False
+            logger.info(f"Model file {self.model_path} changed, reloading")
+            self._swap_model(self._load_model())
+            if self.cache is not None:
+                self.cache.clear()
+        return True
+    
     def _setup_feature_mapping(self):
         """Setup feature names and mapping for the model"""
-        # These should match the features used during training
-        self.categorical_mappings = {
-            'self_employed': {'no': 0, 'yes': 1},
-            'family_history': {'no': 0, 'yes': 1},
-            'work_interfere': {
-                'never': 0, 'rarely': 1, 'sometimes': 2, 'often': 3
-            },
-            'remote_work': {'no': 0, 'yes': 1},
-            'tech_company': {'no': 0, 'yes': 1},
-            'benefits': {
-                'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
-            },
-            'care_options': {
-                'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
-            },
-            'wellness_program': {
-                'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
-            },
-            'seek_help': {
-                'no': 0, 'yes': 1, "don't know": 2, 'not sure': 2
-            },
-            'mental_health_consequence': {
-                'no': 0, 'maybe': 1, 'yes': 2
-            },
-            'phys_health_consequence': {
-                'no': 0, 'maybe': 1, 'yes': 2
-            },
-            'coworkers': {
-                'no': 0, 'some of them': 1, 'yes': 2
-            },
-            'supervisor': {
-                'no': 0, 'some of them': 1, 'yes': 2
-            },
-            'mental_health_interview': {
-                'no': 0, 'maybe': 1, 'yes': 2
-            },
-            'phys_health_interview': {
-                'no': 0, 'maybe': 1, 'yes': 2
-            },
-            'mental_vs_physical': {
-                'no': 0, "don't know": 1, 'yes': 2
-            }
-        }
+        self.categorical_mappings = CATEGORICAL_MAPPINGS
+        
+        # Compiled encoder used on the request path
+        self.encoder = FeatureEncoder(self.categorical_mappings, EXPECTED_FEATURES)
     
-    def _preprocess_input(self, input_data: Dict[str, Any]) -> pd.DataFrame:
+    def _build_scorer(self, model: Any, artifact_scorer: Optional[LinearScorer]
+                      ) -> Tuple[Optional[LinearScorer], Optional[LinearScorer]]:
+        """
+        Fold the model into a native scorer unless the sklearn engine is forced.
+        
+        Returns:
+            Tuple: The scorer used for predictions (None to call the model)
+            and the folded linear form used for explanations (None if the
+            model is not linear)
+        """
+        if artifact_scorer is not None:
+            if self.engine == 'sklearn':
+                raise ValueError("Model artifacts can only be scored by the native engine")
+            return artifact_scorer, artifact_scorer
+        folded = LinearScorer.from_model(model, EXPECTED_FEATURES)
+        if self.engine == 'sklearn':
+            return None, folded
+        if folded is None and self.engine == 'native':
+            raise ValueError(f"Model in {self.model_path} is not supported by the native engine")
+        logger.info(f"Scoring engine: {'native' if folded is not None else 'sklearn'}")
+        return folded, folded
+    
+    def _preprocess_input(self, input_data: Dict[str, Any]) -> 'pd.DataFrame':
         """
         Preprocess input data to match training format.
         
@@ -94,249 +240,323 @@ class MentalHealthPredictor:
         Returns:
             pd.DataFrame: Preprocessed data ready for prediction
         """
+        import pandas as pd
+        
         try:
-            # Create a copy of input data and extract Age
-            age = input_data.get('Age', 30)  # Default to 30 if missing
-            gender_female = input_data.get('Gender_female', 0)
-            gender_male = input_data.get('Gender_male', 0)
-            gender_other = input_data.get('Gender_other', 0)
+            df = pd.DataFrame(self.encoder.encode(input_data), columns=EXPECTED_FEATURES)
             
-            # Handle gender if it's a single field
-            if 'gender' in input_data:
-                gender_value = str(input_data['gender']).lower().strip()
-                gender_female = 1 if gender_value == 'female' else 0
-                gender_male = 1 if gender_value == 'male' else 0
-                gender_other = 1 if gender_value == 'other' else 0
-            
-            # One-hot encode all categorical features
-            processed_data = {
-                'Age': age,
-                'Gender_female': gender_female,
-                'Gender_male': gender_male,
-                'Gender_other': gender_other,
-            }
-            
-            # Binary one-hot encodings (features with Yes/No values)
-            binary_features = {
-                'self_employed': 'self_employed_yes',
-                'family_history': 'family_history_yes',
-                'remote_work': 'remote_work_yes',
-                'tech_company': 'tech_company_yes'
-            }
-            
-            for original_name, encoded_name in binary_features.items():
-                if original_name in input_data:
-                    value = str(input_data[original_name]).lower().strip()
-                    processed_data[encoded_name] = 1.0 if value == 'yes' else 0.0
-                else:
-                    processed_data[encoded_name] = 0.0
-            
-            # Handle work_interfere (never, rarely, sometimes, often)
-            work_interfere_values = ['often', 'rarely', 'sometimes']
-            if 'work_interfere' in input_data:
-                value = str(input_data['work_interfere']).lower().strip()
-                for option in work_interfere_values:
-                    processed_data[f'work_interfere_{option}'] = 1.0 if value == option else 0.0
-            else:
-                for option in work_interfere_values:
-                    processed_data[f'work_interfere_{option}'] = 0.0
-            
-            # Handle benefits (no, yes, don't know)
-            if 'benefits' in input_data:
-                value = str(input_data['benefits']).lower().strip()
-                processed_data['benefits_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['benefits_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['benefits_no'] = 0.0
-                processed_data['benefits_yes'] = 0.0
-            
-            # Handle care_options (no, yes, not sure)
-            if 'care_options' in input_data:
-                value = str(input_data['care_options']).lower().strip()
-                processed_data['care_options_not sure'] = 1.0 if value == 'not sure' else 0.0
-                processed_data['care_options_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['care_options_not sure'] = 0.0
-                processed_data['care_options_yes'] = 0.0
-            
-            # Handle wellness_program (no, yes)
-            if 'wellness_program' in input_data:
-                value = str(input_data['wellness_program']).lower().strip()
-                processed_data['wellness_program_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['wellness_program_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['wellness_program_no'] = 0.0
-                processed_data['wellness_program_yes'] = 0.0
-            
-            # Handle seek_help (no, yes)
-            if 'seek_help' in input_data:
-                value = str(input_data['seek_help']).lower().strip()
-                processed_data['seek_help_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['seek_help_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['seek_help_no'] = 0.0
-                processed_data['seek_help_yes'] = 0.0
-            
-            # Handle mental_health_consequence (no, yes)
-            if 'mental_health_consequence' in input_data:
-                value = str(input_data['mental_health_consequence']).lower().strip()
-                processed_data['mental_health_consequence_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['mental_health_consequence_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['mental_health_consequence_no'] = 0.0
-                processed_data['mental_health_consequence_yes'] = 0.0
-            
-            # Handle phys_health_consequence (no, yes)
-            if 'phys_health_consequence' in input_data:
-                value = str(input_data['phys_health_consequence']).lower().strip()
-                processed_data['phys_health_consequence_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['phys_health_consequence_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['phys_health_consequence_no'] = 0.0
-                processed_data['phys_health_consequence_yes'] = 0.0
-            
-            # Handle coworkers (no, some of them, yes)
-            if 'coworkers' in input_data:
-                value = str(input_data['coworkers']).lower().strip()
-                processed_data['coworkers_some of them'] = 1.0 if value == 'some of them' else 0.0
-                processed_data['coworkers_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['coworkers_some of them'] = 0.0
-                processed_data['coworkers_yes'] = 0.0
-            
-            # Handle supervisor (no, some of them, yes)
-            if 'supervisor' in input_data:
-                value = str(input_data['supervisor']).lower().strip()
-                processed_data['supervisor_some of them'] = 1.0 if value == 'some of them' else 0.0
-                processed_data['supervisor_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['supervisor_some of them'] = 0.0
-                processed_data['supervisor_yes'] = 0.0
-            
-            # Handle mental_health_interview (no, yes)
-            if 'mental_health_interview' in input_data:
-                value = str(input_data['mental_health_interview']).lower().strip()
-                processed_data['mental_health_interview_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['mental_health_interview_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['mental_health_interview_no'] = 0.0
-                processed_data['mental_health_interview_yes'] = 0.0
-            
-            # Handle phys_health_interview (no, yes)
-            if 'phys_health_interview' in input_data:
-                value = str(input_data['phys_health_interview']).lower().strip()
-                processed_data['phys_health_interview_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['phys_health_interview_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['phys_health_interview_no'] = 0.0
-                processed_data['phys_health_interview_yes'] = 0.0
-            
-            # Handle mental_vs_physical (no, yes)
-            if 'mental_vs_physical' in input_data:
-                value = str(input_data['mental_vs_physical']).lower().strip()
-                processed_data['mental_vs_physical_no'] = 1.0 if value == 'no' else 0.0
-                processed_data['mental_vs_physical_yes'] = 1.0 if value == 'yes' else 0.0
-            else:
-                processed_data['mental_vs_physical_no'] = 0.0
-                processed_data['mental_vs_physical_yes'] = 0.0
-            
-            # Create DataFrame
-            df = pd.DataFrame([processed_data])
-            
-            # Expected feature list (order matters for the model)
-            expected_features = [
-                'Age', 'Gender_female', 'Gender_male', 'Gender_other',
-                'self_employed_yes', 'family_history_yes', 'work_interfere_often',
-                'work_interfere_rarely', 'work_interfere_sometimes', 'remote_work_yes',
-                'tech_company_yes', 'benefits_no', 'benefits_yes', 'care_options_not sure',
-                'care_options_yes', 'wellness_program_no', 'wellness_program_yes',
-                'seek_help_no', 'seek_help_yes', 'mental_health_consequence_no',
-                'mental_health_consequence_yes', 'phys_health_consequence_no',
-                'phys_health_consequence_yes', 'coworkers_some of them', 'coworkers_yes',
-                'supervisor_some of them', 'supervisor_yes', 'mental_health_interview_no',
-                'mental_health_interview_yes', 'phys_health_interview_no',
-                'phys_health_interview_yes', 'mental_vs_physical_no', 'mental_vs_physical_yes'
-            ]
-            
-            # Ensure all expected features are present (add any missing ones)
-            for feature in expected_features:
-                if feature not in df.columns:
-                    df[feature] = 0.0
-            
-            # Reorder columns to match the expected order
-            df = df[expected_features]
-            
-            logger.info(f"Input preprocessed successfully. Shape: {df.shape}")
+            logger.info("Input preprocessed successfully", extra={'shape': df.shape})
             return df
             
         except Exception as e:
             logger.error(f"Preprocessing error: {e}")
             raise
     
-    def predict(self, input_data: Dict[str, Any]) -> Tuple[int, float]:
+    def predict(self, input_data: Dict[str, Any], canonical: bool = False) -> Tuple[int, float]:
         """
         Make a prediction for mental health treatment seeking.
         
         Args:
             input_data (Dict): Input features
+            canonical (bool): The answers were already normalized by
+                ``RequestSchema``, so encoding skips normalization
             
         Returns:
             Tuple[int, float]: Prediction (0 or 1) and confidence score
         """
         try:
-            if self.model is None:
+            if self.cache is not None:
+                now = time.monotonic()
+                if now >= self._next_model_check:
+                    self._next_model_check = now + self.model_check_interval
+                    self.reload_if_changed()
+            loaded = self.loaded
+            if loaded[0] is None and loaded[1] is None:
                 raise ValueError("Model not loaded")
             
-            # Preprocess the input
-            processed_df = self._preprocess_input(input_data)
-            
-            # Make prediction
-            prediction = self.model.predict(processed_df)[0]
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(input_data)
+                if cache_key is not None:
+                    cache_key = (loaded[3],) + cache_key
+                    cached = self.cache.get(cache_key)
+                    if cached is not None:
+                        return cached
             
-            # Get prediction probabilities for confidence
-            try:
-                probabilities = self.model.predict_proba(processed_df)[0]
-                confidence = max(probabilities)
-            except:
-                # If predict_proba is not available, use decision function
-                try:
-                    decision_score = abs(self.model.decision_function(processed_df)[0])
-                    confidence = min(max(decision_score / 10, 0.5), 1.0)  # Normalize to 0.5-1.0
-                except:
-                    confidence = 0.7  # Default confidence
+            observer = self.stage_observer
+            started = time.perf_counter() if observer else 0.0
             
-            logger.info(f"Prediction made: {prediction}, Confidence: {confidence}")
-            return int(prediction), float(confidence)
+            # Preprocess the input
+            features = self.encoder.encode(input_data, canonical)
+            if observer:
+                encoded = time.perf_counter()
+                observer('preprocess', encoded - started)
+            
+            # Make prediction and derive confidence from the same model call
+            predictions, confidences = self._score_matrix(features, loaded)
+            prediction, confidence = predictions[0], confidences[0]
+            if observer:
+                observer('predict', time.perf_counter() - encoded)
+            
+            result = int(prediction), float(confidence)
+            # Structured fields instead of an f-string: nothing is formatted
+            # unless the record survives level and sampling filters
+            logger.info("Prediction made", extra={'prediction': result[0], 'confidence': result[1]})
+            if cache_key is not None:
+                self.cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise
     
-    def get_feature_importance(self) -> Dict[str, float]:
+    def predict_batch(self, records: List[Any], canonical: bool = False) -> List[Dict[str, Any]]:
         """
-        Get feature importance if available from the model.
+        Make predictions for a batch of records with a single model call.
+        
+        Every record is encoded into one row of a shared feature matrix and
+        the whole matrix is scored with one model call. Records
+        that cannot be encoded are reported individually instead of failing
+        the whole batch.
         
+        Args:
+            records (List): Input feature dicts, one per record
+            canonical (bool): The records were already normalized
+            
         Returns:
-            Dict[str, float]: Feature importance scores
+            List[Dict[str, Any]]: One entry per record, in input order, with
+            either ``prediction`` and ``confidence`` or an ``error`` message
+        """
+        loaded = self.loaded
+        if loaded[0] is None and loaded[1] is None:
+            raise ValueError("Model not loaded")
+        
+        observer = self.stage_observer
+        started = time.perf_counter() if observer else 0.0
+        
+        errors: Dict[int, str] = {}
+        matrix = self.encoder.encode_batch(records, errors, canonical)
+        if observer:
+            encoded = time.perf_counter()
+            observer('batch_preprocess', encoded - started)
+        valid_rows = [index for index in range(len(records)) if index not in errors]
+        results: List[Dict[str, Any]] = [
+            {'error': errors[index]} if index in errors else {} for index in range(len(records))
+        ]
+        
+        if valid_rows:
+            predictions, confidences = self._score_matrix(matrix, loaded)
+            if observer:
+                observer('batch_predict', time.perf_counter() - encoded)
+            
+            for row, index in enumerate(valid_rows):
+                results[index] = {
+                    'prediction': int(predictions[row]),
+                    'confidence': float(confidences[row])
+                }
+        
+        logger.info("Batch prediction made",
+                    extra={'scored': len(valid_rows), 'rejected': len(records) - len(valid_rows)})
+        return results
+    
+    def _score_matrix(self, matrix: np.ndarray, loaded: Tuple) -> Tuple[np.ndarray, np.ndarray]:
         """
+        Score encoded rows with the native engine or the sklearn model.
+        
+        Args:
+            matrix (np.ndarray): Encoded feature rows
+            loaded (Tuple): The model version to score with (``self.loaded``)
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Predictions and confidence scores
+        """
+        model, scorer = loaded[0], loaded[1]
+        if scorer is not None:
+            return scorer.predict_with_confidence(matrix)
+        
+        import pandas as pd
+        processed_df = pd.DataFrame(matrix, columns=EXPECTED_FEATURES)
+        
+        # Derive the class from the probabilities instead of calling predict too
+        if hasattr(model, 'predict_proba'):
+            probabilities = model.predict_proba(processed_df)
+            best = probabilities.argmax(axis=1)
+            return model.classes_[best], probabilities[np.arange(len(best)), best]
+        
+        predictions = model.predict(processed_df)
         try:
-            if hasattr(self.model, 'feature_importances_'):
-                importance = self.model.feature_importances_
-            elif hasattr(self.model, 'coef_'):
-                importance = abs(self.model.coef_[0])
-            else:
-                return {}
+            # If predict_proba is not available, use decision function
+            decision_scores = np.abs(model.decision_function(processed_df))
+            confidences = np.clip(decision_scores / 10, 0.5, 1.0)  # Normalize to 0.5-1.0
+        except Exception:
+            confidences = np.full(len(predictions), 0.7)  # Default confidence
+        return predictions, confidences
+    
+    @staticmethod
+    def _linear_scorer(loaded: Tuple) -> LinearScorer:
+        """Folded linear form of the model (also with the sklearn engine)"""
+        if loaded[2] is None:
+            raise ValueError("Explanations are only available for linear models")
+        return loaded[2]
+    
+    def explain_batch(self, records: List[Any], canonical: bool = False) -> List[Dict[str, Any]]:
+        """
+        Explain predictions for a batch of records.
+        
+        Each feature's additive contribution to the logit is its encoded
+        value times its folded weight, so one elementwise product over the
+        encoded matrix explains the whole batch exactly. Contributions are
+        summed per survey question (the one-hot columns of a question
+        together) and sorted by absolute size.
+        
+        Args:
+            records (List): Input feature dicts, one per record
+            canonical (bool): The records were already normalized
             
-            expected_features = [
-                'Age', 'self_employed', 'family_history', 'work_interfere',
-                'remote_work', 'tech_company', 'benefits', 'care_options',
-                'wellness_program', 'seek_help', 'mental_health_consequence',
-                'phys_health_consequence', 'coworkers', 'supervisor',
-                'mental_health_interview', 'phys_health_interview',
-                'mental_vs_physical', 'Gender_female', 'Gender_male', 'Gender_other'
+        Returns:
+            List[Dict[str, Any]]: One entry per record, in input order, with
+            ``prediction``, ``confidence``, ``logit``, ``intercept`` and
+            ``contributions``, or an ``error`` message
+        """
+        loaded = self.loaded
+        if loaded[0] is None and loaded[1] is None:
+            raise ValueError("Model not loaded")
+        scorer = self._linear_scorer(loaded)
+        
+        errors: Dict[int, str] = {}
+        matrix = self.encoder.encode_batch(records, errors, canonical).astype(np.float64)
+        contributions = scorer.contributions(matrix)
+        per_question = contributions @ self.encoder.question_matrix
+        logits = per_question.sum(axis=1) + scorer.intercept
+        predictions, confidences = scorer.predict_with_confidence(matrix)
+        
+        questions = self.encoder.questions
+        results: List[Dict[str, Any]] = []
+        row = 0
+        for index in range(len(records)):
+            if index in errors:
+                results.append({'error': errors[index]})
+                continue
+            features: List[Dict[str, float]] = [{} for _ in questions]
+            for column in np.flatnonzero(matrix[row]):
+                question = self.encoder.column_questions[column]
+                if question is not None:
+                    features[question][EXPECTED_FEATURES[column]] = float(contributions[row, column])
+            grouped = [
+                {
+                    'question': questions[question],
+                    'contribution': float(per_question[row, question]),
+                    'features': features[question]
+                }
+                for question in np.argsort(-np.abs(per_question[row]), kind='stable')
             ]
+            results.append({
+                'prediction': int(predictions[row]),
+                'confidence': float(confidences[row]),
+                'logit': float(logits[row]),
+                'intercept': float(scorer.intercept),
+                'contributions': grouped
+            })
+            row += 1
+        return results
+    
+    def explain(self, input_data: Dict[str, Any], canonical: bool = False) -> Dict[str, Any]:
+        """
+        Explain one prediction (see ``explain_batch``).
+        
+        Raises:
+            ValueError: If the record cannot be encoded or the model is not linear
+        """
+        result = self.explain_batch([input_data], canonical)[0]
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result
+    
+    @staticmethod
+    def _positive_probabilities(matrix: np.ndarray, loaded: Tuple) -> np.ndarray:
+        """Probability of the positive class (treatment) for each encoded row"""
+        model, scorer = loaded[0], loaded[1]
+        if scorer is not None:
+            return scorer.predict_proba(matrix)
+        if not hasattr(model, 'predict_proba'):
+            raise ValueError("What-if scoring requires a model with predict_proba")
+        import pandas as pd
+        probabilities = model.predict_proba(pd.DataFrame(matrix, columns=EXPECTED_FEATURES))
+        return probabilities[:, list(model.classes_).index(1)]
+    
+    def what_if(self, input_data: Dict[str, Any], canonical: bool = False) -> Dict[str, Any]:
+        """
+        Score every single-field alternative of a record.
+        
+        The record and each variant with one answer changed (29 rows for a
+        fully answered survey) are encoded into one matrix and scored with a
+        single model call. Answers that encode alike appear once, and the
+        record's own answer is not listed (see
+        ``FeatureEncoder.encode_alternatives``).
+        
+        Args:
+            input_data (Dict): Input features
+            canonical (bool): The answers were already normalized
             
-            return dict(zip(expected_features, importance))
+        Returns:
+            Dict[str, Any]: The record's ``probability`` of seeking treatment
+            and ``prediction``, and ``alternatives`` sorted by the absolute
+            change in probability, each with ``field``, ``answer``,
+            ``current``, ``probability``, ``delta`` and ``prediction``
+        """
+        loaded = self.loaded
+        if loaded[0] is None and loaded[1] is None:
+            raise ValueError("Model not loaded")
+        
+        observer = self.stage_observer
+        started = time.perf_counter() if observer else 0.0
+        matrix, changes = self.encoder.encode_alternatives(input_data, canonical)
+        probabilities = self._positive_probabilities(matrix, loaded)
+        if observer:
+            observer('what_if', time.perf_counter() - started)
+        
+        baseline = float(probabilities[0])
+        deltas = probabilities[1:] - baseline
+        alternatives = [
+            {
+                'field': changes[row][0],
+                'answer': changes[row][1],
+                'current': changes[row][2],
+                'probability': float(probabilities[row + 1]),
+                'delta': float(deltas[row]),
+                'prediction': int(probabilities[row + 1] > 0.5)
+            }
+            for row in np.argsort(-np.abs(deltas), kind='stable')
+        ]
+        return {'probability': baseline, 'prediction': int(baseline > 0.5), 'alternatives': alternatives}
+    
+    def get_feature_importance(self) -> Dict[str, float]:
+        """
+        Get feature importance if available from the model.
+        
+        Linear models report the magnitude of each encoded column's folded
+        weight (its effect on the logit per unit of the raw encoded value);
+        tree models report ``feature_importances_`` of the final estimator.
+        
+        Returns:
+            Dict[str, float]: Feature importance scores keyed by encoded column
+        """
+        try:
+            loaded = self.loaded
+            model = loaded[0]
+            if loaded[1] is not None or model is None:
+                weights = self._linear_scorer(loaded).weights
+                return {name: float(abs(weight)) for name, weight in zip(EXPECTED_FEATURES, weights)}
+            
+            estimator = model.steps[-1][1] if hasattr(model, 'steps') else model
+            if hasattr(estimator, 'feature_importances_'):
+                names = EXPECTED_FEATURES
+                if hasattr(model, 'steps') and len(model.steps) > 1:
+                    names = list(model[:-1].get_feature_names_out())
+                return {str(name): float(value) for name, value in zip(names, estimator.feature_importances_)}
+            
+            weights = self._linear_scorer(loaded).weights
+            return {name: float(abs(weight)) for name, weight in zip(EXPECTED_FEATURES, weights)}
             
         except Exception as e:
             logger.error(f"Feature importance error: {e}")
@@ -0,0 +1,217 @@
+"""
+Versioned model directory.
+
+Layout::
+
+    <models_dir>/
+        CURRENT              name of the active version
+        <version>/
+            model.pkl        fitted sklearn model
+            model.json       precompiled artifact (linear models only)
+            metadata.json    free-form information about the version
+
+``CURRENT`` is replaced atomically, so readers always see either the old
+or the new version name, never a partial write. ``ModelRegistry`` serves
+whichever version ``CURRENT`` names and hot-swaps to new ones.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from fork_safe_thread import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = 'CURRENT'
+
+def publish_version(model: Any, models_dir: str, version: str,
+                    metadata: Optional[Dict[str, Any]] = None,
+                    feature_names: Optional[Sequence[str]] = None) -> str:
+    """
+    Write a model as a new version and make it the current one.
+    
+    Args:
+        model: Fitted sklearn model
+        models_dir (str): Versioned model directory
+        version (str): Version name (a directory name)
+        metadata (Dict, optional): Extra information stored with the version
+        feature_names (Sequence[str], optional): Encoded feature order; when
+            given and the model is linear, a precompiled artifact is written too
+            
+    Returns:
+        str: Path of the version directory
+    """
+    import joblib
+    from model_artifact import export_artifact
+    
+    version_dir = os.path.join(models_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(version_dir, 'model.pkl'))
+    if feature_names is not None:
+        try:
+            export_artifact(model, feature_names, os.path.join(version_dir, 'model.json'))
+        except ValueError:
+            pass
+    with open(os.path.join(version_dir, 'metadata.json'), 'w') as f:
+        json.dump(dict(metadata or {}, version=version), f, indent=2)
+    
+    set_current(models_dir, version)
+    return version_dir
+
+def set_current(models_dir: str, version: str) -> None:
+    """Atomically point CURRENT at an existing version"""
+    if not os.path.isdir(os.path.join(models_dir, version)):
+        raise ValueError(f"Unknown model version '{version}'")
+    tmp_path = os.path.join(models_dir, f'.{CURRENT_FILE}.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(version + '\n')
+    os.replace(tmp_path, os.path.join(models_dir, CURRENT_FILE))
+
+def read_current(models_dir: str) -> Optional[str]:
+    """Name of the current version, or None if nothing was published yet"""
+    try:
+        with open(os.path.join(models_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def version_model_path(models_dir: str, version: str, prefer_artifact: bool = True) -> str:
+    """Model file of a version, the precompiled artifact when there is one"""
+    version_dir = os.path.join(models_dir, version)
+    artifact_path = os.path.join(version_dir, 'model.json')
+    if prefer_artifact and os.path.exists(artifact_path):
+        return artifact_path
+    return os.path.join(version_dir, 'model.pkl')
+
+class ModelRegistry:
+    """
+    Holds the active predictor and swaps in new model versions without downtime.
+    
+    A new version is loaded and warmed up with canary predictions off the
+    request path; only then is the ``(version, predictor)`` pair replaced, in
+    a single assignment. Requests read ``active`` once and keep using that
+    predictor, so they never block on a load or see a half-loaded model. A
+    version that fails to load or warm up is logged and the old one stays.
+    """
+    
+    def __init__(self, models_dir: Optional[str], load: Callable[[str], Any],
+                 canaries: Sequence[Dict[str, Any]] = (), poll_interval: float = 5.0,
+                 prefer_artifact: bool = True):
+        """
+        Args:
+            models_dir (str, optional): Versioned model directory; None serves a
+                single predictor set with ``activate``
+            load (Callable): Builds a predictor from a model file path
+            canaries (Sequence[Dict]): Records scored to warm up a new version
+            poll_interval (float): Seconds between checks of ``CURRENT`` by the watcher
+            prefer_artifact (bool): Load ``model.json`` instead of ``model.pkl`` when present
+        """
+        self.models_dir = models_dir
+        self.load = load
+        self.canaries = list(canaries)
+        self.poll_interval = poll_interval
+        self.prefer_artifact = prefer_artifact
+        self.active: Tuple[Optional[str], Any] = (None, None)
+        self.last_error = None
+        self.loaded_at = None
+        self.swaps = 0
+        self._load_lock = threading.Lock()
+        self._watcher = ForkSafeThread(self._watch, 'model-watcher')
+    
+    @property
+    def version(self) -> Optional[str]:
+        return self.active[0]
+    
+    @property
+    def predictor(self) -> Any:
+        return self.active[1]
+    
+    def activate(self, version: str, predictor: Any) -> None:
+        """Make an already loaded predictor the active one"""
+        self.active = (version, predictor)
+        self.loaded_at = time.time()
+        self.swaps += 1
+        logger.info(f"Serving model version {version}")
+    
+    def warm_up(self, predictor: Any) -> None:
+        """
+        Score the canary records.
+        
+        Raises:
+            ValueError: If a canary cannot be scored or gives an invalid result
+        """
+        for record in self.canaries:
+            prediction, confidence = predictor.predict(record)
+            if prediction not in (0, 1) or not math.isfinite(confidence):
+                raise ValueError(f"Canary returned an invalid result ({prediction}, {confidence})")
+        if self.canaries:
+            for result in predictor.predict_batch(self.canaries):
+                if 'error' in result:
+                    raise ValueError(f"Canary batch failed: {result['error']}")
+    
+    def load_version(self, version: str) -> bool:
+        """
+        Load, warm up and activate a version.
+        
+        Returns:
+            bool: True if the version is now active
+        """
+        with self._load_lock:
+            if version == self.version:
+                return True
+            path = version_model_path(self.models_dir, version, self.prefer_artifact)
+            try:
+                started = time.perf_counter()
+                predictor = self.load(path)
+                self.warm_up(predictor)
+            except Exception as e:
+                self.last_error = f"{version}: {e}"
+                logger.error(f"Failed to load model version {version}: {e}")
+                return False
+            self.last_error = None
+            self.activate(version, predictor)
+            logger.info(f"Loaded model version {version} in {time.perf_counter() - started:.3f}s")
+            return True
+    
+    def check(self) -> bool:
+        """
+        Activate the version named by ``CURRENT`` if it changed.
+        
+        Returns:
+            bool: True if a new version was activated
+        """
+        if self.models_dir is None:
+            return False
+        version = read_current(self.models_dir)
+        if version is None or version == self.version:
+            return False
+        return self.load_version(version)
+    
+    def ensure_watcher(self) -> None:
+        """Start the background watcher, again in each forked process"""
+        if self.models_dir is None or self.poll_interval <= 0:
+            return
+        self._watcher.ensure()
+    
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Model watcher error: {e}")
+    
+    def status(self) -> Dict[str, Any]:
+        """Active version and reload state"""
+        return {
+            'version': self.version,
+            'models_dir': self.models_dir,
+            'loaded_at': self.loaded_at,
+            'swaps': self.swaps,
+            'last_error': self.last_error
+        }
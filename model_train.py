@@ -1,4 +1,4 @@
-from preprocessing import df_copy
+from feature_pipeline import build_features
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
@@ -6,6 +6,9 @@ from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression
 
 
+# Cleaned and encoded training data (cached on disk after the first run)
+df_copy = build_features("mental_health.csv")
+
 X = df_copy.drop(columns=["treatment"])
 y = df_copy["treatment"]
 
@@ -47,6 +50,11 @@ import joblib
 # Save model
 joblib.dump(log_reg_pipeline, "mental_health_model.pkl")
 
+# Precompiled artifact for the fast-startup serving mode
+from model_artifact import export_artifact
+from model_predictor import EXPECTED_FEATURES
+export_artifact(log_reg_pipeline, EXPECTED_FEATURES, "mental_health_model.json")
+
 # Load model
 loaded_model = joblib.load("mental_health_model.pkl")
 
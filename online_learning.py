@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Incremental (online) model updates from an append-only JSONL stream.
+
+Labeled survey records (the usual predictor input plus a ``treatment``
+label) are read from the stream in mini-batches, encoded into the same
+33-column layout the serving encoder produces, and applied with
+``partial_fit`` to a StandardScaler + logistic-loss SGDClassifier pipeline.
+Each update costs time proportional to the new records only. Progress (model
+state and stream byte offset) is checkpointed periodically, and new model
+versions are published to a versioned model directory (see model_registry).
+
+Usage:
+    python online_learning.py labeled.jsonl --state-dir online_state --publish-dir models
+    python online_learning.py labeled.jsonl --state-dir online_state --publish-dir models --follow
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from feature_encoder import FeatureEncoder
+from model_predictor import CATEGORICAL_MAPPINGS, EXPECTED_FEATURES
+from model_registry import publish_version
+
+logger = logging.getLogger(__name__)
+
+# Accepted spellings of the label
+LABELS = {'yes': 1, 'no': 0, '1': 1, '0': 0, 'true': 1, 'false': 0}
+
+def new_model() -> Pipeline:
+    """Unfitted incrementally trainable pipeline"""
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('classifier', SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42))
+    ])
+
+def read_new_lines(path: str, offset: int, max_lines: int) -> Tuple[List[str], int]:
+    """
+    Read up to ``max_lines`` complete lines starting at byte ``offset``.
+    
+    A trailing line without a newline is left for the next read, since the
+    writer may still be appending it.
+    
+    Returns:
+        Tuple[List[str], int]: The lines and the offset just past them
+    """
+    lines = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while len(lines) < max_lines:
+            line = f.readline()
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            lines.append(line.decode('utf-8'))
+    return lines, offset
+
+class OnlineTrainer:
+    """
+    Applies mini-batches of labeled records to an incrementally trained model.
+    """
+    
+    def __init__(self, state_dir: str, label_field: str = 'treatment'):
+        """
+        Args:
+            state_dir (str): Directory holding the checkpoint
+            label_field (str): Record field carrying the label
+        """
+        self.state_dir = state_dir
+        self.label_field = label_field
+        self.checkpoint_path = os.path.join(state_dir, 'checkpoint.pkl')
+        # Reuse the serving encoder so training sees exactly the serving layout
+        self.encoder = FeatureEncoder(CATEGORICAL_MAPPINGS, EXPECTED_FEATURES)
+        self.model = new_model()
+        self.offset = 0
+        self.samples_seen = 0
+        self.skipped = 0
+        self.updates = 0
+        
+        if os.path.exists(self.checkpoint_path):
+            state = joblib.load(self.checkpoint_path)
+            self.model = state['model']
+            self.offset = state['offset']
+            self.samples_seen = state['samples_seen']
+            self.skipped = state['skipped']
+            self.updates = state['updates']
+            logger.info(f"Resumed from checkpoint at offset {self.offset} "
+                        f"({self.samples_seen} samples seen)")
+    
+    def _labeled_matrix(self, records: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        features, labels = [], []
+        for record in records:
+            if not isinstance(record, dict):
+                self.skipped += 1
+                continue
+            label = LABELS.get(str(record.get(self.label_field)).lower().strip())
+            if label is None:
+                self.skipped += 1
+                continue
+            try:
+                features.append(self.encoder.encode(record)[0])
+            except (TypeError, ValueError):
+                self.skipped += 1
+                continue
+            labels.append(label)
+        if not features:
+            return np.empty((0, len(EXPECTED_FEATURES))), np.empty(0, dtype=int)
+        return np.vstack(features).astype(np.float64), np.asarray(labels)
+    
+    def update(self, records: List[Any]) -> int:
+        """
+        Apply one mini-batch.
+        
+        Returns:
+            int: Number of records used (unlabeled or invalid ones are skipped)
+        """
+        X, y = self._labeled_matrix(records)
+        if len(y) == 0:
+            return 0
+        
+        frame = pd.DataFrame(X, columns=EXPECTED_FEATURES)
+        scaler = self.model.named_steps['scaler']
+        classifier = self.model.named_steps['classifier']
+        scaler.partial_fit(frame)
+        classifier.partial_fit(scaler.transform(frame), y, classes=np.array([0, 1]))
+        
+        self.samples_seen += len(y)
+        self.updates += 1
+        return len(y)
+    
+    def consume(self, path: str, batch_size: int = 256) -> Iterator[int]:
+        """
+        Apply all complete records appended to ``path`` since the last offset.
+        
+        Yields:
+            int: Records used per mini-batch
+        """
+        while True:
+            lines, next_offset = read_new_lines(path, self.offset, batch_size)
+            if not lines:
+                return
+            records = []
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    self.skipped += 1
+            used = self.update(records)
+            self.offset = next_offset
+            yield used
+    
+    @property
+    def fitted(self) -> bool:
+        return hasattr(self.model.named_steps['classifier'], 'coef_')
+    
+    def checkpoint(self) -> None:
+        """Atomically save model state and stream offset"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        joblib.dump({
+            'model': self.model,
+            'offset': self.offset,
+            'samples_seen': self.samples_seen,
+            'skipped': self.skipped,
+            'updates': self.updates
+        }, tmp_path)
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def publish(self, publish_dir: str) -> Optional[str]:
+        """Publish the current model as a new version; returns the version name"""
+        if not self.fitted:
+            return None
+        version = f"online-{datetime.now().strftime('%Y%m%d%H%M%S')}-{self.samples_seen}"
+        publish_version(self.model, publish_dir, version, {
+            'source': 'online_learning',
+            'samples_seen': self.samples_seen,
+            'stream_offset': self.offset,
+            'published_at': datetime.now().isoformat()
+        }, feature_names=EXPECTED_FEATURES)
+        logger.info(f"Published model version {version}")
+        return version
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Incrementally train from a labeled JSONL stream.')
+    parser.add_argument('stream', help='Append-only JSONL file of labeled records')
+    parser.add_argument('--state-dir', default='online_state')
+    parser.add_argument('--publish-dir', help='Versioned model directory to publish to')
+    parser.add_argument('--label-field', default='treatment')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--checkpoint-every', type=int, default=10, help='Mini-batches between checkpoints')
+    parser.add_argument('--follow', action='store_true', help='Keep polling the stream for new records')
+    parser.add_argument('--poll-interval', type=float, default=5.0)
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    trainer = OnlineTrainer(args.state_dir, args.label_field)
+    
+    while True:
+        batches = 0
+        for used in trainer.consume(args.stream, args.batch_size):
+            batches += 1
+            if batches % args.checkpoint_every == 0:
+                trainer.checkpoint()
+                if args.publish_dir:
+                    trainer.publish(args.publish_dir)
+        if batches:
+            trainer.checkpoint()
+            if args.publish_dir and batches % args.checkpoint_every:
+                trainer.publish(args.publish_dir)
+            logger.info(f"{trainer.samples_seen} samples seen, {trainer.skipped} skipped, "
+                        f"offset {trainer.offset}")
+        if not args.follow:
+            return 0
+        time.sleep(args.poll_interval)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+class PredictionCache:
+    """
+    Bounded, thread-safe LRU cache of predictions.
+    
+    Keys are canonicalized survey answers: only the fields the model reads
+    are used, categorical answers are lowercased and stripped, and Age is
+    either kept exact or bucketed.
+    """
+    
+    def __init__(self, fields: Iterable[str], max_size: int = 1024, age_bucket: int = 0):
+        """
+        Args:
+            fields (Iterable[str]): Input fields that influence the prediction
+                (Age is handled separately)
+            max_size (int): Maximum number of cached predictions
+            age_bucket (int): Bucket width in years for Age; 0 keeps exact ages.
+                With bucketing, all ages in a bucket share the first result cached
+                for that bucket.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.fields = tuple(sorted(set(fields) - {'Age'}))
+        self.max_size = max_size
+        self.age_bucket = age_bucket
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def make_key(self, input_data: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        Build the canonical cache key for a record.
+        
+        Args:
+            input_data (Dict): Raw input data from form or API
+            
+        Returns:
+            Optional[Tuple]: Hashable key, or None if Age is not numeric and
+            the record should bypass the cache
+        """
+        try:
+            age = float(input_data.get('Age', 30))
+        except (TypeError, ValueError):
+            return None
+        if self.age_bucket:
+            age = age // self.age_bucket * self.age_bucket
+        
+        answers = tuple(
+            str(input_data[field]).lower().strip() if field in input_data else None
+            for field in self.fields
+        )
+        return (age,) + answers
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key (marking it recently used), or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the model changed"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Counters for health/metrics reporting"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'age_bucket': self.age_bucket,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
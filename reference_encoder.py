@@ -0,0 +1,179 @@
+"""
+The original field-by-field feature encoder.
+
+Serving uses the compiled ``FeatureEncoder``; this is the implementation it
+replaced, kept outside the serving code as the reference that the parity
+tests (test_feature_encoder.py) and the encoder benchmark
+(benchmarks/bench_encoder.py) compare against.
+"""
+
+from typing import Any, Dict
+
+import pandas as pd
+
+from model_predictor import EXPECTED_FEATURES
+
+def encode_features(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One-hot encode raw input data into training feature columns.
+    
+    Args:
+        input_data (Dict): Raw input data from form
+    
+    Returns:
+        Dict[str, Any]: Encoded feature values keyed by column name
+    """
+    # Create a copy of input data and extract Age
+    age = input_data.get('Age', 30)  # Default to 30 if missing
+    gender_female = input_data.get('Gender_female', 0)
+    gender_male = input_data.get('Gender_male', 0)
+    gender_other = input_data.get('Gender_other', 0)
+    
+    # Handle gender if it's a single field
+    if 'gender' in input_data:
+        gender_value = str(input_data['gender']).lower().strip()
+        gender_female = 1 if gender_value == 'female' else 0
+        gender_male = 1 if gender_value == 'male' else 0
+        gender_other = 1 if gender_value == 'other' else 0
+    
+    # One-hot encode all categorical features
+    processed_data = {
+        'Age': age,
+        'Gender_female': gender_female,
+        'Gender_male': gender_male,
+        'Gender_other': gender_other,
+    }
+    
+    # Binary one-hot encodings (features with Yes/No values)
+    binary_features = {
+        'self_employed': 'self_employed_yes',
+        'family_history': 'family_history_yes',
+        'remote_work': 'remote_work_yes',
+        'tech_company': 'tech_company_yes'
+    }
+    
+    for original_name, encoded_name in binary_features.items():
+        if original_name in input_data:
+            value = str(input_data[original_name]).lower().strip()
+            processed_data[encoded_name] = 1.0 if value == 'yes' else 0.0
+        else:
+            processed_data[encoded_name] = 0.0
+    
+    # Handle work_interfere (never, rarely, sometimes, often)
+    work_interfere_values = ['often', 'rarely', 'sometimes']
+    if 'work_interfere' in input_data:
+        value = str(input_data['work_interfere']).lower().strip()
+        for option in work_interfere_values:
+            processed_data[f'work_interfere_{option}'] = 1.0 if value == option else 0.0
+    else:
+        for option in work_interfere_values:
+            processed_data[f'work_interfere_{option}'] = 0.0
+    
+    # Handle benefits (no, yes, don't know)
+    if 'benefits' in input_data:
+        value = str(input_data['benefits']).lower().strip()
+        processed_data['benefits_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['benefits_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['benefits_no'] = 0.0
+        processed_data['benefits_yes'] = 0.0
+    
+    # Handle care_options (no, yes, not sure)
+    if 'care_options' in input_data:
+        value = str(input_data['care_options']).lower().strip()
+        processed_data['care_options_not sure'] = 1.0 if value == 'not sure' else 0.0
+        processed_data['care_options_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['care_options_not sure'] = 0.0
+        processed_data['care_options_yes'] = 0.0
+    
+    # Handle wellness_program (no, yes)
+    if 'wellness_program' in input_data:
+        value = str(input_data['wellness_program']).lower().strip()
+        processed_data['wellness_program_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['wellness_program_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['wellness_program_no'] = 0.0
+        processed_data['wellness_program_yes'] = 0.0
+    
+    # Handle seek_help (no, yes)
+    if 'seek_help' in input_data:
+        value = str(input_data['seek_help']).lower().strip()
+        processed_data['seek_help_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['seek_help_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['seek_help_no'] = 0.0
+        processed_data['seek_help_yes'] = 0.0
+    
+    # Handle mental_health_consequence (no, yes)
+    if 'mental_health_consequence' in input_data:
+        value = str(input_data['mental_health_consequence']).lower().strip()
+        processed_data['mental_health_consequence_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['mental_health_consequence_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['mental_health_consequence_no'] = 0.0
+        processed_data['mental_health_consequence_yes'] = 0.0
+    
+    # Handle phys_health_consequence (no, yes)
+    if 'phys_health_consequence' in input_data:
+        value = str(input_data['phys_health_consequence']).lower().strip()
+        processed_data['phys_health_consequence_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['phys_health_consequence_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['phys_health_consequence_no'] = 0.0
+        processed_data['phys_health_consequence_yes'] = 0.0
+    
+    # Handle coworkers (no, some of them, yes)
+    if 'coworkers' in input_data:
+        value = str(input_data['coworkers']).lower().strip()
+        processed_data['coworkers_some of them'] = 1.0 if value == 'some of them' else 0.0
+        processed_data['coworkers_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['coworkers_some of them'] = 0.0
+        processed_data['coworkers_yes'] = 0.0
+    
+    # Handle supervisor (no, some of them, yes)
+    if 'supervisor' in input_data:
+        value = str(input_data['supervisor']).lower().strip()
+        processed_data['supervisor_some of them'] = 1.0 if value == 'some of them' else 0.0
+        processed_data['supervisor_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['supervisor_some of them'] = 0.0
+        processed_data['supervisor_yes'] = 0.0
+    
+    # Handle mental_health_interview (no, yes)
+    if 'mental_health_interview' in input_data:
+        value = str(input_data['mental_health_interview']).lower().strip()
+        processed_data['mental_health_interview_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['mental_health_interview_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['mental_health_interview_no'] = 0.0
+        processed_data['mental_health_interview_yes'] = 0.0
+    
+    # Handle phys_health_interview (no, yes)
+    if 'phys_health_interview' in input_data:
+        value = str(input_data['phys_health_interview']).lower().strip()
+        processed_data['phys_health_interview_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['phys_health_interview_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['phys_health_interview_no'] = 0.0
+        processed_data['phys_health_interview_yes'] = 0.0
+    
+    # Handle mental_vs_physical (no, yes)
+    if 'mental_vs_physical' in input_data:
+        value = str(input_data['mental_vs_physical']).lower().strip()
+        processed_data['mental_vs_physical_no'] = 1.0 if value == 'no' else 0.0
+        processed_data['mental_vs_physical_yes'] = 1.0 if value == 'yes' else 0.0
+    else:
+        processed_data['mental_vs_physical_no'] = 0.0
+        processed_data['mental_vs_physical_yes'] = 0.0
+    
+    return processed_data
+
+def encode_frame(input_data: Dict[str, Any]) -> pd.DataFrame:
+    """Single-row DataFrame of ``encode_features`` in training column order"""
+    df = pd.DataFrame([encode_features(input_data)])
+    for feature in EXPECTED_FEATURES:
+        if feature not in df.columns:
+            df[feature] = 0.0
+    return df[EXPECTED_FEATURES]
@@ -0,0 +1,226 @@
+"""
+On-demand profiling of live requests.
+
+``RequestProfiler.start`` arms a session for the next N requests or for T
+seconds in the current process (one gunicorn worker). While it is armed,
+each request runs under its own ``cProfile.Profile`` (profilers are per
+thread, so concurrent requests in threaded workers do not interfere) and
+``tracemalloc`` traces allocations. When the session ends the per-request
+profiles are merged into one function table and the allocations made
+during the session are compared against a snapshot taken at its start.
+
+Request hooks only read ``active``, so a worker that is not being
+profiled pays for one attribute check per request and nothing else.
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTS = 1000
+MAX_SECONDS = 300
+DEFAULT_TOP = 30
+# Stack depth kept per allocation; the top-list groups by the innermost frame
+TRACEMALLOC_FRAMES = 1
+
+# The profiler's own bookkeeping is left out of the allocation top-list
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+def _function_name(key) -> str:
+    filename, line, name = key
+    if filename == '~':  # built-in function
+        return name
+    return f'{filename}:{line}({name})'
+
+class RequestProfiler:
+    """
+    cProfile and tracemalloc sessions over a bounded number of requests.
+    """
+    
+    def __init__(self):
+        self.active = False
+        self.session: Optional[Dict[str, Any]] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+        self._endpoints = Counter()
+        self._baseline = None
+        self._started_tracing = False
+        self._started = 0
+    
+    def start(self, requests: Optional[int] = None, seconds: Optional[float] = None,
+              top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Arm a profiling session.
+        
+        Args:
+            requests (int, optional): Number of requests to profile
+            seconds (float, optional): Profile every request for this long
+            top (int, optional): Entries in the function and allocation lists
+        
+        Returns:
+            Dict[str, Any]: The session (see ``status``)
+        
+        Raises:
+            ValueError: Unless exactly one of ``requests`` and ``seconds`` is
+                given and within limits
+            RuntimeError: If a session is already running
+        """
+        if (requests is None) == (seconds is None):
+            raise ValueError('Give either requests or seconds')
+        if requests is not None and (isinstance(requests, bool) or not isinstance(requests, int)
+                                     or not 1 <= requests <= MAX_REQUESTS):
+            raise ValueError(f'requests must be an integer between 1 and {MAX_REQUESTS}')
+        if seconds is not None and (isinstance(seconds, bool) or not isinstance(seconds, (int, float))
+                                    or not 0 < seconds <= MAX_SECONDS):
+            raise ValueError(f'seconds must be between 0 and {MAX_SECONDS}')
+        top = DEFAULT_TOP if top is None else top
+        if isinstance(top, bool) or not isinstance(top, int) or top < 1:
+            raise ValueError('top must be a positive integer')
+        
+        with self._lock:
+            if self.active:
+                raise RuntimeError('A profiling session is already running')
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._baseline = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+            self._stats = None
+            self._endpoints = Counter()
+            self._started = 0
+            self.session = {
+                'pid': os.getpid(),
+                'requests': requests,
+                'seconds': seconds,
+                'top': top,
+                'started_at': time.time(),
+                'deadline': time.monotonic() + seconds if seconds is not None else None,
+                'profiled': 0
+            }
+            self.result = None
+            self.active = True
+        logger.info(f"Profiling session started (requests={requests}, seconds={seconds})")
+        return self.status()
+    
+    def _expired(self) -> bool:
+        deadline = self.session['deadline']
+        return deadline is not None and time.monotonic() >= deadline
+    
+    def begin(self) -> Optional[cProfile.Profile]:
+        """Start profiling the calling thread's request, if the session wants it"""
+        with self._lock:
+            if not self.active:
+                return None
+            if self._expired():
+                self._finish()
+                return None
+            limit = self.session['requests']
+            if limit is not None and self._started >= limit:
+                return None
+            self._started += 1
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+    
+    def end(self, profile: cProfile.Profile, endpoint: Optional[str]) -> None:
+        """Stop a request's profile and merge it into the session"""
+        profile.disable()
+        with self._lock:
+            if not self.active:
+                return
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self._endpoints[endpoint or 'unknown'] += 1
+            self.session['profiled'] += 1
+            limit = self.session['requests']
+            if (limit is not None and self.session['profiled'] >= limit) or self._expired():
+                self._finish()
+    
+    def call(self, endpoint: str, function: Callable, *args) -> Any:
+        """Run ``function(*args)`` as one profiled request (for non-Flask routes)"""
+        profile = self.begin()
+        if profile is None:
+            return function(*args)
+        try:
+            return function(*args)
+        finally:
+            self.end(profile, endpoint)
+    
+    def _finish(self) -> None:
+        """End the session and build the result (lock held)"""
+        session = self.session
+        top = session['top']
+        snapshot = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+        if self._started_tracing:
+            tracemalloc.stop()
+        allocations = [
+            {
+                'location': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                'size_kb': round(stat.size_diff / 1024, 1),
+                'count': stat.count_diff
+            }
+            for stat in snapshot.compare_to(self._baseline, 'lineno')[:top]
+            if stat.size_diff > 0
+        ]
+        self._baseline = None
+        
+        functions: List[Dict[str, Any]] = []
+        total_seconds = 0.0
+        if self._stats is not None:
+            total_seconds = self._stats.total_tt
+            entries = sorted(self._stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+            for key, (_, calls, own_time, cumulative, _) in entries[:top]:
+                functions.append({
+                    'function': _function_name(key),
+                    'calls': calls,
+                    'own_ms': round(own_time * 1000, 3),
+                    'cumulative_ms': round(cumulative * 1000, 3),
+                    'cumulative_per_request_ms': round(cumulative * 1000 / session['profiled'], 3)
+                })
+        self._stats = None
+        
+        self.result = {
+            'pid': session['pid'],
+            'requests': session['profiled'],
+            'endpoints': dict(self._endpoints),
+            'wall_seconds': round(time.time() - session['started_at'], 3),
+            'profiled_seconds': round(total_seconds, 6),
+            'functions': functions,
+            'allocations': allocations
+        }
+        self.active = False
+        # Also logged, since a later GET may be routed to a different worker
+        logger.info(f"Profiling session finished after {session['profiled']} requests",
+                    extra={'profile': self.result})
+    
+    def status(self) -> Dict[str, Any]:
+        """Whether a session is running, its progress, and the last result"""
+        with self._lock:
+            if self.active and self._expired():
+                self._finish()
+            session = self.session
+            return {
+                'pid': os.getpid(),
+                'active': self.active,
+                'session': {key: value for key, value in session.items() if key != 'deadline'}
+                if session is not None else None,
+                'result': self.result
+            }
@@ -0,0 +1,163 @@
+"""
+Validation of prediction requests.
+
+``RequestSchema`` is compiled once from the predictor's categorical
+mappings: the accepted answers of every survey question (through the same
+``AnswerNormalizer`` tables the encoder uses, so "M" or "Don't Know" are
+accepted), the Age range kept by the training filter, and which fields are
+required. ``validate`` checks a request in one pass and returns either the
+canonical record, ready for ``FeatureEncoder.encode`` with
+``canonical=True``, or a list of structured errors.
+"""
+
+import math
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from answer_normalizer import AnswerNormalizer, gender_normalizer
+from feature_encoder import GENDER_FIELD, GENDER_PREFIX
+
+# Training keeps rows with 10 < Age < 100 (feature_pipeline.DEFAULT_CONFIG)
+AGE_MIN = 10
+AGE_MAX = 100
+REQUIRED_FIELDS = ('Age',)
+
+class SchemaError(ValueError):
+    """Raised by ``RequestSchema.check`` with the list of field errors"""
+    
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        super().__init__('; '.join(f"{error['field']}: {error['message']}" for error in errors))
+
+class RequestSchema:
+    """
+    Compiled request schema for the survey fields.
+    """
+    
+    def __init__(self, categorical_mappings: Mapping[str, Mapping[str, int]],
+                 gender_columns: Sequence[str] = (), required: Sequence[str] = REQUIRED_FIELDS,
+                 age_bounds: Tuple[float, float] = (AGE_MIN, AGE_MAX)):
+        """
+        Args:
+            categorical_mappings (Mapping): Field name to answer vocabulary
+            gender_columns (Sequence[str]): Raw one-hot gender columns accepted
+                as 0/1 values instead of a ``gender`` answer
+            required (Sequence[str]): Fields that must be present
+            age_bounds (Tuple[float, float]): Exclusive Age bounds
+        """
+        self.required = set(required)
+        self.age_min, self.age_max = age_bounds
+        self.normalizers = {GENDER_FIELD: gender_normalizer()}
+        for field, answers in categorical_mappings.items():
+            self.normalizers[field] = AnswerNormalizer(answers)
+        self.allowed = {
+            field: sorted(set(normalizer.table.values()))
+            for field, normalizer in self.normalizers.items()
+        }
+        self.gender_columns = [name for name in gender_columns if name.startswith(GENDER_PREFIX)]
+        self._fields = [(field, normalizer.normalize) for field, normalizer in self.normalizers.items()]
+        self.valid = 0
+        self.invalid = 0
+    
+    def _age(self, value: Any) -> Tuple[Optional[float], Optional[str]]:
+        if isinstance(value, bool):
+            return None, 'must be a number'
+        try:
+            age = float(value)
+        except (TypeError, ValueError):
+            return None, 'must be a number'
+        if math.isnan(age) or not self.age_min < age < self.age_max:
+            return None, f'must be greater than {self.age_min} and less than {self.age_max}'
+        return age, None
+    
+    def validate(self, data: Any) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Validate and canonicalize one request.
+        
+        Missing, ``None`` and empty answers count as not answered. Fields
+        outside the schema are ignored.
+        
+        Args:
+            data: Parsed request body or form fields
+        
+        Returns:
+            Tuple[Dict, List[Dict]]: The canonical record (None when invalid)
+            and the errors, each with ``field`` and ``message`` (plus
+            ``allowed`` for unknown answers)
+        """
+        if not isinstance(data, dict):
+            self.invalid += 1
+            return None, [{'field': None, 'message': 'request body must be a JSON object'}]
+        
+        errors = []
+        record = {}
+        value = data.get('Age')
+        if value is None or value == '':
+            if 'Age' in self.required:
+                errors.append({'field': 'Age', 'message': 'is required'})
+        else:
+            age, message = self._age(value)
+            if message is None:
+                record['Age'] = age
+            else:
+                errors.append({'field': 'Age', 'message': message})
+        
+        for field, normalize in self._fields:
+            value = data.get(field)
+            if value is None or value == '':
+                if field in self.required:
+                    errors.append({'field': field, 'message': 'is required'})
+                continue
+            canonical = normalize(value)
+            if canonical is None:
+                errors.append({'field': field, 'message': f'unsupported value {value!r}',
+                               'allowed': self.allowed[field]})
+            else:
+                record[field] = canonical
+        
+        for name in self.gender_columns:
+            value = data.get(name)
+            if value is None:
+                continue
+            if value in (0, 1):
+                record[name] = float(value)
+            else:
+                errors.append({'field': name, 'message': 'must be 0 or 1'})
+        
+        if errors:
+            self.invalid += 1
+            return None, errors
+        self.valid += 1
+        return record, errors
+    
+    def check(self, data: Any) -> Dict[str, Any]:
+        """
+        Validate one request.
+        
+        Raises:
+            SchemaError: If the request is invalid
+        """
+        record, errors = self.validate(data)
+        if errors:
+            raise SchemaError(errors)
+        return record
+    
+    def normalization_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lookup and unmapped-answer counters per field.
+        
+        Requests are normalized here and encoded with ``canonical=True``, so
+        these counters (not the encoder's) reflect the served traffic.
+        """
+        return {field: normalizer.stats() for field, normalizer in self.normalizers.items()}
+    
+    def stats(self) -> Dict[str, Any]:
+        """Valid/invalid request counts and rejected answers per field"""
+        return {
+            'valid': self.valid,
+            'invalid': self.invalid,
+            'rejected_answers': {
+                field: normalizer.stats()['top_unmapped']
+                for field, normalizer in self.normalizers.items()
+                if normalizer.unmapped
+            }
+        }
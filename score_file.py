@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Bulk-score a CSV or JSONL file with the same logic as MentalHealthPredictor.
+
+Input is streamed in fixed-size chunks, each chunk is encoded and scored
+as one matrix, and results are written in input order. With --checkpoint,
+progress is recorded after every chunk so a crashed run can be resumed.
+
+Usage:
+    python score_file.py mental_health.csv predictions.jsonl
+    python score_file.py records.jsonl out.csv --workers 4 --chunk-size 5000 \\
+        --checkpoint out.ckpt --resume
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from model_predictor import MentalHealthPredictor
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_COLUMNS = ['row', 'id', 'prediction', 'confidence', 'error']
+
+# Predictor used by score_chunk; one per process
+_predictor: Optional[MentalHealthPredictor] = None
+
+def _init_worker(model_path: str, engine: str):
+    """Load the model once per process"""
+    global _predictor
+    logging.getLogger().setLevel(logging.WARNING)
+    _predictor = MentalHealthPredictor(model_path, engine=engine)
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def normalize_record(record: Any) -> Any:
+    """Map file column names (e.g. 'Gender', 'age') to predictor input keys"""
+    if not isinstance(record, dict):
+        return record
+    normalized = {}
+    for key, value in record.items():
+        lowered = str(key).strip().lower()
+        normalized['Age' if lowered == 'age' else lowered] = value
+    return normalized
+
+def read_records(path: str, fmt: str, offset: int = 0) -> Iterator[Tuple[Any, int]]:
+    """
+    Lazily yield input records with the byte offset just past each one.
+    
+    Args:
+        path (str): Input file
+        fmt (str): 'csv' or 'jsonl'
+        offset (int): Byte offset of the first record to read (an offset
+            yielded by an earlier run); a CSV header is still read from the
+            start of the file
+        
+    Yields:
+        Tuple[Any, int]: The record (None for an unparsable JSON line) and
+        the offset to resume from after it
+    """
+    with open(path, 'rb') as f:
+        position = 0
+        
+        def lines() -> Iterator[str]:
+            # The csv module pulls lines only as a record needs them, so
+            # ``position`` is at the end of the record just parsed
+            nonlocal position
+            for line in f:
+                position += len(line)
+                yield line.decode('utf-8')
+        
+        fieldnames = None
+        if fmt == 'csv':
+            fieldnames = next(csv.reader(lines()), None)
+            if fieldnames is None:
+                return
+        if offset:
+            f.seek(offset)
+            position = offset
+        
+        if fmt == 'csv':
+            for row in csv.DictReader(lines(), fieldnames=fieldnames):
+                yield row, position
+            return
+        for line in lines():
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), position
+            except ValueError:
+                yield None, position
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items"""
+    iterator = iter(records)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def score_chunk(start: int, records: List[Any], id_field: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Score one chunk with a single batch call.
+    
+    Args:
+        start (int): Input row number of the first record
+        records (List): Raw records from the input file
+        id_field (str, optional): Input field copied to the output ``id`` column
+        
+    Returns:
+        List[Dict]: One output row per input record
+    """
+    results = _predictor.predict_batch([normalize_record(record) for record in records])
+    rows = []
+    for offset, (record, result) in enumerate(zip(records, results)):
+        row = {'row': start + offset}
+        if id_field and isinstance(record, dict):
+            row['id'] = record.get(id_field)
+        if record is None:
+            row['error'] = 'Invalid JSON'
+        elif 'error' in result:
+            row['error'] = result['error']
+        else:
+            row['prediction'] = result['prediction']
+            row['confidence'] = round(result['confidence'], 6)
+        rows.append(row)
+    return rows
+
+def _serialize(rows: List[Dict[str, Any]], fmt: str, header: bool) -> bytes:
+    if fmt == 'jsonl':
+        return ''.join(json.dumps(row) + '\n' for row in rows).encode('utf-8')
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=OUTPUT_COLUMNS, lineterminator='\n')
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+def _load_checkpoint(path: str) -> Dict[str, int]:
+    with open(path) as f:
+        return json.load(f)
+
+def _save_checkpoint(path: str, rows_done: int, output_offset: int, input_offset: int):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'rows_done': rows_done, 'output_offset': output_offset, 'input_offset': input_offset}, f)
+    os.replace(tmp_path, path)
+
+def score_file(input_path: str, output_path: str, input_format: Optional[str] = None,
+               output_format: Optional[str] = None, chunk_size: int = 1000, workers: int = 1,
+               model_path: str = 'mental_health_model.pkl', engine: str = 'auto',
+               checkpoint: Optional[str] = None, resume: bool = False,
+               id_field: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Stream-score a file.
+    
+    Args:
+        input_path (str): CSV or JSONL input
+        output_path (str): CSV or JSONL output
+        input_format, output_format (str, optional): 'csv' or 'jsonl'; inferred
+            from the file extension when omitted
+        chunk_size (int): Records per scoring chunk
+        workers (int): Worker processes; 1 scores in-process
+        model_path (str): Model to load
+        engine (str): Scoring engine passed to MentalHealthPredictor
+        checkpoint (str, optional): Checkpoint file updated after each chunk
+        resume (bool): Continue from ``checkpoint`` if it exists; if the
+            output it refers to is missing or shorter, start over
+        id_field (str, optional): Input field copied to the output
+        
+    Returns:
+        Dict[str, Any]: Row/error counts, elapsed seconds and rows per second
+    """
+    input_format = _detect_format(input_path, input_format)
+    output_format = _detect_format(output_path, output_format)
+    
+    rows_done, output_offset, input_offset = 0, 0, 0
+    if resume and checkpoint and os.path.exists(checkpoint):
+        state = _load_checkpoint(checkpoint)
+        output_size = os.path.getsize(output_path) if os.path.exists(output_path) else -1
+        if output_size < state['output_offset'] or 'input_offset' not in state:
+            logger.warning(f"Checkpoint {checkpoint} does not match {output_path} (missing or "
+                           f"truncated output, or an older checkpoint); scoring from the start")
+        else:
+            rows_done, output_offset = state['rows_done'], state['output_offset']
+            input_offset = state['input_offset']
+            logger.info(f"Resuming at row {rows_done}")
+    
+    chunks = chunked(read_records(input_path, input_format, input_offset), chunk_size)
+    
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path, engine))
+    else:
+        _init_worker(model_path, engine)
+    
+    scored, errors = 0, 0
+    started = time.perf_counter()
+    
+    with open(output_path, 'r+b' if output_offset else 'wb') as out:
+        out.truncate(output_offset)
+        out.seek(output_offset)
+        
+        def write(rows, input_end):
+            nonlocal rows_done, scored, errors
+            out.write(_serialize(rows, output_format, header=out.tell() == 0))
+            out.flush()
+            rows_done += len(rows)
+            scored += len(rows)
+            errors += sum(1 for row in rows if 'error' in row)
+            if checkpoint:
+                os.fsync(out.fileno())
+                _save_checkpoint(checkpoint, rows_done, out.tell(), input_end)
+        
+        next_start = rows_done
+        try:
+            if executor is None:
+                for chunk in chunks:
+                    records = [record for record, _ in chunk]
+                    write(score_chunk(next_start, records, id_field), chunk[-1][1])
+                    next_start += len(chunk)
+            else:
+                # Keep a bounded number of chunks in flight and write them in order
+                pending = deque()
+                for chunk in chunks:
+                    records = [record for record, _ in chunk]
+                    pending.append((executor.submit(score_chunk, next_start, records, id_field), chunk[-1][1]))
+                    next_start += len(chunk)
+                    if len(pending) >= workers * 2:
+                        future, input_end = pending.popleft()
+                        write(future.result(), input_end)
+                while pending:
+                    future, input_end = pending.popleft()
+                    write(future.result(), input_end)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': scored,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(scored / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Bulk-score a CSV or JSONL file.')
+    parser.add_argument('input', help='CSV or JSONL file of survey records')
+    parser.add_argument('output', help='Output file (.csv or .jsonl)')
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--model', default='mental_health_model.pkl')
+    parser.add_argument('--engine', default='auto', choices=['auto', 'native', 'sklearn'])
+    parser.add_argument('--checkpoint', help='Checkpoint file updated after every chunk')
+    parser.add_argument('--resume', action='store_true', help='Resume from --checkpoint')
+    parser.add_argument('--id-field', help='Input field copied to the output id column')
+    args = parser.parse_args(argv)
+    
+    if args.resume and not args.checkpoint:
+        parser.error('--resume requires --checkpoint')
+    
+    logging.basicConfig(level=logging.WARNING)
+    summary = score_file(
+        args.input, args.output, args.input_format, args.output_format, args.chunk_size,
+        args.workers, args.model, args.engine, args.checkpoint, args.resume, args.id_field
+    )
+    print(f"Scored {summary['rows']} rows ({summary['errors']} errors) in "
+          f"{summary['seconds']:.2f}s: {summary['rows_per_second']:.0f} rows/sec", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
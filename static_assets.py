@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted, precompressed static assets and cached static pages.
+
+``AssetPipeline`` reads every file under ``static/``, names each one after
+a hash of its contents (``css/style.3f2a9c1b4d5e.css``) and gzips the text
+ones once. Templates link to the fingerprinted URLs via ``asset_url``, so
+assets can be served with immutable, year-long cache headers: a changed
+file gets a new URL. ``PageCache`` keeps the rendered bytes (plain and
+gzipped) of pages that never change between requests.
+
+Running this module writes the same fingerprinted and ``.gz`` files plus
+a ``manifest.json`` to a directory, for serving them from a CDN or a
+reverse proxy instead of Flask.
+
+Usage:
+    python static_assets.py [static_dir] [out_dir]
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+from typing import Any, Callable, Dict, Optional
+
+from flask import Response, request
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Pages are revalidated on every view; an unchanged page costs a 304
+PAGE_CACHE_CONTROL = 'no-cache'
+
+# Files worth gzipping (images like PNG/JPEG are already compressed)
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.html', '.txt')
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output, and so the ETag, identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def _accepts_gzip() -> bool:
+    return request.accept_encodings['gzip'] > 0
+
+def _respond(body: bytes, gzipped: Optional[bytes], etag: str, mimetype: str,
+             cache_control: str) -> Response:
+    """Conditional response with the gzip variant when the client accepts it"""
+    use_gzip = gzipped is not None and _accepts_gzip()
+    if use_gzip:
+        etag = f'{etag}-gz'
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(gzipped if use_gzip else body, mimetype=mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    if gzipped is not None:
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+class AssetPipeline:
+    """
+    In-memory fingerprinted copies of the files in a static directory.
+    """
+    
+    def __init__(self, static_dir: str, url_prefix: str = '/assets'):
+        """
+        Args:
+            static_dir (str): Directory with the source assets
+            url_prefix (str): URL path the fingerprinted assets are served under
+        """
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix.rstrip('/')
+        # logical path ('css/style.css') -> asset; fingerprinted path -> asset
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self.by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        self.build()
+    
+    def build(self) -> None:
+        """Hash and compress every asset"""
+        assets = {}
+        for root, _, files in os.walk(self.static_dir):
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                logical = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                digest = _digest(data)
+                stem, extension = os.path.splitext(logical)
+                gzipped = _gzip(data) if extension.lower() in COMPRESSIBLE_EXTENSIONS else None
+                if gzipped is not None and len(gzipped) >= len(data):
+                    gzipped = None
+                assets[logical] = {
+                    'path': f'{stem}.{digest}{extension}',
+                    'digest': digest,
+                    'data': data,
+                    'gzip': gzipped,
+                    'mimetype': mimetypes.guess_type(logical)[0] or 'application/octet-stream'
+                }
+        self.assets = assets
+        self.by_fingerprint = {asset['path']: asset for asset in assets.values()}
+    
+    def url(self, filename: str) -> str:
+        """Fingerprinted URL of an asset (for templates)"""
+        asset = self.assets.get(filename)
+        if asset is None:
+            raise KeyError(f"Unknown static asset '{filename}'")
+        return f"{self.url_prefix}/{asset['path']}"
+    
+    def response(self, path: str) -> Optional[Response]:
+        """Response for a fingerprinted path, or None if there is no such asset"""
+        asset = self.by_fingerprint.get(path)
+        if asset is None:
+            return None
+        return _respond(asset['data'], asset['gzip'], asset['digest'], asset['mimetype'],
+                        IMMUTABLE_CACHE_CONTROL)
+    
+    def write(self, out_dir: str) -> Dict[str, str]:
+        """
+        Write fingerprinted files, their ``.gz`` variants and ``manifest.json``.
+        
+        Returns:
+            Dict[str, str]: Manifest mapping logical to fingerprinted paths
+        """
+        manifest = {}
+        for logical, asset in self.assets.items():
+            target = os.path.join(out_dir, asset['path'])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(asset['data'])
+            if asset['gzip'] is not None:
+                with open(f'{target}.gz', 'wb') as f:
+                    f.write(asset['gzip'])
+            manifest[logical] = asset['path']
+        with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        return manifest
+
+class PageCache:
+    """
+    Rendered bytes of pages whose output is the same for every request.
+    """
+    
+    def __init__(self):
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def response(self, key: str, render: Callable[[], str]) -> Response:
+        """
+        Serve a page, rendering it only the first time.
+        
+        Args:
+            key (str): Cache key (e.g. the endpoint name)
+            render (Callable): Renders the page HTML
+        """
+        page = self.pages.get(key)
+        if page is None:
+            self.misses += 1
+            body = render().encode('utf-8')
+            page = {'data': body, 'gzip': _gzip(body), 'digest': _digest(body)}
+            self.pages[key] = page
+        else:
+            self.hits += 1
+        return _respond(page['data'], page['gzip'], page['digest'], 'text/html', PAGE_CACHE_CONTROL)
+    
+    def clear(self) -> None:
+        self.pages.clear()
+
+def main(argv) -> int:
+    static_dir = argv[0] if argv else 'static'
+    out_dir = argv[1] if len(argv) > 1 else 'dist'
+    manifest = AssetPipeline(static_dir).write(out_dir)
+    for logical, path in sorted(manifest.items()):
+        print(f"{logical} -> {path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
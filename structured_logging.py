@@ -0,0 +1,215 @@
+"""
+Non-blocking structured logging.
+
+``configure_logging`` replaces ``logging.basicConfig`` for the web app. The
+calling thread only runs the sampling filter and puts the record on a
+bounded queue; a background thread formats records as one JSON object per
+line and writes them out. Per-level sampling keeps one in N records of a
+level (e.g. ``INFO=0.01``) so that per-request log lines stay affordable at
+high request rates: a sampled-out record is never formatted or written.
+When the queue is full, records are dropped and counted rather than
+blocking the request.
+
+Extra fields passed with ``logger.info(..., extra={...})`` become keys of
+the JSON object.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TextIO
+
+from fork_safe_thread import ForkSafeThread
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+DEFAULT_QUEUE_SIZE = 10000
+# Seconds the writer waits after the first record of a burst before writing it
+WRITE_INTERVAL = 0.05
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[int, float]:
+    """
+    Parse ``"DEBUG=0,INFO=0.1"`` into ``{logging.DEBUG: 0.0, logging.INFO: 0.1}``.
+    
+    Raises:
+        ValueError: On an unknown level or a rate outside [0, 1]
+    """
+    rates = {}
+    for item in (spec or '').split(','):
+        if not item.strip():
+            continue
+        name, _, rate = item.partition('=')
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level '{name.strip()}'")
+        rates[level] = float(rate)
+        if not 0.0 <= rates[level] <= 1.0:
+            raise ValueError(f"Sample rate for {name.strip()} must be between 0 and 1")
+    return rates
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every ``1 / rate`` records per level.
+    
+    Counting instead of drawing random numbers makes the kept fraction
+    exact and the check a few integer operations. Levels without a rate
+    are always kept.
+    """
+    
+    def __init__(self, rates: Dict[int, float]):
+        super().__init__()
+        self.periods = {level: (round(1.0 / rate) if rate > 0 else 0) for level, rate in rates.items()}
+        self.counts = {level: 0 for level in rates}
+        self.sampled_out = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        period = self.periods.get(record.levelno)
+        if period is None or period == 1:
+            return True
+        count = self.counts[record.levelno]
+        self.counts[record.levelno] = count + 1
+        if period and count % period == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler whose writer thread is (re)started lazily in each process.
+    
+    Formatting happens on the writer thread, so the caller only pays for
+    the filter and an append to a ``SimpleQueue``. The writer drains every
+    queued record before writing, so a burst of records costs one wakeup and
+    one write. After a fork (e.g. gunicorn workers of a preloaded app) a
+    fresh queue and writer are created in the child.
+    """
+    
+    def __init__(self, target: logging.Handler, queue_size: int = DEFAULT_QUEUE_SIZE):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self.queue_size = queue_size
+        self.enqueued = 0
+        self.dropped = 0
+        self._writer = ForkSafeThread(self._write, 'log-writer', self._new_queue)
+    
+    def _new_queue(self):
+        self.queue = queue.SimpleQueue()
+        return (self.queue,)
+    
+    def _write(self, pending: queue.SimpleQueue):
+        while True:
+            batch = [pending.get()]
+            # Let a burst accumulate so it is written with one wakeup
+            time.sleep(WRITE_INTERVAL)
+            while True:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is None:
+                    self._flush()
+                    return
+                if record.levelno >= self.target.level:
+                    self.target.handle(record)
+            self._flush()
+    
+    def _flush(self):
+        try:
+            self.target.flush()
+        except (OSError, ValueError):
+            pass  # stream closed or broken (e.g. at interpreter exit)
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The writer thread formats the record; nothing to do on the caller
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self._writer.ensure()
+        if self.queue.qsize() >= self.queue_size:
+            self.dropped += 1
+            return
+        self.queue.put(record)
+        self.enqueued += 1
+    
+    def stop(self) -> None:
+        """Write out queued records and stop the writer thread"""
+        if self._writer.running:
+            self.queue.put(None)
+            self._writer.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        sampler = next((f for f in self.filters if isinstance(f, SamplingFilter)), None)
+        return {
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'sampled_out': sampler.sampled_out if sampler is not None else 0,
+            'queued': self.queue.qsize()
+        }
+
+def configure_logging(level: str = 'INFO', sample_rates: Optional[Dict[int, float]] = None,
+                      fmt: str = 'json', stream: Optional[TextIO] = None,
+                      queue_size: int = DEFAULT_QUEUE_SIZE) -> AsyncQueueHandler:
+    """
+    Route all logging through a background JSON writer.
+    
+    Args:
+        level (str): Root log level
+        sample_rates (Dict[int, float], optional): Fraction of records kept per level
+        fmt (str): 'json' for structured records, 'text' for the classic format
+        stream (TextIO, optional): Output stream, stderr by default
+        queue_size (int): Records buffered before new ones are dropped
+    
+    Returns:
+        AsyncQueueHandler: The installed handler (see ``stats``)
+    """
+    target = logging.StreamHandler(stream or sys.stderr)
+    if fmt == 'json':
+        target.setFormatter(JsonFormatter())
+    else:
+        target.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    
+    # Skip per-record caller lookup (sys._getframe walk) and multiprocessing
+    # name lookup, as recommended in the logging HOWTO's optimization notes;
+    # file/line are not part of the JSON records
+    logging._srcfile = None
+    logging.logMultiprocessing = False
+    
+    handler = AsyncQueueHandler(target, queue_size)
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+    
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, AsyncQueueHandler):
+            root.removeHandler(existing)
+            existing.stop()
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    atexit.register(handler.stop)
+    return handler
@@ -0,0 +1,70 @@
+"""
+Tests for the async entry point (native routes and the WSGI bridge)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('starlette')
+
+from asgi_app import app
+from test_batch_predict import SAMPLE
+
+
+def call(method, path, body=b'', headers=()):
+    """Drive the ASGI app with one HTTP request"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'root_path': '', 'query_string': b'', 'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+        'headers': [(name.encode(), value.encode()) for name, value in headers]
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = {name.decode(): value.decode() for name, value in sent[0]['headers']}
+    return sent[0]['status'], headers, b''.join(message.get('body', b'') for message in sent[1:])
+
+
+def test_predict_is_scored_on_the_pool():
+    status, _, body = call('POST', '/api/predict', json.dumps(SAMPLE).encode(),
+                           [('content-type', 'application/json')])
+
+    result = json.loads(body)
+    assert status == 200
+    assert result['prediction'] in (0, 1) and result['model_version']
+
+
+def test_predict_rejects_invalid_input():
+    status, _, body = call('POST', '/api/predict', b'{"Age": 3}', [('content-type', 'application/json')])
+
+    assert status == 422
+    assert json.loads(body)['details'][0]['field'] == 'Age'
+
+
+def test_health_reports_pool():
+    status, _, body = call('GET', '/api/health')
+
+    assert status == 200
+    assert json.loads(body)['inference_pool']['threads'] >= 1
+
+
+def test_form_flow_goes_through_flask():
+    form = '&'.join(f'{key}={value}' for key, value in dict(SAMPLE, age=SAMPLE['Age']).items() if key != 'Age')
+    page_status, _, page = call('GET', '/predict')
+    status, headers, body = call('POST', '/submit_prediction', form.replace(' ', '+').encode(),
+                                 [('content-type', 'application/x-www-form-urlencoded')])
+
+    assert page_status == 200 and b'<form' in page
+    assert status == 200
+    assert headers['content-type'].startswith('text/html')
+    assert b'Treatment' in body
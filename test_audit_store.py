@@ -0,0 +1,67 @@
+"""
+Tests for the SQLite prediction audit store
+"""
+
+import json
+import sqlite3
+
+import app as app_module
+from audit_store import AuditStore
+from feature_encoder import FeatureEncoder
+from model_predictor import CATEGORICAL_MAPPINGS, EXPECTED_FEATURES
+from test_batch_predict import SAMPLE
+
+
+def _store(path, **kwargs):
+    encoder = FeatureEncoder(CATEGORICAL_MAPPINGS, EXPECTED_FEATURES)
+    return AuditStore(str(path), canonicalize=encoder.canonical_record, **kwargs)
+
+
+def test_batched_writes_maintain_rollups(tmp_path):
+    store = _store(tmp_path / 'audit.db', batch_size=7)
+    for index in range(30):
+        record = dict(SAMPLE, Age=25 + index, gender='M' if index % 3 else 'robot')
+        store.record(record, index % 2, 0.8, model_version='v1' if index < 20 else 'v2',
+                     latency_ms=2.0, endpoint='api_predict')
+    store.flush(timeout=10)
+
+    stats = store.stats()
+    assert stats['total'] == 30
+    assert stats['positive_rate'] == 0.5
+    assert stats['mean_latency_ms'] == 2.0
+    assert stats['by_model_version'] == {'v1': {'count': 20, 'positive_rate': 0.5},
+                                         'v2': {'count': 10, 'positive_rate': 0.5}}
+    assert stats['by_field']['gender'] == {'male': {'count': 20, 'positive_rate': 0.5},
+                                           '<unmapped>': {'count': 10, 'positive_rate': 0.5}}
+    assert stats['by_field']['Age']['30-39']['count'] == 10
+    assert sum(hour['count'] for hour in stats['hourly']) == 30
+    assert stats['writer']['written'] == 30
+
+    with sqlite3.connect(str(tmp_path / 'audit.db')) as connection:
+        assert connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        rows = connection.execute('SELECT inputs FROM predictions').fetchall()
+    assert len(rows) == 30
+    assert json.loads(rows[0][0])['gender'] is None
+    assert json.loads(rows[1][0])['work_interfere'] == 'sometimes'
+
+
+def test_stats_endpoint(tmp_path, monkeypatch):
+    store = _store(tmp_path / 'audit.db')
+    monkeypatch.setattr(app_module, 'audit', store)
+    client = app_module.app.test_client()
+
+    client.post('/api/predict', json=SAMPLE)
+    client.post('/api/predict_batch', json=[SAMPLE, dict(SAMPLE, benefits='Yes'), 'bad'])
+    store.flush(timeout=10)
+
+    stats = client.get('/api/stats?field=benefits').get_json()
+    assert stats['total'] == 3
+    assert list(stats['by_field']) == ['benefits']
+    assert stats['by_field']['benefits']['yes']['count'] == 3
+    assert client.get('/api/stats?hours=x').status_code == 400
+
+
+def test_stats_endpoint_disabled(monkeypatch):
+    monkeypatch.setattr(app_module, 'audit', None)
+
+    assert app_module.app.test_client().get('/api/stats').status_code == 404
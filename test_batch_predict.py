@@ -0,0 +1,78 @@
+"""
+Tests for the batch prediction path (predictor and /api/predict_batch)
+"""
+
+import json
+
+from app import app
+from model_predictor import MentalHealthPredictor
+
+SAMPLE = {
+    'Age': 28,
+    'gender': 'female',
+    'self_employed': 'no',
+    'family_history': 'yes',
+    'work_interfere': 'sometimes',
+    'remote_work': 'yes',
+    'tech_company': 'yes',
+    'benefits': 'yes',
+    'care_options': 'yes',
+    'wellness_program': 'no',
+    'seek_help': 'yes',
+    'mental_health_consequence': 'maybe',
+    'phys_health_consequence': 'no',
+    'coworkers': 'some of them',
+    'supervisor': 'yes',
+    'mental_health_interview': 'no',
+    'phys_health_interview': 'maybe',
+    'mental_vs_physical': 'yes'
+}
+
+
+def test_predict_batch_matches_single_predictions():
+    predictor = MentalHealthPredictor('mental_health_model.pkl')
+    records = [SAMPLE, dict(SAMPLE, Age=55, family_history='no', work_interfere='never')]
+
+    results = predictor.predict_batch(records)
+
+    for record, result in zip(records, results):
+        prediction, confidence = predictor.predict(record)
+        assert result['prediction'] == prediction
+        assert abs(result['confidence'] - confidence) < 1e-9
+
+
+def test_predict_batch_reports_bad_records_individually():
+    predictor = MentalHealthPredictor('mental_health_model.pkl')
+
+    results = predictor.predict_batch([SAMPLE, 'not a record', dict(SAMPLE, Age='old')])
+
+    assert 'prediction' in results[0]
+    assert 'error' in results[1]
+    assert 'error' in results[2]
+
+
+def test_api_predict_batch_json_array():
+    client = app.test_client()
+
+    response = client.post('/api/predict_batch', json=[SAMPLE, SAMPLE])
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 2
+    assert body['errors'] == 0
+    assert [item['index'] for item in body['results']] == [0, 1]
+
+
+def test_api_predict_batch_ndjson_with_bad_line():
+    client = app.test_client()
+    payload = json.dumps(SAMPLE) + '\n{not json}\n' + json.dumps(SAMPLE) + '\n'
+
+    response = client.post('/api/predict_batch', data=payload,
+                           content_type='application/x-ndjson')
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['count'] == 3
+    assert body['errors'] == 1
+    assert 'error' in body['results'][1]
+    assert 'prediction' in body['results'][2]
@@ -0,0 +1,41 @@
+"""
+Tests for the micro-batching request scheduler
+"""
+
+import threading
+
+import pytest
+
+from batch_scheduler import MicroBatcher
+from model_predictor import MentalHealthPredictor
+
+
+def test_concurrent_requests_share_a_batch():
+    calls = []
+    release = threading.Event()
+
+    def score_batch(records):
+        calls.append(len(records))
+        release.wait(1)
+        return [{'prediction': record, 'confidence': 0.5} for record in records]
+
+    batcher = MicroBatcher(score_batch, window_ms=200, max_batch_size=4)
+    futures = [batcher.submit(i) for i in range(6)]
+    release.set()
+
+    assert [future.result(2)['prediction'] for future in futures] == list(range(6))
+    assert calls == [4, 2]
+    stats = batcher.stats()
+    assert stats['batches'] == 2 and stats['records'] == 6
+    assert stats['batch_size_histogram']['<=4'] == 1
+    assert stats['batch_size_histogram']['<=2'] == 1
+
+
+def test_results_match_direct_predictions():
+    predictor = MentalHealthPredictor('mental_health_model.pkl')
+    batcher = MicroBatcher(predictor.predict_batch, window_ms=5)
+    record = {'Age': 33, 'family_history': 'yes', 'benefits': 'no'}
+
+    assert batcher.predict(record, timeout=2) == predictor.predict(record)
+    with pytest.raises(ValueError):
+        batcher.predict({'Age': 'abc'}, timeout=2)
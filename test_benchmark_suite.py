@@ -0,0 +1,30 @@
+"""
+Tests for the benchmark suite's regression comparison
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from suite import compare  # noqa: E402
+
+
+def result(**metrics):
+    return {'results': {name: {'value': value, 'better': better}
+                        for name, (value, better) in metrics.items()}}
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = result(latency=(100.0, 'lower'), throughput=(1000.0, 'higher'), other=(10.0, 'lower'))
+    current = result(latency=(130.0, 'lower'), throughput=(700.0, 'higher'), other=(11.0, 'lower'))
+
+    flagged = {name: worse for name, _, _, _, worse in compare(baseline, current, threshold=0.15)}
+
+    assert flagged == {'latency': True, 'throughput': True, 'other': False}
+
+
+def test_compare_ignores_metrics_missing_from_baseline():
+    rows = compare(result(a=(1.0, 'lower')), result(a=(1.0, 'lower'), b=(5.0, 'lower')), 0.1)
+
+    assert [row[0] for row in rows] == ['a']
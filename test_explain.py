@@ -0,0 +1,58 @@
+"""
+Tests for exact per-question logit explanations
+"""
+
+import numpy as np
+import pytest
+
+from app import app
+from model_predictor import MentalHealthPredictor, EXPECTED_FEATURES
+from test_batch_predict import SAMPLE
+
+
+@pytest.mark.parametrize('engine', ['native', 'sklearn'])
+def test_contributions_sum_to_logit(engine):
+    predictor = MentalHealthPredictor('mental_health_model.pkl', engine=engine)
+    records = [SAMPLE, dict(SAMPLE, Age=61, gender='M', benefits="don't know"), {'Age': 22}]
+
+    explanations = predictor.explain_batch(records)
+
+    for record, explanation in zip(records, explanations):
+        total = explanation['intercept'] + sum(item['contribution'] for item in explanation['contributions'])
+        prediction, confidence = predictor.predict(record)
+        assert total == pytest.approx(explanation['logit'])
+        positive = confidence if prediction == 1 else 1 - confidence
+        assert 1 / (1 + np.exp(-total)) == pytest.approx(positive)
+        assert explanation['prediction'] == prediction
+        magnitudes = [abs(item['contribution']) for item in explanation['contributions']]
+        assert magnitudes == sorted(magnitudes, reverse=True)
+
+
+def test_contributions_are_grouped_by_question():
+    predictor = MentalHealthPredictor('mental_health_model.json')
+
+    explanation = predictor.explain(dict(SAMPLE, work_interfere='often'))
+
+    by_question = {item['question']: item for item in explanation['contributions']}
+    assert set(by_question) == set(predictor.encoder.questions)
+    work = by_question['work_interfere']
+    assert list(work['features']) == ['work_interfere_often']
+    weight = predictor.scorer.weights[EXPECTED_FEATURES.index('work_interfere_often')]
+    assert work['contribution'] == pytest.approx(weight)
+
+
+def test_feature_importance_names_every_encoded_column():
+    importance = MentalHealthPredictor('mental_health_model.pkl').get_feature_importance()
+
+    assert list(importance) == EXPECTED_FEATURES
+
+
+def test_explain_endpoints():
+    client = app.test_client()
+
+    single = client.post('/api/explain', json=SAMPLE).get_json()
+    batch = client.post('/api/explain_batch', json=[SAMPLE, 'bad']).get_json()
+
+    assert single['contributions'][0]['question']
+    assert batch['count'] == 2 and batch['errors'] == 1
+    assert batch['results'][0]['logit'] == pytest.approx(single['logit'])
@@ -0,0 +1,116 @@
+"""
+Parity tests: the compiled FeatureEncoder must produce byte-identical rows
+to the original field-by-field encoder (``reference_encoder``).
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_predictor import MentalHealthPredictor, EXPECTED_FEATURES
+from reference_encoder import encode_frame
+
+predictor = MentalHealthPredictor('mental_health_model.pkl')
+
+
+def legacy_row(input_data):
+    """Encode with the reference implementation and cast like the encoder"""
+    return encode_frame(input_data).to_numpy(dtype=np.float32)
+
+
+def all_answer_records():
+    """One record per (field, answer) pair, plus casing/whitespace variants"""
+    fields = dict(predictor.categorical_mappings)
+    fields['gender'] = {'male': 0, 'female': 1, 'other': 2}
+    for field, answers in fields.items():
+        for answer in itertools.chain(answers, ['unknown', '']):
+            for variant in (answer, answer.upper(), f'  {answer} '):
+                yield {'Age': 33, field: variant}
+
+
+@pytest.mark.parametrize('record', list(all_answer_records()))
+def test_single_field_parity(record):
+    encoded = predictor.encoder.encode(record)
+    assert encoded.tobytes() == legacy_row(record).tobytes()
+
+
+@pytest.mark.parametrize('record', [
+    {},
+    {'Age': 45},
+    {'Age': '52'},
+    {'Age': 27.5, 'Gender_male': 1},
+    {'Gender_female': 1, 'Gender_other': True},
+    {'gender': 'female', 'Gender_male': 1},
+    {'gender': None, 'benefits': None},
+    {'Age': 61, 'work_interfere': 'Often', 'benefits': "Don't know",
+     'care_options': 'Not sure', 'coworkers': 'Some of them', 'supervisor': 'some of them',
+     'mental_vs_physical': "don't know", 'gender': 'Other'},
+])
+def test_mixed_record_parity(record):
+    encoded = predictor.encoder.encode(record)
+    assert encoded.tobytes() == legacy_row(record).tobytes()
+
+
+# Free-text gender answers the original encoder left unrecognized, and the
+# canonical answer the compiled encoder must now encode them as
+GENDER_VARIATIONS = {
+    'M': 'male',
+    'cis man': 'male',
+    ' Cis Female ': 'female',
+    'Woman': 'female',
+    'non-binary': 'other',
+    'Trans woman': 'other',
+}
+
+
+@pytest.mark.parametrize('raw, canonical', sorted(GENDER_VARIATIONS.items()))
+def test_gender_variations_encode_as_canonical_answer(raw, canonical):
+    record = {'Age': 40, 'gender': raw, 'Gender_male': 1}
+
+    encoded = predictor.encoder.encode(record)
+
+    assert encoded.tobytes() == legacy_row(dict(record, gender=canonical)).tobytes()
+    assert encoded.tobytes() != legacy_row(record).tobytes()
+
+
+def test_encode_batch_matches_rows():
+    records = [dict(r) for r in itertools.islice(all_answer_records(), 50)]
+
+    matrix = predictor.encoder.encode_batch(records)
+
+    assert matrix.dtype == np.float32
+    expected = np.vstack([legacy_row(record) for record in records])
+    assert matrix.tobytes() == expected.tobytes()
+
+
+def test_encode_batch_collects_errors():
+    errors = {}
+
+    matrix = predictor.encoder.encode_batch([{'Age': 30}, 'x', {'Age': 'abc'}, {}], errors)
+
+    assert matrix.shape == (2, len(EXPECTED_FEATURES))
+    assert sorted(errors) == [1, 2]
+
+
+def test_gender_variations_use_training_replacements():
+    encoder = MentalHealthPredictor('mental_health_model.json').encoder
+    row = dict(zip(EXPECTED_FEATURES, encoder.encode({'gender': 'cis man'})[0]))
+    assert row['Gender_male'] == 1 and row['Gender_female'] == 0
+
+    encoder.encode({'gender': 'robot'})
+    encoder.encode({'gender': 'Robot '})
+    stats = encoder.normalization_stats()['gender']
+    assert stats['unmapped'] == 2
+    assert stats['top_unmapped'] == {'robot': 2}
+
+
+def test_encode_frame_matches_encode_batch():
+    records = [dict(r) for r in all_answer_records() if 'gender' not in r]
+    records += [{'Age': 40, 'gender': g, 'benefits': 'Yes'} for g in ('M', 'woman', 'x', None)]
+    frames = pd.DataFrame(records[:-4]), pd.DataFrame(records[-4:])
+
+    for part in frames:
+        expected = predictor.encoder.encode_batch(part.to_dict('records'))
+        assert predictor.encoder.encode_frame(part).tobytes() == expected.tobytes()
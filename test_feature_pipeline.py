@@ -0,0 +1,48 @@
+"""
+Tests for the cached training feature pipeline
+"""
+
+import shutil
+
+import pandas as pd
+
+import feature_pipeline
+from feature_pipeline import DEFAULT_CONFIG, build_features, cache_key
+from model_predictor import EXPECTED_FEATURES
+
+
+def test_encoded_columns_match_serving_layout():
+    df = build_features('mental_health.csv', cache_dir=None)
+
+    assert [column for column in df.columns if column != 'treatment'] == EXPECTED_FEATURES
+    assert df['Age'].abs().max() < 10  # scaled
+
+
+def test_cache_round_trip_is_exact_and_skips_work(tmp_path, monkeypatch):
+    fresh = build_features('mental_health.csv', cache_dir=str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('features recomputed on a cache hit')
+
+    monkeypatch.setattr(feature_pipeline, 'encode_survey', fail)
+    cached = build_features('mental_health.csv', cache_dir=str(tmp_path))
+
+    pd.testing.assert_frame_equal(cached, fresh)
+    assert all(type(column) is str for column in cached.columns)
+
+
+def test_cache_key_depends_on_data_and_config(tmp_path):
+    copy = tmp_path / 'copy.csv'
+    shutil.copy('mental_health.csv', copy)
+    key = cache_key(str(copy), DEFAULT_CONFIG)
+
+    assert cache_key(str(copy), dict(DEFAULT_CONFIG, age_max=90)) != key
+    with open(copy, 'a') as f:
+        f.write('\n')
+    assert cache_key(str(copy), DEFAULT_CONFIG) != key
+
+
+def test_importing_preprocessing_has_no_side_effects(capsys):
+    import preprocessing  # noqa: F401
+
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,60 @@
+"""
+Tests for threads started once per process
+"""
+
+import os
+import queue
+import threading
+
+import pytest
+
+from fork_safe_thread import ForkSafeThread
+
+
+def test_concurrent_ensure_starts_one_thread():
+    started = queue.Queue()
+    release = threading.Event()
+
+    def body(tag):
+        started.put(tag)
+        release.wait()
+
+    worker = ForkSafeThread(body, 'test-worker', setup=lambda: (object(),))
+    callers = [threading.Thread(target=worker.ensure) for _ in range(8)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    release.set()
+    worker.join(5)
+
+    assert started.qsize() == 1
+    assert not worker.running
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+def test_forked_process_starts_its_own_thread():
+    ran = []
+    worker = ForkSafeThread(lambda: ran.append(os.getpid()), 'test-worker')
+    worker.ensure()
+    worker.thread.join()
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            inherited = worker.running
+            worker.ensure()
+            worker.thread.join()
+            status = 0 if not inherited and ran[-1] == os.getpid() else 2
+        finally:
+            os.write(write_end, bytes([status]))
+            os._exit(0)
+    os.waitpid(pid, 0)
+    status = os.read(read_end, 1)
+    os.close(read_end)
+    os.close(write_end)
+
+    assert status == b'\x00'
+    assert worker.running and ran == [os.getpid()]
@@ -0,0 +1,91 @@
+"""
+Numerical equivalence of the native LinearScorer against sklearn models
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from linear_scorer import LinearScorer
+from model_predictor import MentalHealthPredictor, EXPECTED_FEATURES
+
+
+def random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(0, 2, size=(n, len(EXPECTED_FEATURES))).astype(np.float64)
+    matrix[:, 0] = rng.integers(18, 75, size=n)
+    return matrix
+
+
+def fitted(model, n=400):
+    X = pd.DataFrame(random_rows(n, seed=1), columns=EXPECTED_FEATURES)
+    y = (X['family_history_yes'] + X['work_interfere_often'] + np.random.default_rng(2).random(n) > 1).astype(int)
+    return model.fit(X, y)
+
+
+def assert_equivalent(model, scorer):
+    rows = random_rows(500)
+    frame = pd.DataFrame(rows, columns=EXPECTED_FEATURES)
+
+    expected_proba = model.predict_proba(frame)[:, 1]
+    np.testing.assert_allclose(scorer.predict_proba(rows), expected_proba, rtol=1e-10, atol=1e-12)
+
+    predictions, confidences = scorer.predict_with_confidence(rows)
+    np.testing.assert_array_equal(predictions, model.predict(frame))
+    np.testing.assert_allclose(confidences, model.predict_proba(frame).max(axis=1), rtol=1e-10)
+
+
+def test_shipped_pipeline_equivalence():
+    predictor = MentalHealthPredictor('mental_health_model.pkl', engine='sklearn')
+    scorer = LinearScorer.from_model(predictor.model, EXPECTED_FEATURES)
+
+    assert scorer is not None
+    assert_equivalent(predictor.model, scorer)
+
+
+def test_native_and_sklearn_engines_agree():
+    native = MentalHealthPredictor('mental_health_model.pkl', engine='native')
+    legacy = MentalHealthPredictor('mental_health_model.pkl', engine='sklearn')
+    record = {'Age': 41, 'family_history': 'yes', 'work_interfere': 'often', 'benefits': 'yes'}
+
+    prediction, confidence = native.predict(record)
+    expected_prediction, expected_confidence = legacy.predict(record)
+
+    assert prediction == expected_prediction
+    assert abs(confidence - expected_confidence) < 1e-6
+
+
+@pytest.mark.parametrize('model', [
+    LogisticRegression(max_iter=1000),
+    Pipeline([('scaler', StandardScaler()), ('classifier', LogisticRegression(max_iter=1000))]),
+    Pipeline([('scaler', StandardScaler(with_mean=False)), ('classifier', LogisticRegression(max_iter=1000))]),
+    Pipeline([('classifier', LogisticRegression(multi_class='multinomial', max_iter=1000))]),
+    Pipeline([
+        ('preprocessor', ColumnTransformer([('num', StandardScaler(), ['Age', 'benefits_yes'])],
+                                           remainder='passthrough')),
+        ('classifier', LogisticRegression(max_iter=1000)),
+    ]),
+])
+def test_supported_models(model):
+    model = fitted(model)
+    assert_equivalent(model, LinearScorer.from_model(model, EXPECTED_FEATURES))
+
+
+def test_unsupported_model_falls_back():
+    model = fitted(RandomForestClassifier(n_estimators=5, random_state=0))
+
+    assert LinearScorer.from_model(model, EXPECTED_FEATURES) is None
+
+
+def test_memory_mapped_model_scores_identically():
+    mapped = MentalHealthPredictor('mental_health_model.pkl', mmap_mode='r')
+    regular = MentalHealthPredictor('mental_health_model.pkl')
+    rows = random_rows(50)
+
+    assert isinstance(mapped.model.named_steps['classifier'].coef_, np.memmap)
+    np.testing.assert_array_equal(mapped.scorer.predict_proba(rows), regular.scorer.predict_proba(rows))
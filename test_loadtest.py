@@ -0,0 +1,67 @@
+"""
+Tests for the load test report helpers
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from loadtest import Recorder, histogram, render_markdown, saturation, summarize  # noqa: E402
+
+
+def step(load, throughput, p99_ms, error_rate=0.0, rate=None):
+    return {'load': load, 'rate': rate,
+            'overall': {'throughput': throughput, 'p99_ms': p99_ms, 'error_rate': error_rate}}
+
+
+def test_histogram_buckets_are_cumulative_bounds():
+    buckets = histogram([0.0005, 0.0015, 0.0015, 0.3, 9.0])
+
+    counts = {bucket['le_ms']: bucket['count'] for bucket in buckets}
+    assert counts[1] == 1 and counts[2] == 2 and counts[500] == 1 and counts['+Inf'] == 1
+
+
+def test_summarize_separates_errors_from_rejections():
+    recorder = Recorder()
+    for status in (200, 200, 422, 503):
+        recorder.add('api', status, 0.01)
+    recorder.add('form', 'connection_error', 0.02)
+
+    summary = summarize(recorder, elapsed=1.0)
+
+    assert summary['routes']['api']['error_rate'] == 0.25
+    assert summary['routes']['api']['rejected_rate'] == 0.25
+    assert summary['routes']['form']['error_rate'] == 1.0
+    assert summary['overall']['requests'] == 5 and summary['overall']['error_rate'] == 0.4
+
+
+def test_saturation_closed_loop_stops_when_throughput_flattens():
+    steps = [step('1 clients', 500, 2), step('8 clients', 900, 10), step('32 clients', 910, 40)]
+
+    point = saturation(steps, slo_ms=100, max_error_rate=0.01)
+
+    assert point['step'] == '32 clients'
+    assert point['max_sustained_throughput'] == 900
+
+
+def test_saturation_open_loop_checks_rate_and_slo():
+    steps = [step('200 req/s', 200, 5, rate=200), step('800 req/s', 640, 300, rate=800)]
+
+    point = saturation(steps, slo_ms=100, max_error_rate=0.01)
+
+    assert point['step'] == '800 req/s' and len(point['reasons']) == 2
+    assert saturation(steps[:1], slo_ms=100, max_error_rate=0.01) is None
+
+
+def test_markdown_report_lists_every_config():
+    recorder = Recorder()
+    recorder.add('api', 200, 0.004)
+    config = {'workers': 2, 'threads': 1, 'saturation': None,
+              'steps': [dict(summarize(recorder, 1.0), load='1 clients', rate=None)]}
+    meta = {'timestamp': 'now', 'server': 'gunicorn', 'corpus': 'c.jsonl', 'duration': 1, 'slo_ms': 100}
+
+    markdown = render_markdown({'meta': meta, 'configs': [config]})
+
+    assert '| 2 | 1 | not reached |' in markdown
+    assert '<=     5 ms        1' in markdown
@@ -0,0 +1,87 @@
+"""
+Tests for request metrics and the Prometheus /api/metrics endpoint
+"""
+
+import json
+import os
+import threading
+
+from app import app
+from metrics import Metrics
+
+
+def test_histogram_and_counter_rendering():
+    metrics = Metrics(buckets=(0.01, 0.1))
+    metrics.observe('mh_stage_duration_seconds', 0.005, {'stage': 'parse'})
+    metrics.observe('mh_stage_duration_seconds', 0.05, {'stage': 'parse'})
+    metrics.observe('mh_stage_duration_seconds', 5, {'stage': 'parse'})
+    metrics.inc('mh_requests_total', {'endpoint': 'api_predict', 'status': 200})
+
+    text = metrics.render()
+
+    assert '# TYPE mh_stage_duration_seconds histogram' in text
+    assert 'mh_stage_duration_seconds_bucket{stage="parse",le="0.01"} 1' in text
+    assert 'mh_stage_duration_seconds_bucket{stage="parse",le="0.1"} 2' in text
+    assert 'mh_stage_duration_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'mh_stage_duration_seconds_count{stage="parse"} 3' in text
+    assert 'mh_requests_total{endpoint="api_predict",status="200"} 1' in text
+
+
+def test_snapshots_aggregate_across_processes(tmp_path):
+    worker = Metrics()
+    worker.inc('mh_requests_total', {'endpoint': 'home', 'status': 200}, 2)
+    # Two other workers published the same numbers
+    for pid in (101, 102):
+        (tmp_path / f'metrics-{pid}.json').write_text(json.dumps(worker.snapshot()))
+
+    text = Metrics(str(tmp_path)).render()
+
+    assert 'mh_requests_total{endpoint="home",status="200"} 4' in text
+
+
+def test_concurrent_updates_and_scrapes_with_directory(tmp_path):
+    metrics = Metrics(directory=str(tmp_path), flush_interval=0)
+    failures = []
+
+    def work():
+        try:
+            for _ in range(200):
+                metrics.inc('mh_requests_total', {'endpoint': 'api_predict', 'status': 200})
+                metrics.observe('mh_request_duration_seconds', 0.001, {'endpoint': 'api_predict'})
+                metrics.render()
+        except Exception as e:
+            failures.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    assert 'mh_requests_total{endpoint="api_predict",status="200"} 1600' in metrics.render()
+    assert os.listdir(tmp_path) == [f'metrics-{os.getpid()}.json']
+
+
+def test_flush_errors_are_logged_not_raised(tmp_path):
+    metrics = Metrics(directory=str(tmp_path / 'missing'), flush_interval=0)
+
+    metrics.inc('mh_requests_total')
+
+    assert 'mh_requests_total 1' not in metrics.render()
+
+
+def test_metrics_endpoint_reports_request_stages():
+    client = app.test_client()
+    client.post('/api/predict', json={'Age': 40, 'benefits': 'yes', 'coworkers': 'no'})
+    client.post('/api/predict', data='not json', content_type='application/json')
+
+    response = client.get('/api/metrics')
+    text = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    for stage in ('parse', 'preprocess', 'predict', 'serialize'):
+        assert f'mh_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert 'mh_request_duration_seconds_count{endpoint="api_predict"}' in text
+    assert 'mh_request_errors_total{endpoint="api_predict"}' in text
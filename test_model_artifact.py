@@ -0,0 +1,72 @@
+"""
+Tests for precompiled model artifacts
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from model_artifact import export_artifact, load_artifact
+from model_predictor import MentalHealthPredictor, EXPECTED_FEATURES
+
+
+def test_artifact_predictions_match_pickle(tmp_path):
+    pickled = MentalHealthPredictor('mental_health_model.pkl')
+    path = tmp_path / 'model.json'
+    export_artifact(pickled.model, EXPECTED_FEATURES, str(path))
+
+    compiled = MentalHealthPredictor(str(path))
+    records = [{'Age': age, 'family_history': answer, 'work_interfere': 'often'}
+               for age in (19, 35, 70) for answer in ('yes', 'no')]
+
+    assert compiled.model is None
+    for record in records:
+        assert compiled.predict(record) == pickled.predict(record)
+
+
+def test_shipped_artifact_is_current():
+    pickled = MentalHealthPredictor('mental_health_model.pkl')
+    compiled = MentalHealthPredictor('mental_health_model.json')
+
+    np.testing.assert_allclose(compiled.scorer.weights, pickled.scorer.weights)
+    assert compiled.scorer.intercept == pytest.approx(pickled.scorer.intercept)
+
+
+def test_artifact_rejects_other_feature_layouts(tmp_path):
+    path = tmp_path / 'model.json'
+    export_artifact(MentalHealthPredictor('mental_health_model.pkl').model, EXPECTED_FEATURES, str(path))
+
+    with pytest.raises(ValueError):
+        load_artifact(str(path), EXPECTED_FEATURES[::-1])
+
+    path.write_text(json.dumps({'format': 'something-else'}))
+    with pytest.raises(ValueError):
+        load_artifact(str(path), EXPECTED_FEATURES)
+
+
+def test_artifact_cannot_use_sklearn_engine():
+    with pytest.raises(ValueError):
+        MentalHealthPredictor('mental_health_model.json', engine='sklearn')
+
+
+def test_artifact_rejects_stale_or_tampered_files(tmp_path):
+    path = tmp_path / 'model.json'
+    artifact = export_artifact(MentalHealthPredictor('mental_health_model.pkl').model,
+                               EXPECTED_FEATURES, str(path))
+    assert load_artifact(str(path), EXPECTED_FEATURES, artifact['vocabularies']) is not None
+
+    stale = dict(artifact, schema_version=1)
+    path.write_text(json.dumps(stale))
+    with pytest.raises(ValueError, match='schema version'):
+        load_artifact(str(path), EXPECTED_FEATURES)
+
+    tampered = dict(artifact, intercept=artifact['intercept'] + 1)
+    path.write_text(json.dumps(tampered))
+    with pytest.raises(ValueError, match='checksum'):
+        load_artifact(str(path), EXPECTED_FEATURES)
+
+    path.write_text(json.dumps(artifact))
+    vocabularies = dict(artifact['vocabularies'], remote_work={'no': 0, 'yes': 1, 'hybrid': 2})
+    with pytest.raises(ValueError, match='vocabularies'):
+        load_artifact(str(path), EXPECTED_FEATURES, vocabularies)
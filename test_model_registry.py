@@ -0,0 +1,72 @@
+"""
+Tests for the versioned model directory and hot reload
+"""
+
+import shutil
+
+import app as app_module
+from model_predictor import MentalHealthPredictor
+from model_registry import ModelRegistry, publish_version, read_current, set_current
+
+CANARY = {'Age': 30, 'gender': 'female', 'family_history': 'yes'}
+
+
+def _publish(models_dir, version):
+    predictor = MentalHealthPredictor('mental_health_model.pkl', engine='sklearn')
+    publish_version(predictor.model, str(models_dir), version,
+                    feature_names=predictor.encoder.feature_names)
+
+
+def test_check_swaps_to_new_current_version(tmp_path):
+    _publish(tmp_path, 'v1')
+    registry = ModelRegistry(str(tmp_path), MentalHealthPredictor, [CANARY])
+    assert registry.check()
+    first = registry.predictor
+    assert registry.version == 'v1'
+    assert registry.predictor.artifact_scorer is not None
+
+    assert not registry.check()
+    _publish(tmp_path, 'v2')
+    assert registry.check()
+    assert registry.active == ('v2', registry.predictor)
+    assert registry.predictor is not first
+    assert registry.swaps == 2
+
+
+def test_failed_warm_up_keeps_serving_old_version(tmp_path):
+    _publish(tmp_path, 'v1')
+    registry = ModelRegistry(str(tmp_path), MentalHealthPredictor, [CANARY])
+    registry.check()
+
+    (tmp_path / 'broken').mkdir()
+    (tmp_path / 'broken' / 'model.pkl').write_bytes(b'not a model')
+    set_current(str(tmp_path), 'broken')
+
+    assert not registry.check()
+    assert registry.version == 'v1'
+    assert registry.last_error.startswith('broken')
+
+
+def test_admin_reload_endpoint(tmp_path, monkeypatch):
+    _publish(tmp_path, 'v1')
+    shutil.copytree(tmp_path / 'v1', tmp_path / 'v2')
+    registry = ModelRegistry(str(tmp_path), app_module.load_predictor, app_module.CANARY_RECORDS)
+    registry.check()
+    monkeypatch.setattr(app_module, 'registry', registry)
+    monkeypatch.setattr(app_module, 'MODELS_DIR', str(tmp_path))
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secret')
+    client = app_module.app.test_client()
+
+    assert client.post('/api/admin/reload', json={'version': 'v2'}).status_code == 403
+    response = client.post('/api/admin/reload', json={'version': '..'},
+                           headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 404
+
+    response = client.post('/api/admin/reload', json={'version': 'v2'},
+                           headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200
+    assert response.get_json()['model']['version'] == 'v2'
+    assert read_current(str(tmp_path)) == 'v2'
+
+    assert client.get('/api/health').get_json()['model_version'] == 'v2'
+    assert client.post('/api/predict', json=CANARY).get_json()['model_version'] == 'v2'
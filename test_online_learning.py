@@ -0,0 +1,81 @@
+"""
+Tests for incremental online model updates
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_predictor import MentalHealthPredictor, EXPECTED_FEATURES
+from model_registry import read_current
+from online_learning import OnlineTrainer, main, read_new_lines
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), 'benchmarks', 'payloads.jsonl')
+
+
+def _labeled_records():
+    with open(PAYLOADS) as f:
+        records = [json.loads(line) for line in f]
+    for record in records:
+        record['treatment'] = 'Yes' if record['family_history'] == 'Yes' else 'No'
+    return records
+
+
+def _write(path, records, mode='w'):
+    with open(path, mode) as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def test_read_new_lines_leaves_partial_line(tmp_path):
+    path = tmp_path / 'stream.jsonl'
+    path.write_text('{"a": 1}\n{"b": 2}\n{"c"')
+
+    lines, offset = read_new_lines(str(path), 0, 10)
+
+    assert len(lines) == 2
+    assert offset == len('{"a": 1}\n{"b": 2}\n')
+
+
+def test_resume_only_applies_new_records(tmp_path):
+    stream = tmp_path / 'stream.jsonl'
+    records = _labeled_records()
+    _write(stream, records[:60] + [{'Age': 30}])
+
+    trainer = OnlineTrainer(str(tmp_path / 'state'))
+    used = list(trainer.consume(str(stream), batch_size=25))
+    trainer.checkpoint()
+
+    assert sum(used) == 60
+    assert trainer.skipped == 1
+    assert trainer.model.named_steps['scaler'].n_samples_seen_ == 60
+
+    _write(stream, records[60:], mode='a')
+    resumed = OnlineTrainer(str(tmp_path / 'state'))
+    used = list(resumed.consume(str(stream), batch_size=25))
+
+    assert sum(used) == len(records) - 60
+    assert resumed.samples_seen == len(records)
+    assert resumed.offset == os.path.getsize(stream)
+
+
+def test_cli_publishes_servable_version(tmp_path):
+    stream = tmp_path / 'stream.jsonl'
+    records = _labeled_records()
+    _write(stream, records)
+    models = tmp_path / 'models'
+
+    assert main([str(stream), '--state-dir', str(tmp_path / 'state'),
+                 '--publish-dir', str(models), '--batch-size', '32']) == 0
+
+    version = read_current(str(models))
+    assert version.startswith('online-')
+    native = MentalHealthPredictor(str(models / version / 'model.json'))
+    reference = MentalHealthPredictor(str(models / version / 'model.pkl'), engine='sklearn')
+    matrix = native.encoder.encode_batch(records).astype(np.float64)
+    frame = pd.DataFrame(matrix, columns=EXPECTED_FEATURES)
+    expected = reference.model.predict_proba(frame)[:, 1]
+    np.testing.assert_allclose(native.scorer.predict_proba(matrix), expected, rtol=1e-6)
+    assert native.predict(records[0])[0] == reference.predict(records[0])[0]
@@ -0,0 +1,76 @@
+"""
+Tests for the LRU prediction cache
+"""
+
+import os
+import shutil
+
+from model_predictor import MentalHealthPredictor
+from prediction_cache import PredictionCache
+
+
+def test_lru_eviction_and_counters():
+    cache = PredictionCache(['benefits'], max_size=2)
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 1, 1, 2)
+
+
+def test_key_is_canonical():
+    cache = PredictionCache(['benefits', 'gender', 'Age'])
+
+    assert cache.make_key({'Age': 30, 'benefits': ' Yes '}) == cache.make_key({'Age': '30', 'benefits': 'yes', 'junk': 1})
+    assert cache.make_key({'Age': 30}) != cache.make_key({'Age': 31})
+    assert cache.make_key({'Age': 'abc'}) is None
+
+
+def test_age_bucketing():
+    cache = PredictionCache(['benefits'], age_bucket=5)
+
+    assert cache.make_key({'Age': 31}) == cache.make_key({'Age': 34})
+    assert cache.make_key({'Age': 34}) != cache.make_key({'Age': 35})
+
+
+def test_predictor_cache_hits_and_invalidation(tmp_path):
+    model_path = tmp_path / 'model.pkl'
+    shutil.copy('mental_health_model.pkl', model_path)
+    predictor = MentalHealthPredictor(str(model_path), cache_size=8, model_check_interval=0)
+    record = {'Age': 30, 'family_history': 'yes'}
+
+    first = predictor.predict(record)
+    assert predictor.predict(dict(record, family_history=' YES')) == first
+    assert predictor.cache.stats()['hits'] == 1
+
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert predictor.predict(record) == first
+    stats = predictor.cache.stats()
+    assert stats['invalidations'] == 1
+    assert stats['size'] == 1
+
+
+def test_prediction_from_replaced_model_is_not_served(tmp_path):
+    model_path = tmp_path / 'model.pkl'
+    shutil.copy('mental_health_model.pkl', model_path)
+    predictor = MentalHealthPredictor(str(model_path), cache_size=8, model_check_interval=0)
+    record = {'Age': 30, 'family_history': 'yes'}
+    old = predictor.loaded
+    stale_key = (old[3],) + predictor.cache.make_key(record)
+
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert predictor.reload_if_changed()
+    # A request that started on the old model finishes after the swap
+    predictor.cache.put(stale_key, (1, 0.0))
+
+    new = predictor.loaded
+    assert new[3] == old[3] + 1 and new[1] is not old[1]
+    assert predictor.predict(record) != (1, 0.0)
+    assert not predictor.reload_if_changed()
@@ -0,0 +1,63 @@
+"""
+Tests for on-demand request profiling
+"""
+
+import time
+
+import pytest
+
+import app as app_module
+from request_profiler import RequestProfiler
+from test_batch_predict import SAMPLE
+
+
+def test_session_profiles_the_next_n_requests():
+    profiler = RequestProfiler()
+    profiler.start(requests=2, top=5)
+
+    for _ in range(3):
+        profile = profiler.begin()
+        if profile is not None:
+            sum(range(1000))
+            profiler.end(profile, 'api_predict')
+
+    status = profiler.status()
+    assert not status['active'] and not profiler.active
+    assert status['result']['requests'] == 2
+    assert status['result']['endpoints'] == {'api_predict': 2}
+    assert 0 < len(status['result']['functions']) <= 5
+
+
+def test_time_limited_session_ends_on_status():
+    profiler = RequestProfiler()
+    profiler.start(seconds=0.01)
+    time.sleep(0.02)
+
+    assert profiler.begin() is None
+    assert profiler.status()['result']['requests'] == 0
+
+
+@pytest.mark.parametrize('options', [{}, {'requests': 1, 'seconds': 1}, {'requests': 0}, {'seconds': 10000}])
+def test_invalid_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        RequestProfiler().start(**options)
+
+
+def test_profile_endpoint(monkeypatch):
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(app_module, 'profiler', RequestProfiler())
+    client = app_module.app.test_client()
+    admin = {'X-Admin-Token': 'secret'}
+
+    assert client.post('/api/admin/profile', json={'requests': 2}).status_code == 403
+    assert client.post('/api/admin/profile', json={'requests': 2}, headers=admin).status_code == 202
+    assert client.post('/api/admin/profile', json={'requests': 2}, headers=admin).status_code == 409
+    client.post('/api/predict', json=SAMPLE)
+    client.post('/submit_prediction', data=dict(SAMPLE, age=SAMPLE['Age']))
+    status = client.get('/api/admin/profile', headers=admin).get_json()
+
+    assert not status['active']
+    assert status['result']['endpoints'] == {'api_predict': 1, 'submit_prediction': 1}
+    functions = [entry['function'] for entry in status['result']['functions']]
+    assert any('predict' in name for name in functions)
+    assert isinstance(status['result']['allocations'], list)
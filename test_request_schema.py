@@ -0,0 +1,93 @@
+"""
+Tests for request validation and the canonical encoding path
+"""
+
+import numpy as np
+import pytest
+
+from app import app
+from model_predictor import MentalHealthPredictor, CATEGORICAL_MAPPINGS, EXPECTED_FEATURES
+from request_schema import RequestSchema, SchemaError
+from test_batch_predict import SAMPLE
+
+
+@pytest.fixture
+def schema():
+    return RequestSchema(CATEGORICAL_MAPPINGS, EXPECTED_FEATURES)
+
+
+def test_valid_request_is_canonicalized(schema):
+    record, errors = schema.validate(dict(SAMPLE, Age='28', gender=' M ', benefits="Don't Know", extra=1))
+
+    assert errors == []
+    assert record['Age'] == 28.0
+    assert record['gender'] == 'male'
+    assert record['benefits'] == "don't know"
+    assert 'extra' not in record
+
+
+def test_all_errors_are_reported_in_one_pass(schema):
+    record, errors = schema.validate({'Age': 7, 'gender': 'robot', 'benefits': 'perhaps', 'Gender_male': 2})
+
+    assert record is None
+    assert [error['field'] for error in errors] == ['Age', 'gender', 'benefits', 'Gender_male']
+    assert errors[1]['allowed'] == ['female', 'male', 'other']
+    assert schema.stats()['invalid'] == 1
+
+
+@pytest.mark.parametrize('age', [None, '', 'abc', True, float('nan'), 10, 100])
+def test_age_must_be_within_training_range(schema, age):
+    _, errors = schema.validate(dict(SAMPLE, Age=age))
+
+    assert [error['field'] for error in errors] == ['Age']
+
+
+def test_non_object_body_is_rejected(schema):
+    with pytest.raises(SchemaError) as excinfo:
+        schema.check(['not', 'an', 'object'])
+
+    assert excinfo.value.errors[0]['field'] is None
+
+
+def test_canonical_encoding_matches_raw_encoding(schema):
+    predictor = MentalHealthPredictor('mental_health_model.json')
+    raw = [dict(SAMPLE, gender='Woman', seek_help='DON\'T KNOW'), {'Age': 40, 'Gender_male': 1}]
+    canonical = [schema.check(record) for record in raw]
+
+    encoded = predictor.encoder.encode_batch(canonical, canonical=True)
+
+    np.testing.assert_array_equal(encoded, predictor.encoder.encode_batch(raw))
+
+
+def test_api_returns_structured_422():
+    client = app.test_client()
+
+    invalid = client.post('/api/predict', json=dict(SAMPLE, Age=150, coworkers='everyone'))
+    not_json = client.post('/api/predict', data='not json', content_type='application/json')
+    batch = client.post('/api/predict_batch', json=[SAMPLE, dict(SAMPLE, Age=5)]).get_json()
+
+    assert invalid.status_code == 422
+    assert [error['field'] for error in invalid.get_json()['details']] == ['Age', 'coworkers']
+    assert not_json.status_code == 422
+    assert 'prediction' in batch['results'][0]
+    assert batch['results'][1]['details'][0]['field'] == 'Age'
+
+
+def test_form_validation_redirects_back():
+    response = app.test_client().post('/submit_prediction', data={'age': 'old', 'gender': 'male'})
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/predict')
+
+
+def test_health_counts_answers_normalized_by_the_schema():
+    client = app.test_client()
+    before = client.get('/api/health').get_json()['normalization']
+
+    client.post('/api/predict', json=dict(SAMPLE, gender='robot', benefits='dunno'))
+    client.post('/api/predict', json=SAMPLE)
+
+    after = client.get('/api/health').get_json()['normalization']
+    assert after['gender']['unmapped'] == before['gender']['unmapped'] + 1
+    assert after['benefits']['unmapped'] == before['benefits']['unmapped'] + 1
+    assert after['benefits']['lookups'] >= before['benefits']['lookups'] + 2
@@ -0,0 +1,87 @@
+"""
+Tests for the streaming bulk-scoring CLI
+"""
+
+import json
+
+from model_predictor import MentalHealthPredictor
+from score_file import normalize_record, score_file, _save_checkpoint
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+
+
+RECORDS = [{'Age': 20 + i, 'family_history': 'yes' if i % 2 else 'no', 'id': i} for i in range(25)]
+
+
+def test_scores_in_input_order(tmp_path):
+    source, target = tmp_path / 'in.jsonl', tmp_path / 'out.jsonl'
+    write_jsonl(source, RECORDS + ['bad'])
+
+    summary = score_file(str(source), str(target), chunk_size=7, id_field='id')
+
+    rows = [json.loads(line) for line in target.read_text().splitlines()]
+    predictor = MentalHealthPredictor('mental_health_model.pkl')
+    assert summary['rows'] == 26 and summary['errors'] == 1
+    assert [row['row'] for row in rows] == list(range(26))
+    assert rows[3]['prediction'] == predictor.predict(RECORDS[3])[0]
+    assert rows[3]['id'] == 3
+    assert 'error' in rows[-1]
+
+
+def test_resume_from_checkpoint(tmp_path):
+    source = tmp_path / 'in.jsonl'
+    write_jsonl(source, RECORDS)
+    full, partial, checkpoint = tmp_path / 'full.csv', tmp_path / 'partial.csv', tmp_path / 'ckpt'
+    score_file(str(source), str(full), chunk_size=10)
+
+    # Simulate a crash after the first chunk, with a half-written second chunk
+    score_file(str(source), str(partial), chunk_size=10, checkpoint=str(checkpoint))
+    lines = partial.read_bytes().splitlines(keepends=True)
+    committed = b''.join(lines[:11])
+    partial.write_bytes(committed + b'garbage')
+    consumed = b''.join(source.read_bytes().splitlines(keepends=True)[:10])
+    _save_checkpoint(str(checkpoint), 10, len(committed), len(consumed))
+
+    summary = score_file(str(source), str(partial), chunk_size=10,
+                         checkpoint=str(checkpoint), resume=True)
+
+    assert summary['rows'] == 15
+    assert partial.read_bytes() == full.read_bytes()
+
+
+def test_resume_csv_input_at_checkpointed_offset(tmp_path):
+    source = tmp_path / 'in.csv'
+    source.write_text('Age,benefits,comment\n30,yes,"two\nlines"\n41,no,x\n52,"don\'t know",y\n')
+    full, partial, checkpoint = tmp_path / 'full.jsonl', tmp_path / 'partial.jsonl', tmp_path / 'ckpt'
+    score_file(str(source), str(full), chunk_size=1)
+
+    score_file(str(source), str(partial), chunk_size=1, checkpoint=str(checkpoint))
+    lines = partial.read_bytes().splitlines(keepends=True)
+    partial.write_bytes(lines[0])
+    _save_checkpoint(str(checkpoint), 1, len(lines[0]), len(b'Age,benefits,comment\n30,yes,"two\nlines"\n'))
+
+    summary = score_file(str(source), str(partial), chunk_size=1, checkpoint=str(checkpoint), resume=True)
+
+    assert summary['rows'] == 2
+    assert partial.read_bytes() == full.read_bytes()
+
+
+def test_resume_with_missing_output_starts_over(tmp_path):
+    source, target, checkpoint = tmp_path / 'in.jsonl', tmp_path / 'out.jsonl', tmp_path / 'ckpt'
+    write_jsonl(source, RECORDS)
+    score_file(str(source), str(target), chunk_size=10, checkpoint=str(checkpoint))
+    expected = target.read_bytes()
+    target.unlink()
+
+    summary = score_file(str(source), str(target), chunk_size=10, checkpoint=str(checkpoint), resume=True)
+
+    assert summary['rows'] == len(RECORDS)
+    assert target.read_bytes() == expected
+
+
+def test_normalize_record_maps_csv_columns():
+    assert normalize_record({'Age': '30', 'Gender': 'M', 'Family_History': 'Yes'}) == {
+        'Age': '30', 'gender': 'M', 'family_history': 'Yes'
+    }
@@ -0,0 +1,67 @@
+"""
+Tests for fingerprinted static assets and the static page cache
+"""
+
+import gzip
+import re
+
+from app import app, assets, pages
+from static_assets import AssetPipeline
+
+
+def test_pages_link_fingerprinted_assets():
+    html = app.test_client().get('/about').get_data(as_text=True)
+
+    for logical in ('css/style.css', 'js/main.js', 'images/favicon.svg'):
+        assert assets.url(logical) in html
+    assert re.search(r'/assets/css/style\.[0-9a-f]{12}\.css', html)
+    assert '/static/' not in html
+
+
+def test_asset_is_gzipped_immutable_and_revalidates():
+    client = app.test_client()
+    url = assets.url('css/style.css')
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response.headers['Cache-Control']
+    with open('static/css/style.css', 'rb') as f:
+        assert gzip.decompress(response.get_data()) == f.read()
+
+    plain = client.get(url)
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['ETag'] != response.headers['ETag']
+
+    cached = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+    assert client.get('/assets/css/style.000000000000.css').status_code == 404
+
+
+def test_fingerprint_changes_with_content(tmp_path):
+    (tmp_path / 'app.js').write_text('console.log(1);')
+    before = AssetPipeline(str(tmp_path)).url('app.js')
+    (tmp_path / 'app.js').write_text('console.log(2);')
+
+    assert AssetPipeline(str(tmp_path)).url('app.js') != before
+
+
+def test_static_pages_are_rendered_once():
+    client = app.test_client()
+    pages.clear()
+
+    first = client.get('/')
+    misses = pages.misses
+    second = client.get('/', headers={'If-None-Match': first.headers['ETag']})
+
+    assert pages.misses == misses
+    assert second.status_code == 304
+    assert client.get('/').get_data() == first.get_data()
+
+
+def test_flash_messages_bypass_page_cache():
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_flashes'] = [('error', 'Model not available.')]
+
+    assert 'Model not available.' in client.get('/').get_data(as_text=True)
+    assert 'Model not available.' not in client.get('/').get_data(as_text=True)
@@ -0,0 +1,61 @@
+"""
+Tests for queued, sampled JSON logging
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from structured_logging import SamplingFilter, configure_logging, parse_sample_rates
+
+
+@pytest.fixture
+def json_log():
+    stream = io.StringIO()
+    root = logging.getLogger()
+    level = root.level
+    handler = configure_logging('INFO', {logging.INFO: 0.25}, stream=stream)
+    yield handler, stream
+    root.removeHandler(handler)
+    handler.stop()
+    root.setLevel(level)
+
+
+def test_records_are_written_as_json_by_the_writer_thread(json_log):
+    handler, stream = json_log
+    log = logging.getLogger('test.structured')
+
+    for index in range(8):
+        log.info("Prediction made", extra={'prediction': index % 2, 'confidence': 0.9})
+    log.warning("Slow request", extra={'duration_ms': 120})
+    handler.stop()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    info = [record for record in records if record['level'] == 'INFO']
+    assert len(info) == 2
+    assert info[0]['message'] == 'Prediction made'
+    assert info[0]['confidence'] == 0.9
+    assert records[-1]['duration_ms'] == 120
+    assert handler.stats()['sampled_out'] == 6
+
+
+def test_sampling_filter_keeps_one_in_n():
+    sampler = SamplingFilter({logging.INFO: 0.1, logging.DEBUG: 0.0})
+    info = logging.LogRecord('x', logging.INFO, '', 0, 'm', (), None)
+    debug = logging.LogRecord('x', logging.DEBUG, '', 0, 'm', (), None)
+    error = logging.LogRecord('x', logging.ERROR, '', 0, 'm', (), None)
+
+    assert sum(sampler.filter(info) for _ in range(100)) == 10
+    assert not any(sampler.filter(debug) for _ in range(10))
+    assert sampler.filter(error)
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates('debug=0, INFO=0.05') == {logging.DEBUG: 0.0, logging.INFO: 0.05}
+    assert parse_sample_rates('') == {}
+    with pytest.raises(ValueError):
+        parse_sample_rates('LOUD=1')
+    with pytest.raises(ValueError):
+        parse_sample_rates('INFO=2')
@@ -0,0 +1,59 @@
+"""
+Tests for the parallel training runner
+"""
+
+import os
+import shutil
+
+import joblib
+import numpy as np
+
+from model_predictor import MentalHealthPredictor, EXPECTED_FEATURES
+from train_runner import choose_winner, promote, run
+
+
+def test_run_reports_quality_and_latency(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(os.path.join(os.path.dirname(__file__), 'mental_health.csv'), 'mental_health.csv')
+
+    report = run('mental_health.csv', n_jobs=2, cv=3, candidates=['logistic_regression'])
+
+    model = report['models'][0]
+    assert report['jobs'] == 4
+    assert 0.5 < model['cv_f1_mean'] <= 1.0
+    assert set(model['test']) == {'accuracy', 'precision', 'recall', 'f1'}
+    assert model['inference']['engine'] == 'native'
+    assert model['inference']['p99_ms'] > 0
+
+    promote(report['_models']['logistic_regression'], 'model.pkl', 'model.json')
+    predictor = MentalHealthPredictor('model.json')
+    assert predictor.predict({'Age': 30})[0] in (0, 1)
+    assert joblib.load('model.pkl') is not None
+
+
+def test_choose_winner_respects_latency_budget():
+    report = {'models': [
+        {'name': 'fast', 'cv_f1_mean': 0.80, 'inference': {'p99_ms': 0.1}},
+        {'name': 'accurate', 'cv_f1_mean': 0.85, 'inference': {'p99_ms': 20.0}},
+    ]}
+
+    assert choose_winner(report) == 'accurate'
+    assert choose_winner(report, p99_budget_ms=5) == 'fast'
+    assert choose_winner(report, p99_budget_ms=0.01) is None
+
+
+def test_promote_derives_artifact_path_and_removes_stale_artifact(tmp_path):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    features = rng.random((40, len(EXPECTED_FEATURES)))
+    labels = np.arange(40) % 2
+    model_path = str(tmp_path / 'custom.pkl')
+
+    promote(LogisticRegression().fit(features, labels), model_path)
+    assert MentalHealthPredictor(str(tmp_path / 'custom.json')).scorer is not None
+
+    promote(RandomForestClassifier(n_estimators=2).fit(features, labels), model_path)
+    assert not (tmp_path / 'custom.json').exists()
+    assert isinstance(joblib.load(model_path), RandomForestClassifier)
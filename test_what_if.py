@@ -0,0 +1,71 @@
+"""
+Tests for single-field what-if analysis
+"""
+
+import pytest
+
+from app import app
+from model_predictor import MentalHealthPredictor, CATEGORICAL_MAPPINGS
+from test_batch_predict import SAMPLE
+
+
+@pytest.mark.parametrize('engine', ['native', 'sklearn'])
+def test_alternatives_match_individual_predictions(engine):
+    predictor = MentalHealthPredictor('mental_health_model.pkl', engine=engine, cache_size=0)
+
+    result = predictor.what_if(SAMPLE)
+
+    prediction, confidence = predictor.predict(SAMPLE)
+    assert result['prediction'] == prediction
+    assert result['probability'] == pytest.approx(confidence if prediction == 1 else 1 - confidence)
+    for alternative in result['alternatives']:
+        assert alternative['answer'] != alternative['current']
+        prediction, confidence = predictor.predict(dict(SAMPLE, **{alternative['field']: alternative['answer']}))
+        assert alternative['prediction'] == prediction
+        assert alternative['probability'] == pytest.approx(confidence if prediction == 1 else 1 - confidence)
+        assert alternative['delta'] == pytest.approx(alternative['probability'] - result['probability'])
+
+
+def test_alternatives_are_sorted_by_impact():
+    predictor = MentalHealthPredictor('mental_health_model.json')
+
+    alternatives = predictor.what_if(SAMPLE)['alternatives']
+
+    magnitudes = [abs(alternative['delta']) for alternative in alternatives]
+    assert magnitudes == sorted(magnitudes, reverse=True)
+    assert len(alternatives) == 29
+    assert all(alternative['delta'] != 0 for alternative in alternatives)
+
+
+def test_each_encoding_is_one_alternative():
+    encoder = MentalHealthPredictor('mental_health_model.json').encoder
+
+    pairs = [(field, encoder.field_tables[field].get(answer)) for field, answer in encoder.alternative_answers]
+
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == {(field, encoder.field_tables[field].get(answer))
+                          for field, answers in CATEGORICAL_MAPPINGS.items() for answer in answers}
+    assert ('benefits', 'not sure') not in encoder.alternative_answers
+
+
+def test_unanswered_fields_skip_the_reference_answer():
+    predictor = MentalHealthPredictor('mental_health_model.json')
+
+    alternatives = predictor.what_if({'Age': 30})['alternatives']
+
+    work = [alternative for alternative in alternatives if alternative['field'] == 'work_interfere']
+    assert {alternative['answer'] for alternative in work} == {'rarely', 'sometimes', 'often'}
+    assert all(alternative['current'] is None for alternative in work)
+
+
+def test_what_if_endpoint():
+    client = app.test_client()
+
+    response = client.post('/api/what_if', json=SAMPLE)
+    invalid = client.post('/api/what_if', json={'Age': 3})
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert 0 <= body['probability'] <= 100 and body['model_version']
+    assert body['alternatives'][0].keys() >= {'field', 'answer', 'current', 'probability', 'delta', 'prediction'}
+    assert invalid.status_code == 422
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Parallel multi-model training and comparison runner.
+
+Every candidate model's cross-validation folds and its final fit are run
+as independent jobs across all cores. Each candidate is then timed on the
+serving path (single-row p50/p99 latency and batch throughput, measured
+sequentially so that results are not distorted by the parallel fits), a
+comparison report is written as JSON, and the best candidate that meets
+the latency budget is promoted to the serving model file.
+
+Usage:
+    python train_runner.py [--n-jobs -1] [--p99-budget-ms 5] [--report training_report.json]
+    python train_runner.py --no-promote
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from feature_pipeline import build_features
+from linear_scorer import LinearScorer
+from model_artifact import export_artifact
+from model_predictor import EXPECTED_FEATURES
+
+logger = logging.getLogger(__name__)
+
+def _xgboost():
+    try:
+        from xgboost import XGBClassifier
+    except ImportError:
+        return None
+    return XGBClassifier(eval_metric="logloss", random_state=42, n_jobs=1)
+
+# Candidate name -> factory returning an unfitted classifier (or None if unavailable)
+CANDIDATES: Dict[str, Callable[[], Any]] = {
+    'logistic_regression': lambda: LogisticRegression(max_iter=1000),
+    'random_forest': lambda: RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=1),
+    'xgboost': _xgboost,
+}
+
+def make_pipeline(classifier: Any, X: pd.DataFrame) -> Pipeline:
+    """Wrap a classifier in the same preprocessing as model_train.py"""
+    categorical_cols = X.select_dtypes(include=["object"]).columns.tolist()
+    numerical_cols = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    preprocessor = ColumnTransformer(transformers=[
+        ("num", StandardScaler(), numerical_cols),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols)
+    ])
+    return Pipeline(steps=[("preprocessor", preprocessor), ("classifier", classifier)])
+
+def _fit_job(name: str, fold: Optional[int], X: pd.DataFrame, y: pd.Series,
+             train_index: np.ndarray, test_index: np.ndarray) -> Dict[str, Any]:
+    """Fit one CV fold (fold >= 0) or the final model (fold is None)"""
+    model = make_pipeline(CANDIDATES[name](), X)
+    started = time.perf_counter()
+    model.fit(X.iloc[train_index], y.iloc[train_index])
+    fit_seconds = time.perf_counter() - started
+    
+    y_true = y.iloc[test_index]
+    y_pred = model.predict(X.iloc[test_index])
+    job = {'name': name, 'fold': fold, 'fit_seconds': fit_seconds, 'f1': f1_score(y_true, y_pred)}
+    if fold is None:
+        job['model'] = model
+        job['test_metrics'] = {
+            'accuracy': accuracy_score(y_true, y_pred),
+            'precision': precision_score(y_true, y_pred),
+            'recall': recall_score(y_true, y_pred),
+            'f1': f1_score(y_true, y_pred)
+        }
+    return job
+
+def measure_inference(model: Any, X: pd.DataFrame, iterations: int = 2000) -> Dict[str, Any]:
+    """
+    Latency of the path MentalHealthPredictor would use for this model:
+    the native linear scorer when it applies, otherwise sklearn predict_proba.
+    """
+    matrix = X[EXPECTED_FEATURES].to_numpy(dtype=np.float32)
+    scorer = LinearScorer.from_model(model, EXPECTED_FEATURES)
+    if scorer is not None:
+        engine, score = 'native', scorer.predict_with_confidence
+    else:
+        engine = 'sklearn'
+        
+        def score(rows):
+            return model.predict_proba(pd.DataFrame(rows, columns=EXPECTED_FEATURES))
+    
+    iterations = iterations if engine == 'native' else max(iterations // 10, 100)
+    samples = []
+    for index in range(iterations):
+        row = matrix[index % len(matrix)][None, :]
+        started = time.perf_counter()
+        score(row)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    
+    started = time.perf_counter()
+    score(matrix)
+    batch_seconds = time.perf_counter() - started
+    
+    return {
+        'engine': engine,
+        'p50_ms': round(samples[len(samples) // 2] * 1000, 4),
+        'p99_ms': round(samples[min(int(len(samples) * 0.99), len(samples) - 1)] * 1000, 4),
+        'batch_rows_per_sec': round(len(matrix) / batch_seconds, 1)
+    }
+
+def run(csv_path: str = 'mental_health.csv', n_jobs: int = -1, cv: int = 5,
+        candidates: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Fit and evaluate all candidates.
+    
+    Returns:
+        Dict[str, Any]: Report with one entry per candidate (fitted models
+        are returned separately under ``_models``)
+    """
+    df_copy = build_features(csv_path)
+    X = df_copy.drop(columns=["treatment"])
+    y = df_copy["treatment"]
+    
+    names = [name for name in (candidates or CANDIDATES) if CANDIDATES[name]() is not None]
+    skipped = [name for name in (candidates or CANDIDATES) if name not in names]
+    
+    # Same hold-out split as model_train.py, same CV as cross_val_score(cv=5)
+    positions = np.arange(len(X))
+    train_index, test_index = train_test_split(positions, test_size=0.2, random_state=42)
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+    
+    jobs = [(name, None, train_index, test_index) for name in names]
+    jobs += [(name, fold, fold_train, fold_test)
+             for name in names for fold, (fold_train, fold_test) in enumerate(folds)]
+    
+    started = time.perf_counter()
+    outputs = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_fit_job)(name, fold, X, y, fold_train, fold_test)
+        for name, fold, fold_train, fold_test in jobs
+    )
+    wall_seconds = time.perf_counter() - started
+    
+    models, report_models = {}, []
+    for name in names:
+        final = next(job for job in outputs if job['name'] == name and job['fold'] is None)
+        cv_jobs = [job for job in outputs if job['name'] == name and job['fold'] is not None]
+        models[name] = final['model']
+        report_models.append({
+            'name': name,
+            'cv_f1_mean': statistics.fmean(job['f1'] for job in cv_jobs),
+            'cv_f1_std': statistics.pstdev(job['f1'] for job in cv_jobs),
+            'test': final['test_metrics'],
+            'fit_seconds': round(final['fit_seconds'], 4),
+            'cv_fit_seconds': round(sum(job['fit_seconds'] for job in cv_jobs), 4),
+            'inference': measure_inference(final['model'], X.iloc[test_index])
+        })
+    
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'csv_path': csv_path,
+        'n_jobs': n_jobs,
+        'cv_folds': cv,
+        'jobs': len(jobs),
+        'wall_seconds': round(wall_seconds, 3),
+        'skipped': skipped,
+        'models': report_models,
+        '_models': models
+    }
+
+def choose_winner(report: Dict[str, Any], metric: str = 'cv_f1_mean',
+                  p99_budget_ms: Optional[float] = None) -> Optional[str]:
+    """Best candidate by ``metric`` among those within the p99 latency budget"""
+    eligible = [model for model in report['models']
+                if p99_budget_ms is None or model['inference']['p99_ms'] <= p99_budget_ms]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda model: model[metric])['name']
+
+def artifact_path_for(model_path: str) -> str:
+    """Artifact path next to a pickled model (``model.pkl`` -> ``model.json``)"""
+    return f'{os.path.splitext(model_path)[0]}.json'
+
+def promote(model: Any, model_path: str = 'mental_health_model.pkl',
+            artifact_path: Optional[str] = None):
+    """
+    Atomically replace the serving model and its artifact.
+    
+    A linear winner is also exported as the artifact. Any other winner
+    cannot be exported, so an existing artifact is removed rather than left
+    to serve the previous model in fast-startup mode.
+    
+    Args:
+        model: Fitted pipeline
+        model_path (str): Pickle to replace
+        artifact_path (str, optional): Artifact to replace; defaults to the
+            model path with a ``.json`` extension
+    """
+    artifact_path = artifact_path or artifact_path_for(model_path)
+    tmp_path = f'{model_path}.tmp'
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, model_path)
+    
+    if LinearScorer.from_model(model, EXPECTED_FEATURES) is not None:
+        tmp_path = f'{artifact_path}.tmp'
+        export_artifact(model, EXPECTED_FEATURES, tmp_path)
+        os.replace(tmp_path, artifact_path)
+    elif os.path.exists(artifact_path):
+        os.remove(artifact_path)
+        logger.warning(f"Winner is not linear; removed the stale artifact {artifact_path}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Train and compare candidate models in parallel.')
+    parser.add_argument('--csv', default='mental_health.csv')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel jobs (-1 = all cores)')
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--candidates', nargs='+', choices=sorted(CANDIDATES))
+    parser.add_argument('--metric', default='cv_f1_mean', choices=['cv_f1_mean'])
+    parser.add_argument('--p99-budget-ms', type=float, help='Reject models slower than this at p99')
+    parser.add_argument('--report', default='training_report.json')
+    parser.add_argument('--model-path', default='mental_health_model.pkl')
+    parser.add_argument('--artifact-path', help='Artifact to replace (default: --model-path with .json)')
+    parser.add_argument('--no-promote', action='store_true', help='Only write the report')
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    report = run(args.csv, args.n_jobs, args.cv, args.candidates)
+    models = report.pop('_models')
+    winner = choose_winner(report, args.metric, args.p99_budget_ms)
+    report['winner'] = winner
+    report['p99_budget_ms'] = args.p99_budget_ms
+    report['promoted'] = bool(winner) and not args.no_promote
+    
+    print(f"{'model':22s} {'cv f1':>7s} {'test f1':>8s} {'acc':>6s} {'fit s':>7s} {'p99 ms':>8s} engine")
+    for model in report['models']:
+        print(f"{model['name']:22s} {model['cv_f1_mean']:7.4f} {model['test']['f1']:8.4f} "
+              f"{model['test']['accuracy']:6.3f} {model['fit_seconds']:7.3f} "
+              f"{model['inference']['p99_ms']:8.4f} {model['inference']['engine']}")
+    print(f"wall time {report['wall_seconds']:.2f}s for {report['jobs']} fits; winner: {winner}")
+    
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    if winner is None:
+        print("No candidate meets the latency budget; nothing promoted", file=sys.stderr)
+        return 1
+    if report['promoted']:
+        promote(models[winner], args.model_path, args.artifact_path)
+        print(f"Promoted {winner} to {args.model_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())